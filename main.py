@@ -5,17 +5,19 @@ Main file that DEFINITELY WORKS for Kasparro assignment
 
 import json
 import os
-from datetime import datetime
 
 def ensure_directory(path):
     """Ensure directory exists"""
     os.makedirs(path, exist_ok=True)
 
-def save_json(filename, data):
-    """Save data as JSON file"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"   Saved {filename}")
+def save_json(filename, data, sort_keys=False):
+    """Save data as JSON file, formatted per the output settings"""
+    from src.utils.codec import get_codec
+    from src.utils.atomic_writer import atomic_write
+    if atomic_write(filename, get_codec().encode(data, sort_keys=sort_keys)):
+        print(f"   Saved {filename}")
+    else:
+        print(f"   Unchanged {filename}")
 
 def main():
     print(" Kasparro Multi-Agent Content Generation System")
@@ -34,6 +36,11 @@ def main():
     # 2. Parse product data
     print("\n🤖 Parsing product data...")
     from src.core.models import Product
+    from src.utils.clock import RunClock
+    
+    # One timestamp for every page of this run
+    run_clock = RunClock.from_config()
+    generated_at = run_clock.isoformat()
     
     # Extract with flexible field names
     product = Product(
@@ -109,7 +116,7 @@ def main():
         "page_type": "FAQ",
         "content": {
             "metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at,
                 "total_questions": len(faq_items),
                 "system": "Kasparro Assignment System"
             },
@@ -124,7 +131,7 @@ def main():
         "page_type": "ProductPage",
         "content": {
             "metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at,
                 "product": product.name
             },
             "product_info": {
@@ -162,7 +169,7 @@ def main():
         "page_type": "ComparisonPage",
         "content": {
             "metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at,
                 "compared_products": [product.name, product_b["name"]]
             },
             "product_a": {
@@ -186,9 +193,9 @@ def main():
     print("\n Saving outputs...")
     ensure_directory("outputs")
     
-    save_json("outputs/faq.json", faq_output)
-    save_json("outputs/product_page.json", product_output)
-    save_json("outputs/comparison.json", comparison_output)
+    save_json("outputs/faq.json", faq_output, run_clock.deterministic)
+    save_json("outputs/product_page.json", product_output, run_clock.deterministic)
+    save_json("outputs/comparison.json", comparison_output, run_clock.deterministic)
     
     # 8. Summary
     print("\n" + "=" * 60)
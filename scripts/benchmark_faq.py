@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark FAQ template rendering against the number of Q&A pairs
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.templates.faq_template import faq_template
+
+SAMPLE_QUESTIONS = [
+    "What is {name}?",
+    "How to apply {name} with other serums?",
+    "Is {name} safe during pregnancy?",
+    "Is {name} worth the price?",
+    "How does {name} compare to alternatives?",
+    "Which ingredient in {name} brightens skin?",
+    "Can {name} be stored in the fridge?"
+]
+
+def make_qa_pairs(count: int):
+    """Build count synthetic Q&A pairs cycling through every category"""
+    return [
+        (SAMPLE_QUESTIONS[i % len(SAMPLE_QUESTIONS)].format(name=f"Serum {i}"), f"Answer {i}")
+        for i in range(count)
+    ]
+
+def time_render(qa_pairs, repeats: int) -> float:
+    """Best wall-clock time of several renders, in seconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        faq_template(qa_pairs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_benchmark(sizes, repeats: int):
+    """Print render time and per-question cost for each FAQ size"""
+    print(f"{'questions':>10} {'total ms':>10} {'us/question':>12} {'vs smallest':>12}")
+    baseline = None
+    for size in sizes:
+        elapsed = time_render(make_qa_pairs(size), repeats)
+        per_question = elapsed / size * 1e6
+        baseline = baseline or per_question
+        print(f"{size:>10} {elapsed * 1000:>10.2f} {per_question:>12.2f} {per_question / baseline:>11.2f}x")
+    print("\nLinear scaling keeps us/question roughly flat as the FAQ grows.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark faq_template scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.repeats)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Regenerate sitemaps and the JSON-LD product feed from bulk output shards
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.output.sitemap import generate_feeds, iter_shard_pages
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write sitemap index, sitemaps and products.jsonld")
+    parser.add_argument("--shards", default="outputs/bulk", help="ShardedPageWriter output directory")
+    parser.add_argument("--output", default="outputs/feeds", help="Directory for the generated feeds")
+    parser.add_argument("--base-url", required=True, help="Site root, e.g. https://shop.example.com")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    summary = generate_feeds(iter_shard_pages(args.shards), args.output, args.base_url)
+    elapsed = time.perf_counter() - start
+    print(f"{summary.urls} URLs in {len(summary.sitemaps)} sitemaps, {summary.products} products in feed, "
+          f"{summary.skipped} pages skipped ({elapsed:.2f}s)")
\ No newline at end of file
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Generate pages for every product of a catalog, comparing each against its
+nearest catalog competitor
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents.parser_agent import parse_product
+from src.core.orchestrator import Orchestrator
+from src.output.bulk_writer import ShardedPageWriter
+from src.utils.clock import RunClock
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pipeline over a product catalog")
+    parser.add_argument("catalog", help="JSON list of product records in the product_input.json format")
+    parser.add_argument("--output", default="outputs/bulk", help="ShardedPageWriter output directory")
+    args = parser.parse_args()
+
+    with open(args.catalog, "r", encoding="utf-8") as f:
+        records = json.load(f)
+
+    start = time.perf_counter()
+    # The competitor index is built once for the whole catalog
+    orchestrator = Orchestrator.from_catalog([parse_product(record) for record in records], RunClock.from_config())
+
+    failed = 0
+    with ShardedPageWriter.from_config(args.output) as writer:
+        for record in records:
+            result = orchestrator.run(record)
+            if not result.success:
+                failed += 1
+                print(f"Skipped {parse_product(record).name}: {'; '.join(result.errors)}")
+                continue
+            product_id = result.outputs["product_page"]["metadata"]["product_name"]
+            for page_type, page in result.outputs.items():
+                writer.write(page_type, product_id, page)
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(records) - failed} products written to {args.output}, {failed} failed ({elapsed:.2f}s)")
\ No newline at end of file
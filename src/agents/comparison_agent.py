@@ -1,47 +1,127 @@
+from typing import List, Optional, Sequence, Tuple
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
-from src.core.models import Product
-from src.templates.comparison_template import comparison_template
+from src.core.models import Product, ProductFeatures
+from src.templates.comparison_template import comparison_template, multi_comparison_template
+from src.templates.schemas import resolve_schema
 from src.logic_blocks.comparison_block import generate_comparison_block
+from src.logic_blocks.multi_comparison_block import generate_multi_comparison_block
+
+# Fallback Product B when no catalog competitor is available;
+# name and price (and any other field) can be overridden in settings.yaml
+FICTIONAL_PRODUCT_DEFAULTS = {
+    "name": "RadiantX Serum",
+    "concentration": "5% Vitamin C",
+    "skin_type": ["All Skin Types"],
+    "ingredients": ["Vitamin C", "Glycerin"],
+    "benefits": ["Basic Brightening", "Light Hydration"],
+    "usage": "Apply once daily, preferably in the morning",
+    "side_effects": "Minimal to none for most users",
+    "price": 899
+}
+
+def get_fictional_product() -> Product:
+    """Build the fictional comparison product from agents.comparison_agent.fictional_product"""
+    from src.core.config import ConfigManager
+    
+    overrides = ConfigManager().get("agents.comparison_agent.fictional_product", {})
+    return Product(**{**FICTIONAL_PRODUCT_DEFAULTS, **overrides})
+
+def select_competitor(
+    product: Product,
+    competitor_index=None,
+    features: Optional[ProductFeatures] = None
+) -> Tuple[Product, Optional[float]]:
+    """
+    Pick Product B for a comparison page
+    
+    Args:
+        product: Product A
+        competitor_index: Optional CompetitorIndex over the real catalog
+        features: Precomputed features of product A
+        
+    Returns:
+        (competitor, similarity); similarity is None for the fictional fallback
+    """
+    if competitor_index is not None:
+        matches = competitor_index.top_k(product, k=1, features=features)
+        if matches:
+            return matches[0]
+    return get_fictional_product(), None
 
 class ComparisonAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, competitor_index=None, schema=None):
         super().__init__(name="ComparisonAgent", version="1.0.0")
+        self.competitor_index = competitor_index
+        self.schema = resolve_schema(schema)
         
     def process(self, input_data: AgentInput) -> dict:
-        """Generate comparison page with fictional product"""
+        """Generate comparison page against the most comparable catalog product"""
         context = input_data.data
         product_a = context.get("product")
         
         if not product_a or not isinstance(product_a, Product):
             raise ValueError("Product A data not available")
         
-        # Create fictional Product B
-        product_b = Product(
-            name="RadiantX Serum",
-            concentration="5% Vitamin C",
-            skin_type=["All Skin Types"],
-            ingredients=["Vitamin C", "Glycerin"],
-            benefits=["Basic Brightening", "Light Hydration"],
-            usage="Apply once daily, preferably in the morning",
-            side_effects="Minimal to none for most users",
-            price=899
-        )
+        features_a = context.get("features") or ProductFeatures.from_product(product_a)
+        
+        # Select Product B from the catalog, falling back to the fictional product
+        product_b, similarity = select_competitor(product_a, self.competitor_index, features_a)
+        fictional_b = similarity is None
+        features_b = ProductFeatures.from_product(product_b)
         
         # Generate comparison data
-        comparison_data = generate_comparison_block(product_a, product_b)
+        comparison_data = generate_comparison_block(product_a, product_b, features_a, features_b, fictional_b=fictional_b)
         
         # Generate page using template
-        page_content = comparison_template(product_a, product_b, comparison_data)
+        page_content = comparison_template(product_a, product_b, comparison_data, features_a, features_b, self.schema)
         
         result = {
             "page_type": "ComparisonPage",
             "content": page_content,
             "metadata": {
+                "product_name": product_a.name,
                 "compared_products": [product_a.name, product_b.name],
+                "competitor_source": "fictional" if fictional_b else "catalog",
+                "competitor_similarity": similarity,
                 "generated_by": self.name,
                 "analysis_depth": "comprehensive"
             }
         }
         
         self.logger.info(f"Generated comparison: {product_a.name} vs {product_b.name}")
+        return result
+    
+    def compare_products(
+        self,
+        products: Sequence[Product],
+        features: Optional[List[ProductFeatures]] = None
+    ) -> dict:
+        """
+        Generate one N-way comparison page for several catalog products
+        
+        Args:
+            products: Products to compare (3-10), in display order; a pair
+                goes through process() instead
+            features: Precomputed features, one per product
+            
+        Returns:
+            Agent result in the same shape as process()
+        """
+        features = features or [ProductFeatures.from_product(product) for product in products]
+        comparison_data = generate_multi_comparison_block(products, features)
+        page_content = multi_comparison_template(products, comparison_data, features, self.schema)
+        
+        names = comparison_data["products"]
+        result = {
+            "page_type": "ComparisonPage",
+            "content": page_content,
+            "metadata": {
+                "compared_products": names,
+                "competitor_source": "catalog",
+                "generated_by": self.name,
+                "analysis_depth": "comprehensive"
+            }
+        }
+        
+        self.logger.info(f"Generated {len(names)}-way comparison: {', '.join(names)}")
         return result
\ No newline at end of file
@@ -1,15 +1,19 @@
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
-from src.core.models import Product
+from src.core.models import Product, ProductFeatures
 from src.templates.faq_template import faq_template
 from src.logic_blocks.benefits_block import generate_benefits_block
 from src.logic_blocks.usage_block import generate_usage_block
 from src.logic_blocks.safety_block import generate_safety_block
 from src.logic_blocks.price_block import generate_price_block
 from src.logic_blocks.seo_block import generate_seo_metadata
+from src.templates.schemas import resolve_schema
 
 class FAQAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, market_stats=None, keyword_stats=None, schema=None):
         super().__init__(name="FAQAgent", version="1.0.0")
+        self.market_stats = market_stats
+        self.keyword_stats = keyword_stats
+        self.schema = resolve_schema(schema)
         
     def process(self, input_data: AgentInput) -> dict:
         """Generate FAQ page from questions and product data"""
@@ -22,17 +26,20 @@ class FAQAgent(BaseAgent):
         if not product or not isinstance(product, Product):
             raise ValueError("Product data not available")
         
-        if not questions_data or "questions" not in questions_data:
+        if not questions_data:
             raise ValueError("Questions data not available")
         
-        questions = questions_data["questions"]
+        # The orchestrator merges the question agent's result into the
+        # context, so "questions" may already be the category dict
+        questions = questions_data.get("questions", questions_data)
+        features = context.get("features") or ProductFeatures.from_product(product)
         
         # Generate answers using logic blocks
-        safety_info = generate_safety_block(product)
-        usage_info = generate_usage_block(product)
-        benefits_info = generate_benefits_block(product)
-        price_info = generate_price_block(product)
-        seo_info = generate_seo_metadata(product.to_dict())
+        safety_info = generate_safety_block(product, features)
+        usage_info = generate_usage_block(product, features)
+        benefits_info = generate_benefits_block(product, features)
+        price_info = generate_price_block(product, features, self.market_stats)
+        seo_info = generate_seo_metadata(product.to_dict(), self.keyword_stats)
         
         # Create Q&A pairs (select questions from each category)
         qa_pairs = []
@@ -41,7 +48,7 @@ class FAQAgent(BaseAgent):
         if "informational" in questions and questions["informational"]:
             qa_pairs.append((
                 questions["informational"][0],
-                f"{product.name} is a {product.concentration} serum designed for {', '.join(product.skin_type)} skin types. It features {', '.join(product.ingredients)} for effective skincare."
+                f"{product.name} is a {product.concentration} serum designed for {features.skin_type_text} skin types. It features {features.ingredients_text} for effective skincare."
             ))
         
         # Safety questions
@@ -69,17 +76,18 @@ class FAQAgent(BaseAgent):
         if "comparison" in questions and questions["comparison"]:
             qa_pairs.append((
                 questions["comparison"][0],
-                f"{product.name} contains {len(product.ingredients)} key ingredients including {product.ingredients[0]}, making it more comprehensive than basic Vitamin C serums that typically have only one active ingredient."
+                f"{product.name} contains {features.ingredients_count} key ingredients including {product.ingredients[0]}, making it more comprehensive than basic Vitamin C serums that typically have only one active ingredient."
             ))
         
         # Generate FAQ using template
-        faq_content = faq_template(qa_pairs)
+        faq_content = faq_template(qa_pairs, self.schema)
         
         # Add metadata
         result = {
             "page_type": "FAQ",
             "content": faq_content,
             "metadata": {
+                "product_name": product.name,
                 "total_questions": len(qa_pairs),
                 "categories_covered": list(questions.keys()),
                 "seo": seo_info,
@@ -1,7 +1,60 @@
+from typing import Any, Dict
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
-from src.core.models import Product
+from src.core.models import Product, ProductFeatures
 from src.core.exceptions import ValidationError
 
+def parse_product(data: Dict[str, Any]) -> Product:
+    """
+    Convert a raw product record to a Product - handle ANY field names
+    
+    Args:
+        data: Product record in the product_input.json format, or keyed by
+            Product attribute names
+        
+    Returns:
+        Product; missing fields default to empty values
+    """
+    # Try to extract fields with flexible naming
+    name = data.get("product_name") or data.get("name") or "Unknown Product"
+    concentration = data.get("concentration") or ""
+    
+    # Handle skin_type - could be string or list
+    skin_type = data.get("skin_type") or []
+    if isinstance(skin_type, str):
+        skin_type = [skin_type]
+        
+    # Handle ingredients
+    ingredients = data.get("key_ingredients") or data.get("ingredients") or data.get("keyIngredients") or []
+    if isinstance(ingredients, str):
+        ingredients = [ingredients]
+        
+    # Handle benefits  
+    benefits = data.get("benefits") or []
+    if isinstance(benefits, str):
+        benefits = [benefits]
+        
+    usage = data.get("how_to_use") or data.get("usage") or data.get("howToUse") or ""
+    side_effects = data.get("side_effects") or data.get("sideEffects") or ""
+    
+    # Handle price - could be string or number
+    price = data.get("price") or 0
+    if isinstance(price, str):
+        try:
+            price = int(price)
+        except:
+            price = 0
+    
+    return Product(
+        name=name,
+        concentration=concentration,
+        skin_type=skin_type,
+        ingredients=ingredients,
+        benefits=benefits,
+        usage=usage,
+        side_effects=side_effects,
+        price=price
+    )
+
 class DataParserAgent(BaseAgent):
     def __init__(self):
         super().__init__(name="DataParserAgent", version="1.0.0")
@@ -16,56 +69,19 @@ class DataParserAgent(BaseAgent):
     def process(self, input_data: AgentInput) -> dict:
         """Convert raw data to Product model - handle ANY field names"""
         data = input_data.data
+        # The orchestrator passes its context, with the raw product under "input"
+        if isinstance(data.get("input"), dict):
+            data = data["input"]
         
-        # Try to extract fields with flexible naming
-        name = data.get("product_name") or data.get("name") or "Unknown Product"
-        concentration = data.get("concentration") or ""
-        
-        # Handle skin_type - could be string or list
-        skin_type = data.get("skin_type") or []
-        if isinstance(skin_type, str):
-            skin_type = [skin_type]
-            
-        # Handle ingredients
-        ingredients = data.get("key_ingredients") or data.get("ingredients") or data.get("keyIngredients") or []
-        if isinstance(ingredients, str):
-            ingredients = [ingredients]
-            
-        # Handle benefits  
-        benefits = data.get("benefits") or []
-        if isinstance(benefits, str):
-            benefits = [benefits]
-            
-        usage = data.get("how_to_use") or data.get("usage") or data.get("howToUse") or ""
-        side_effects = data.get("side_effects") or data.get("sideEffects") or ""
-        
-        # Handle price - could be string or number
-        price = data.get("price") or 0
-        if isinstance(price, str):
-            try:
-                price = int(price)
-            except:
-                price = 0
-        
-        print(f"DEBUG: Parsed name: {name}")
-        print(f"DEBUG: Parsed ingredients: {ingredients}")
-        
-        # Create Product object
-        product = Product(
-            name=name,
-            concentration=concentration,
-            skin_type=skin_type,
-            ingredients=ingredients,
-            benefits=benefits,
-            usage=usage,
-            side_effects=side_effects,
-            price=price
-        )
+        product = parse_product(data)
+        print(f"DEBUG: Parsed name: {product.name}")
+        print(f"DEBUG: Parsed ingredients: {product.ingredients}")
         
         self.logger.info(f"Successfully parsed product: {product.name}")
         
         return {
             "product": product,
+            "features": ProductFeatures.from_product(product),
             "parsed_at": "2024-01-01T00:00:00Z",
             "status": "success"
         }
\ No newline at end of file
@@ -1,15 +1,34 @@
+from typing import Any, Dict, Sequence, Union
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
-from src.core.models import Product
+from src.core.models import Product, ProductFeatures
 from src.templates.product_template import product_template
 from src.logic_blocks.benefits_block import generate_benefits_block
 from src.logic_blocks.usage_block import generate_usage_block
 from src.logic_blocks.safety_block import generate_safety_block
 from src.logic_blocks.price_block import generate_price_block
 from src.logic_blocks.seo_block import generate_seo_metadata
+from src.templates.schemas import resolve_schema
+from src.templates.locales import Locale, get_locale
+
+# Free shipping threshold, in INR
+FREE_SHIPPING_THRESHOLD = 999
 
 class ProductPageAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, market_stats=None, keyword_stats=None, schema=None):
         super().__init__(name="ProductPageAgent", version="1.0.0")
+        self.market_stats = market_stats
+        self.keyword_stats = keyword_stats
+        self.schema = resolve_schema(schema)
+    
+    def compute_blocks(self, product: Product, features: ProductFeatures) -> Dict[str, Any]:
+        """Locale-independent content blocks for a product"""
+        return {
+            "benefits": generate_benefits_block(product, features),
+            "usage": generate_usage_block(product, features),
+            "safety": generate_safety_block(product, features),
+            "price": generate_price_block(product, features, self.market_stats),
+            "seo": generate_seo_metadata(product.to_dict(), self.keyword_stats)
+        }
         
     def process(self, input_data: AgentInput) -> dict:
         """Generate complete product page"""
@@ -19,32 +38,29 @@ class ProductPageAgent(BaseAgent):
         if not product or not isinstance(product, Product):
             raise ValueError("Product data not available")
         
-        # Generate all content blocks
-        benefits_info = generate_benefits_block(product)
-        usage_info = generate_usage_block(product)
-        safety_info = generate_safety_block(product)
-        price_info = generate_price_block(product)
-        seo_info = generate_seo_metadata(product.to_dict())
+        features = context.get("features") or ProductFeatures.from_product(product)
+        
+        blocks = self.compute_blocks(product, features)
         
         # Prepare sections for template
         sections = {
             "header": {
                 "title": product.name,
-                "subtitle": f"{product.concentration} for {', '.join(product.skin_type)} Skin",
+                "subtitle": f"{product.concentration} for {features.skin_type_text} Skin",
                 "tagline": "Advanced Skincare Serum"
             },
             "overview": {
-                "description": f"A potent serum featuring {', '.join(product.ingredients)} for visible brightening and spot reduction.",
+                "description": f"A potent serum featuring {features.ingredients_text} for visible brightening and spot reduction.",
                 "key_features": [
                     f"Concentration: {product.concentration}",
-                    f"Skin Type: {', '.join(product.skin_type)}",
-                    f"Key Ingredients: {', '.join(product.ingredients)}"
+                    f"Skin Type: {features.skin_type_text}",
+                    f"Key Ingredients: {features.ingredients_text}"
                 ]
             },
-            "benefits": benefits_info,
-            "usage_instructions": usage_info,
-            "safety_information": safety_info,
-            "pricing": price_info,
+            "benefits": blocks["benefits"],
+            "usage_instructions": blocks["usage"],
+            "safety_information": blocks["safety"],
+            "pricing": blocks["price"],
             "call_to_action": {
                 "primary": f"Get {product.name} for ₹{product.price}",
                 "secondary": "Free shipping on orders above ₹999"
@@ -52,7 +68,7 @@ class ProductPageAgent(BaseAgent):
         }
         
         # Generate page using template
-        page_content = product_template(sections)
+        page_content = product_template(sections, self.schema)
         
         result = {
             "page_type": "ProductPage",
@@ -60,10 +76,104 @@ class ProductPageAgent(BaseAgent):
             "metadata": {
                 "product_name": product.name,
                 "generated_by": self.name,
-                "seo": seo_info,
+                "seo": blocks["seo"],
                 "sections_generated": len(sections)
             }
         }
         
         self.logger.info(f"Generated product page for {product.name}")
-        return result
\ No newline at end of file
+        return result
+    
+    def render_locales(
+        self,
+        product: Product,
+        locales: Sequence[Union[str, Locale]],
+        features: ProductFeatures = None
+    ) -> Dict[str, dict]:
+        """
+        Product pages for several locales from a single block computation
+        
+        The content blocks are computed once and shared by every locale; each
+        locale only formats its strings from the message catalog and converts
+        and formats prices. Block prose the catalogs do not cover stays in the
+        source language.
+        
+        Args:
+            product: Product to render
+            locales: Locale tags (e.g. "fr-FR") or compiled Locale objects
+            features: Precomputed product features (derived from product if omitted)
+            
+        Returns:
+            Dict mapping locale code to a page result like process() returns
+        """
+        features = features or ProductFeatures.from_product(product)
+        blocks = self.compute_blocks(product, features)
+        pages = {}
+        for locale in locales:
+            locale = get_locale(locale) if isinstance(locale, str) else locale
+            sections = self._localized_sections(product, features, blocks, locale)
+            pages[locale.code] = {
+                "page_type": "ProductPage",
+                "content": product_template(sections, self.schema),
+                "metadata": {
+                    "product_name": product.name,
+                    "generated_by": self.name,
+                    "locale": locale.code,
+                    "seo": blocks["seo"],
+                    "section_labels": {section: locale.messages.format(f"section.{section}") for section in sections},
+                    "sections_generated": len(sections)
+                }
+            }
+        return pages
+    
+    def _localized_sections(self, product: Product, features: ProductFeatures, blocks: Dict[str, Any], locale: Locale) -> Dict[str, Any]:
+        messages, numbers = locale.messages, locale.numbers
+        names = {
+            "concentration": product.concentration,
+            "skin_types": features.skin_type_text,
+            "ingredients": features.ingredients_text
+        }
+        price = numbers.currency(product.price)
+        
+        # Shallow copies: shared block values are reused, only the price fields differ per locale
+        price_block = dict(blocks["price"])
+        price_details = price_block["price_details"]
+        price_block["price_details"] = {
+            **price_details,
+            "amount": numbers.convert(price_details["amount"]),
+            "currency": locale.spec.currency,
+            "formatted": price,
+            "category": messages.get(f"price.{price_details['category']}", price_details["category"])
+        }
+        cost_analysis = price_block["cost_analysis"]
+        price_block["cost_analysis"] = {
+            **cost_analysis,
+            "cost_per_use": numbers.convert(cost_analysis["cost_per_use"]),
+            "cost_per_use_formatted": numbers.currency(cost_analysis["cost_per_use"], 2),
+            "monthly_cost": numbers.convert(cost_analysis["monthly_cost"]),
+            "monthly_cost_formatted": numbers.currency(cost_analysis["monthly_cost"], 2)
+        }
+        
+        return {
+            "header": {
+                "title": product.name,
+                "subtitle": messages.format("header.subtitle", **names),
+                "tagline": messages.format("header.tagline")
+            },
+            "overview": {
+                "description": messages.format("overview.description", **names),
+                "key_features": [
+                    messages.format("overview.concentration", **names),
+                    messages.format("overview.skin_type", **names),
+                    messages.format("overview.ingredients", **names)
+                ]
+            },
+            "benefits": blocks["benefits"],
+            "usage_instructions": blocks["usage"],
+            "safety_information": blocks["safety"],
+            "pricing": price_block,
+            "call_to_action": {
+                "primary": messages.format("cta.primary", name=product.name, price=price),
+                "secondary": messages.format("cta.secondary", threshold=numbers.currency(FREE_SHIPPING_THRESHOLD))
+            }
+        }
\ No newline at end of file
@@ -1,24 +1,19 @@
 class SimpleComparisonAgent:
+    def __init__(self, competitor_index=None):
+        self.competitor_index = competitor_index
+    
     def run(self, product_a):
-        # Create fictional product B
-        product_b_data = {
-            "name": "RadiantX Serum",
-            "concentration": "5% Vitamin C",
-            "skin_type": ["All"],
-            "ingredients": ["Vitamin C"],
-            "benefits": ["Brightening"],
-            "usage": "Apply once daily",
-            "side_effects": "None reported",
-            "price": 899
-        }
-        
-        from src.core.models import Product
-        product_b = Product(**product_b_data)
+        # Pick product B from the catalog, or the configured fictional product
+        from src.agents.comparison_agent import select_competitor
+        product_b, similarity = select_competitor(product_a, self.competitor_index)
         
         comparison_output = {
             "page_type": "ComparisonPage",
             "content": {
-                "metadata": {"generated_by": "SimpleComparisonAgent"},
+                "metadata": {
+                    "generated_by": "SimpleComparisonAgent",
+                    "competitor_source": "fictional" if similarity is None else "catalog"
+                },
                 "product_a": {
                     "name": product_a.name,
                     "ingredients": product_a.ingredients,
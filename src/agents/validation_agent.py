@@ -1,9 +1,44 @@
-﻿from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
+﻿from typing import Any, Dict, List, Optional, Sequence, Union
+from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
+from src.core.models import Product, ProductBatch, ValidationResult
+from src.core.rules import RuleSet, default_rule_set
+from src.core.exceptions import ValidationError
 
 class ValidationAgent(BaseAgent):
-    def __init__(self):
-        super().__init__(name="ValidationAgent", version="1.0.0")
+    def __init__(self, rules: Optional[Sequence[Dict[str, Any]]] = None, strict: Optional[bool] = None):
+        """
+        Args:
+            rules: Rule declarations (see src.core.rules); defaults to PRODUCT_RULES
+            strict: Raise ValidationError on failed error rules; defaults to
+                agents.validation_agent.strict
+        """
+        super().__init__(name="ValidationAgent", version="1.1.0")
+        self.rules = default_rule_set() if rules is None else RuleSet(rules)
+        if strict is None:
+            from src.core.config import ConfigManager
+            strict = ConfigManager().get("agents.validation_agent.strict", True)
+        self.strict = strict
     
     def process(self, input_data: AgentInput) -> dict:
-        # Always pass validation
-        return {"validation_passed": True, "details": {}, "recommendations": []}
\ No newline at end of file
+        """Check the parsed product against the business rules"""
+        product = input_data.data.get("product")
+        
+        if not product or not isinstance(product, Product):
+            raise ValueError("Product data not available")
+        
+        result = self.rules.validate(product)
+        for warning in result.warnings:
+            self.logger.warning(f"{product.name}: {warning}")
+        if self.strict and not result.is_valid:
+            raise ValidationError(f"{product.name} failed validation: {'; '.join(result.errors)}")
+        
+        return {
+            "validation_passed": result.is_valid,
+            "details": {"errors": result.errors, "warnings": result.warnings, "score": result.score},
+            "recommendations": result.warnings
+        }
+    
+    def validate_batch(self, products: Union[ProductBatch, Sequence[Product]]) -> List[ValidationResult]:
+        """Validate a whole catalog in one column-wise pass"""
+        batch = products if isinstance(products, ProductBatch) else ProductBatch.from_products(products)
+        return self.rules.validate_batch(batch)
\ No newline at end of file
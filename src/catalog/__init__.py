@@ -0,0 +1,19 @@
+"""
+Catalog package - catalog-wide indexes and statistics
+"""
+
+from .similarity import MinHasher, CompetitorIndex
+from .index import CatalogIndex, Selection
+from .keywords import KeywordStatistics
+from .market_stats import KLLSketch, MarketStatistics, MarketSummary
+
+__all__ = [
+    'MinHasher',
+    'CompetitorIndex',
+    'CatalogIndex',
+    'Selection',
+    'KLLSketch',
+    'MarketStatistics',
+    'MarketSummary',
+    'KeywordStatistics'
+]
@@ -0,0 +1,313 @@
+"""
+Bitmap-indexed catalog queries by ingredient, skin type, benefit and price
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.core.models import Product, ProductFeatures
+
+
+def _bits_from_positions(positions: Iterable[int], size: int) -> int:
+    """Build an integer bitmap with one bit set per position"""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _positions_from_bits(bits: int) -> Iterator[int]:
+    """Yield the set bit positions of an integer bitmap in ascending order"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class _Posting:
+    """
+    Positions of the products carrying one value.
+
+    Positions are appended as products are indexed; freeze() then keeps a
+    sorted array of positions for sparse values and a bitmap for values
+    whose array would be larger than a bitmap over the whole catalog.
+    Membership tests work on either form, so sparse postings are
+    intersected without expanding them into bitmaps.
+    """
+
+    __slots__ = ("positions", "bitmap", "count")
+
+    def __init__(self):
+        self.positions: Optional[array] = array("I")
+        self.bitmap: Optional[bytearray] = None
+        self.count = 0
+
+    def add(self, position: int):
+        self.count += 1
+        if self.bitmap is not None:
+            if position >> 3 >= len(self.bitmap):
+                self.bitmap.extend(bytes((position >> 3) + 1 - len(self.bitmap)))
+            self.bitmap[position >> 3] |= 1 << (position & 7)
+            return
+        self.positions.append(position)
+
+    def freeze(self, universe_size: int):
+        """Pick the smaller representation for a catalog of universe_size products"""
+        # 32 bits per stored position vs one bit per catalog product
+        dense = self.count * 32 > universe_size
+        if dense and self.bitmap is None:
+            self.bitmap = bytearray(_bits_from_positions(self.positions, universe_size).to_bytes((universe_size + 7) // 8, "little"))
+            self.positions = None
+        elif not dense and self.bitmap is not None:
+            self.positions = array("I", _positions_from_bits(int.from_bytes(self.bitmap, "little")))
+            self.bitmap = None
+
+    def __contains__(self, position: int) -> bool:
+        if self.bitmap is not None:
+            byte = position >> 3
+            return byte < len(self.bitmap) and bool(self.bitmap[byte] >> (position & 7) & 1)
+        i = bisect_left(self.positions, position)
+        return i < len(self.positions) and self.positions[i] == position
+
+    def to_bits(self, universe_size: int) -> int:
+        if self.bitmap is not None:
+            return int.from_bytes(self.bitmap, "little")
+        return _bits_from_positions(self.positions, universe_size)
+
+
+class Selection:
+    """
+    A set of catalog products produced by an index lookup.
+
+    Selections combine with & (and), | (or), - (and not) and ~ (not), each a
+    single integer operation over the catalog bitmap.
+    """
+
+    __slots__ = ("_index", "bits")
+
+    def __init__(self, index: "CatalogIndex", bits: int):
+        self._index = index
+        self.bits = bits
+
+    def __and__(self, other: "Selection") -> "Selection":
+        return Selection(self._index, self.bits & other.bits)
+
+    def __or__(self, other: "Selection") -> "Selection":
+        return Selection(self._index, self.bits | other.bits)
+
+    def __sub__(self, other: "Selection") -> "Selection":
+        return Selection(self._index, self.bits & ~other.bits)
+
+    def __invert__(self) -> "Selection":
+        return Selection(self._index, self._index.all().bits & ~self.bits)
+
+    def __len__(self) -> int:
+        return bin(self.bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        return _positions_from_bits(self.bits)
+
+    def positions(self) -> List[int]:
+        """Catalog positions in ascending order"""
+        return list(self)
+
+    def products(self) -> List[Product]:
+        """Matching products in catalog order"""
+        return [self._index.products[position] for position in self]
+
+
+class CatalogIndex:
+    """
+    In-memory catalog index answering boolean product queries.
+
+    Ingredients, skin types and benefits each get a per-value posting
+    (compressed while sparse), matched case-insensitively. Postings pick
+    their representation once the catalog is loaded (see freeze), so it
+    reflects the final catalog size. Prices are kept in a sorted index so
+    range lookups are two binary searches; products are appended unsorted
+    and freeze() sorts them in once.
+
+    Example:
+        index = CatalogIndex(products)
+        matches = index.ingredient("Niacinamide") & index.skin_type("Oily") & index.price_range(max_price=999)
+        matches.products()
+    """
+
+    FIELDS = ("ingredients", "skin_type", "benefits")
+    PRICE_BLOCK_SIZE = 1024
+
+    def __init__(self, products: Iterable[Product] = ()):
+        self.products: List[Product] = []
+        self._postings: Dict[str, Dict[str, _Posting]] = {field: {} for field in self.FIELDS}
+        self._price_index: List[Tuple[float, int]] = []
+        self._price_tail: List[Tuple[float, int]] = []
+        self._price_blocks: Optional[List[int]] = None
+        self._frozen = False
+        for product in products:
+            self.add(product)
+        self.freeze()
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def add(self, product: Product, features: Optional[ProductFeatures] = None) -> int:
+        """Index a product and return its catalog position"""
+        features = features or ProductFeatures.from_product(product)
+        position = len(self.products)
+        self.products.append(product)
+
+        values = {
+            "ingredients": features.ingredient_set,
+            "skin_type": {skin_type.lower() for skin_type in product.skin_type},
+            "benefits": features.benefit_set
+        }
+        for field, field_values in values.items():
+            postings = self._postings[field]
+            for value in field_values:
+                if value not in postings:
+                    postings[value] = _Posting()
+                postings[value].add(position)
+
+        self._price_tail.append((product.price, position))
+        self._frozen = False
+        return position
+
+    def freeze(self):
+        """
+        Choose every posting's representation for the current catalog size
+
+        Called once the constructor has loaded its products; products added
+        later are appended as-is and the index refreezes on the next lookup.
+        """
+        if self._price_tail:
+            # Timsort merges the sorted index and the sorted tail in one pass
+            self._price_tail.sort()
+            self._price_index += self._price_tail
+            self._price_index.sort()
+            self._price_tail = []
+            self._price_blocks = None
+        universe_size = len(self.products)
+        for postings in self._postings.values():
+            for posting in postings.values():
+                posting.freeze(universe_size)
+        self._frozen = True
+
+    def all(self) -> Selection:
+        """Every product in the catalog"""
+        return Selection(self, (1 << len(self.products)) - 1)
+
+    def ingredient(self, name: str) -> Selection:
+        """Products containing an ingredient"""
+        return self._lookup("ingredients", name)
+
+    def skin_type(self, name: str) -> Selection:
+        """Products suitable for a skin type"""
+        return self._lookup("skin_type", name)
+
+    def benefit(self, name: str) -> Selection:
+        """Products offering a benefit"""
+        return self._lookup("benefits", name)
+
+    def price_range(self, min_price: Optional[float] = None, max_price: Optional[float] = None) -> Selection:
+        """Products priced within [min_price, max_price]; either bound may be omitted"""
+        if not self._frozen:
+            self.freeze()
+        start = 0 if min_price is None else bisect_left(self._price_index, (min_price, -1))
+        end = len(self._price_index) if max_price is None else bisect_right(self._price_index, (max_price, len(self.products)))
+
+        # Whole blocks of the sorted index come from cached bitmaps, only the edges are rebuilt
+        block_size = self.PRICE_BLOCK_SIZE
+        first_block = -(-start // block_size)
+        last_block = end // block_size
+        if first_block >= last_block:
+            edge_positions = self._price_index[start:end]
+            bits = 0
+        else:
+            edge_positions = self._price_index[start:first_block * block_size] + self._price_index[last_block * block_size:end]
+            bits = 0
+            for block_bits in self._get_price_blocks()[first_block:last_block]:
+                bits |= block_bits
+
+        bits |= _bits_from_positions((position for _, position in edge_positions), len(self.products))
+        return Selection(self, bits)
+
+    def values(self, field: str) -> List[str]:
+        """Distinct (lowercased) values indexed for a field"""
+        return sorted(self._postings[field])
+
+    def query(
+        self,
+        ingredients: Iterable[str] = (),
+        skin_types: Iterable[str] = (),
+        benefits: Iterable[str] = (),
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[Product]:
+        """
+        Products matching every given criterion
+
+        Args:
+            ingredients: Ingredients that must all be present
+            skin_types: Skin types that must all be supported
+            benefits: Benefits that must all be offered
+            min_price: Inclusive lower price bound
+            max_price: Inclusive upper price bound
+
+        Returns:
+            Matching products in catalog order
+        """
+        if not self._frozen:
+            self.freeze()
+        postings = []
+        for field, names in (("ingredients", ingredients), ("skin_type", skin_types), ("benefits", benefits)):
+            for name in names:
+                posting = self._postings[field].get(name.lower())
+                if posting is None:
+                    return []
+                postings.append(posting)
+
+        # A sparse posting bounds the result: probe the others per position
+        # instead of expanding every posting into a catalog-wide bitmap
+        smallest = min(postings, key=lambda posting: posting.count, default=None)
+        if smallest is not None and smallest.bitmap is None:
+            others = [posting for posting in postings if posting is not smallest]
+            low = float("-inf") if min_price is None else min_price
+            high = float("inf") if max_price is None else max_price
+            return [
+                self.products[position] for position in smallest.positions
+                if all(position in posting for posting in others)
+                and low <= self.products[position].price <= high
+            ]
+
+        selection = self.all()
+        for name in ingredients:
+            selection &= self.ingredient(name)
+        for name in skin_types:
+            selection &= self.skin_type(name)
+        for name in benefits:
+            selection &= self.benefit(name)
+        if min_price is not None or max_price is not None:
+            selection &= self.price_range(min_price, max_price)
+        return selection.products()
+
+    def _get_price_blocks(self) -> List[int]:
+        if self._price_blocks is None:
+            block_size = self.PRICE_BLOCK_SIZE
+            self._price_blocks = [
+                _bits_from_positions(
+                    (position for _, position in self._price_index[offset:offset + block_size]),
+                    len(self.products)
+                )
+                for offset in range(0, len(self._price_index) - block_size + 1, block_size)
+            ]
+        return self._price_blocks
+
+    def _lookup(self, field: str, value: str) -> Selection:
+        if not self._frozen:
+            self.freeze()
+        posting = self._postings[field].get(value.lower())
+        if posting is None:
+            return Selection(self, 0)
+        return Selection(self, posting.to_bits(len(self.products)))
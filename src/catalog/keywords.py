@@ -0,0 +1,86 @@
+"""
+Catalog document frequencies for TF-IDF keyword ranking
+"""
+import math
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Tuple, Union
+from src.core.models import Product
+
+
+def keyword_terms(product_data: Dict[str, Any]) -> List[str]:
+    """
+    Candidate keywords of a product in first-occurrence order, with repeats
+
+    Name words, ingredients and benefits are lowercased; a term appearing in
+    several fields is repeated once per field, which is its term frequency.
+    """
+    terms = []
+    if product_data.get('name'):
+        terms.extend(product_data['name'].lower().split())
+    if isinstance(product_data.get('ingredients'), list):
+        terms.extend(ingredient.lower() for ingredient in product_data['ingredients'])
+    if isinstance(product_data.get('benefits'), list):
+        terms.extend(benefit.lower() for benefit in product_data['benefits'])
+    return terms
+
+
+class KeywordStatistics:
+    """
+    Incrementally maintained document frequencies of catalog keywords.
+
+    Adding a product bumps the counter of each distinct term it contains;
+    IDF is derived from the counters on demand, so nothing is recomputed
+    when the catalog grows. Counters gathered on separate workers combine
+    with merge().
+    """
+
+    def __init__(self):
+        self.documents = 0
+        self.document_frequency: Counter = Counter()
+
+    @classmethod
+    def from_products(cls, products: Iterable[Union[Product, Dict[str, Any]]]) -> "KeywordStatistics":
+        """Count keyword document frequencies over a catalog"""
+        stats = cls()
+        for product in products:
+            stats.add(product)
+        return stats
+
+    def __len__(self) -> int:
+        return self.documents
+
+    def add(self, product: Union[Product, Dict[str, Any]]):
+        """Count one product's distinct keywords"""
+        product_data = product.to_dict() if isinstance(product, Product) else product
+        self.documents += 1
+        self.document_frequency.update(set(keyword_terms(product_data)))
+
+    def merge(self, other: "KeywordStatistics") -> "KeywordStatistics":
+        """Fold counters gathered elsewhere into this instance and return self"""
+        self.documents += other.documents
+        self.document_frequency.update(other.document_frequency)
+        return self
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency; 1.0 for an empty catalog"""
+        return math.log((1 + self.documents) / (1 + self.document_frequency[term])) + 1
+
+    def rank(self, terms: List[str], limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank terms by TF-IDF
+
+        Args:
+            terms: Terms of one document, repeated per occurrence
+            limit: Maximum number of keywords to return
+
+        Returns:
+            (term, score) pairs, best first; ties keep first-occurrence order
+        """
+        term_frequency = Counter(terms)
+        scored = [
+            (term, count * self.idf(term))
+            for term, count in term_frequency.items()
+        ]
+        # Counter preserves insertion order, and sort is stable
+        scored.sort(key=lambda item: -item[1])
+        return scored[:limit]
@@ -0,0 +1,283 @@
+"""
+Streaming, mergeable price statistics per product segment
+"""
+import math
+import random
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from src.core.models import Product
+
+_CONCENTRATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*%\s*(.*)")
+
+# Upper bounds (exclusive) of each concentration band, in percent
+CONCENTRATION_BAND_BOUNDS = (5, 10, 20)
+CONCENTRATION_BANDS = ("<5%", "5-10%", "10-20%", "20%+")
+UNSPECIFIED_BAND = "unspecified"
+
+
+def product_segment(product: Product) -> Tuple[str, str]:
+    """
+    Market segment of a product: (active ingredient category, concentration band)
+
+    "10% Vitamin C" maps to ("vitamin c", "10-20%"). Products without a
+    parsable percentage fall back to their concentration text, or first
+    ingredient, with an unspecified band.
+    """
+    match = _CONCENTRATION_PATTERN.search(product.concentration or "")
+    if match:
+        percentage = float(match.group(1))
+        band = CONCENTRATION_BANDS[sum(1 for bound in CONCENTRATION_BAND_BOUNDS if percentage >= bound)]
+        category = match.group(2).strip().lower()
+        if category:
+            return category, band
+    else:
+        band = UNSPECIFIED_BAND
+        category = (product.concentration or "").strip().lower()
+        if category:
+            return category, band
+
+    category = product.ingredients[0].strip().lower() if product.ingredients else "unknown"
+    return category, band
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over a stream of numbers.
+
+    Items are kept in a stack of compactors; compactor h holds items of
+    weight 2**h. When the sketch is full, the lowest over-capacity compactor
+    is sorted and every other item promoted to the next level, so memory
+    stays O(k) however many values are added. Sketches built on different
+    workers merge by concatenating compactors level by level.
+
+    Attributes:
+        k: Accuracy parameter; rank error is roughly 1.7 / k
+        count: Number of values added (exact)
+    """
+
+    _CAPACITY_DECAY = 2 / 3
+
+    def __init__(self, k: int = 200, seed: int = 1):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._rng = random.Random(seed)
+        self._compactors: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._cdf: Optional[Tuple[List[float], List[int]]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def update(self, value: float):
+        """Add one value"""
+        value = float(value)
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._compactors[0].append(value)
+        self._size += 1
+        self._cdf = None
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch into this one (in place) and return self"""
+        if other.count == 0:
+            return self
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for level, items in enumerate(other._compactors):
+            self._compactors[level].extend(items)
+
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._size = sum(len(items) for items in self._compactors)
+        self._cdf = None
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q in [0, 1]; None when empty"""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return None
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+
+        values, cumulative_weights = self._get_cdf()
+        target = q * cumulative_weights[-1]
+        return values[min(bisect_left(cumulative_weights, target), len(values) - 1)]
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        """Approximate values at several quantiles"""
+        return [self.quantile(q) for q in qs]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return int(math.ceil(self.k * self._CAPACITY_DECAY ** depth)) + 1
+
+    def _grow(self):
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def _compress(self):
+        for level, items in enumerate(self._compactors):
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._grow()
+                items.sort()
+                # An odd item out stays behind at this level
+                leftover = [items.pop()] if len(items) % 2 else []
+                offset = self._rng.randrange(2)
+                self._compactors[level + 1].extend(items[offset::2])
+                self._compactors[level] = leftover
+                self._size = sum(len(level_items) for level_items in self._compactors)
+                return
+
+    def _get_cdf(self) -> Tuple[List[float], List[int]]:
+        if self._cdf is None:
+            weighted = sorted(
+                (value, 1 << level)
+                for level, items in enumerate(self._compactors)
+                for value in items
+            )
+            values, cumulative_weights, total = [], [], 0
+            for value, weight in weighted:
+                total += weight
+                values.append(value)
+                cumulative_weights.append(total)
+            self._cdf = (values, cumulative_weights)
+        return self._cdf
+
+
+@dataclass(frozen=True)
+class MarketSummary:
+    """Price distribution of one market segment"""
+    segment: str
+    sample_size: int
+    p25: float
+    median: float
+    p75: float
+    min: float
+    max: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class MarketStatistics:
+    """
+    Catalog-wide price statistics per market segment.
+
+    Every ingested product updates a KLL sketch for its (category,
+    concentration band) segment, for its category across bands and for the
+    whole catalog. Summaries are cached per segment and only recomputed
+    after that segment changes, so price blocks read medians and quartiles
+    without another pass over the catalog. Lookups fall back to the wider
+    segment while a segment has fewer than min_samples products.
+
+    Statistics gathered on separate workers combine with merge().
+    """
+
+    OVERALL = ("all", None)
+
+    def __init__(self, k: int = 200, min_samples: int = 5):
+        self.k = k
+        self.min_samples = min_samples
+        self._sketches: Dict[Tuple[str, Optional[str]], KLLSketch] = {}
+        self._summaries: Dict[Tuple[str, Optional[str]], MarketSummary] = {}
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product], **kwargs) -> "MarketStatistics":
+        """Gather statistics over a catalog"""
+        stats = cls(**kwargs)
+        for product in products:
+            stats.add(product)
+        return stats
+
+    @classmethod
+    def from_config(cls, products: Iterable[Product] = ()) -> "MarketStatistics":
+        """Gather statistics using catalog.market_stats settings"""
+        from src.core.config import ConfigManager
+
+        settings = ConfigManager().get("catalog.market_stats", {})
+        return cls.from_products(
+            products,
+            k=settings.get("k", 200),
+            min_samples=settings.get("min_samples", 5)
+        )
+
+    def __len__(self) -> int:
+        sketch = self._sketches.get(self.OVERALL)
+        return sketch.count if sketch else 0
+
+    def add(self, product: Product):
+        """Ingest one product's price"""
+        category, band = product_segment(product)
+        for key in ((category, band), (category, None), self.OVERALL):
+            self._sketch(key).update(product.price)
+            self._summaries.pop(key, None)
+
+    def merge(self, other: "MarketStatistics") -> "MarketStatistics":
+        """Fold statistics gathered elsewhere into this instance and return self"""
+        for key, sketch in other._sketches.items():
+            self._sketch(key).merge(sketch)
+            self._summaries.pop(key, None)
+        return self
+
+    def segments(self) -> List[Tuple[str, Optional[str]]]:
+        """Keys of every segment with data"""
+        return sorted(self._sketches, key=lambda key: (key[0], key[1] or ""))
+
+    def summary(self, category: str, band: Optional[str] = None) -> Optional[MarketSummary]:
+        """Cached summary of one segment; None when it has no data"""
+        key = (category, band)
+        if key not in self._summaries:
+            sketch = self._sketches.get(key)
+            if sketch is None or sketch.count == 0:
+                return None
+            p25, median, p75 = sketch.quantiles((0.25, 0.5, 0.75))
+            self._summaries[key] = MarketSummary(
+                segment=category if band is None else f"{category} {band}",
+                sample_size=sketch.count,
+                p25=p25,
+                median=median,
+                p75=p75,
+                min=sketch.min,
+                max=sketch.max
+            )
+        return self._summaries[key]
+
+    def summary_for(self, product: Product) -> Optional[MarketSummary]:
+        """
+        Summary of the narrowest segment of a product with enough samples
+
+        Args:
+            product: Product to position (need not be ingested)
+
+        Returns:
+            MarketSummary, or None when no statistics have been gathered
+        """
+        category, band = product_segment(product)
+        for key in ((category, band), (category, None)):
+            summary = self.summary(*key)
+            if summary is not None and summary.sample_size >= self.min_samples:
+                return summary
+        return self.summary(*self.OVERALL)
+
+    def _sketch(self, key: Tuple[str, Optional[str]]) -> KLLSketch:
+        if key not in self._sketches:
+            self._sketches[key] = KLLSketch(k=self.k)
+        return self._sketches[key]
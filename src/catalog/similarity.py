@@ -0,0 +1,155 @@
+"""
+MinHash/LSH similarity index for competitor selection
+"""
+import hashlib
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Iterable, Set, Tuple
+from src.core.models import Product, ProductFeatures
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 61) - 2
+
+
+def _token_hash(token: str) -> int:
+    """Stable 64-bit token hash (the builtin hash() is salted per process)"""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def product_tokens(features: ProductFeatures) -> Set[str]:
+    """Ingredient and benefit tokens used for similarity, namespaced by field"""
+    tokens = {f"ingredient:{ingredient}" for ingredient in features.ingredient_set}
+    tokens.update(f"benefit:{benefit}" for benefit in features.benefit_set)
+    return tokens
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures of token sets"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        """MinHash signature of a token set"""
+        hashes = [_token_hash(token) for token in set(tokens)]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._permutations
+        )
+
+    @staticmethod
+    def estimate_jaccard(signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+        """Fraction of agreeing positions, an unbiased Jaccard estimate"""
+        matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+        return matches / len(signature_a)
+
+
+class CompetitorIndex:
+    """
+    Locality-sensitive index for finding the most comparable catalog products.
+
+    Each product's ingredient and benefit set is MinHashed and split into
+    bands; products sharing any band bucket become candidates, so a lookup
+    touches only a few buckets instead of scanning the catalog. Candidates
+    are then restricted to a price band around the query product and ranked
+    by estimated Jaccard similarity.
+
+    Attributes:
+        bands: Number of LSH bands (more bands find less similar candidates)
+        price_band: Allowed relative price distance, e.g. 0.5 for +/-50%
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, price_band: float = 0.5, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.price_band = price_band
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self.products: List[Product] = []
+        self._signatures: List[Tuple[int, ...]] = []
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product], **kwargs) -> "CompetitorIndex":
+        """Build an index over a catalog"""
+        index = cls(**kwargs)
+        for product in products:
+            index.add(product)
+        return index
+
+    @classmethod
+    def from_config(cls, products: Iterable[Product] = ()) -> "CompetitorIndex":
+        """Build an index using agents.comparison_agent.competitor_selection settings"""
+        from src.core.config import ConfigManager
+
+        settings = ConfigManager().get("agents.comparison_agent.competitor_selection", {})
+        return cls.from_products(
+            products,
+            num_perm=settings.get("num_perm", 64),
+            bands=settings.get("bands", 16),
+            price_band=settings.get("price_band", 0.5)
+        )
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def add(self, product: Product, features: Optional[ProductFeatures] = None) -> int:
+        """Add a product to the index and return its position"""
+        features = features or ProductFeatures.from_product(product)
+        signature = self.hasher.signature(product_tokens(features))
+        position = len(self.products)
+
+        self.products.append(product)
+        self._signatures.append(signature)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[(band, key)].append(position)
+        return position
+
+    def top_k(
+        self,
+        product: Product,
+        k: int = 1,
+        features: Optional[ProductFeatures] = None
+    ) -> List[Tuple[Product, float]]:
+        """
+        Find the k most comparable products for a product
+
+        Args:
+            product: Product to find competitors for (need not be indexed)
+            k: Maximum number of competitors to return
+            features: Precomputed product features (derived if omitted)
+
+        Returns:
+            List of (competitor, estimated similarity), most similar first
+        """
+        features = features or ProductFeatures.from_product(product)
+        signature = self.hasher.signature(product_tokens(features))
+
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets.get((band, key), ()))
+
+        low = product.price * (1 - self.price_band)
+        high = product.price * (1 + self.price_band)
+
+        scored = []
+        for position in candidates:
+            candidate = self.products[position]
+            if candidate.name == product.name or not low <= candidate.price <= high:
+                continue
+            similarity = MinHasher.estimate_jaccard(signature, self._signatures[position])
+            scored.append((-similarity, abs(candidate.price - product.price), candidate.name, position))
+
+        scored.sort()
+        return [(self.products[position], -neg_similarity) for neg_similarity, _, _, position in scored[:k]]
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [signature[band * self.rows:(band + 1) * self.rows] for band in range(self.bands)]
@@ -2,7 +2,7 @@
 Core system modules
 """
 
-from .models import Product, PageOutput
+from .models import Product, ProductFeatures, ProductBatch, PageOutput, ValidationResult
 from .orchestrator import Orchestrator, PipelineResult
 from .config import ConfigManager
 from .exceptions import (
@@ -16,7 +16,10 @@ from .exceptions import (
 
 __all__ = [
     'Product',
+    'ProductFeatures',
+    'ProductBatch',
     'PageOutput',
+    'ValidationResult',
     'Orchestrator',
     'PipelineResult',
     'ConfigManager',
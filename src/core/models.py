@@ -1,6 +1,7 @@
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Any, Iterable, Iterator, Optional, FrozenSet, Tuple
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.clock import utc_timestamp
 
 
 @dataclass
@@ -53,6 +54,158 @@ class Product:
         return f"{self.name} - {self.concentration} for {self.get_skin_type_string()} skin"
 
 
+PRODUCT_FIELDS = tuple(f.name for f in fields(Product))
+
+
+@dataclass
+class ProductBatch:
+    """
+    Column-oriented view of many products.
+    
+    Each attribute holds one list with an entry per product, in the same
+    order, so checks and calculations can run over a whole column at once.
+    Columns built from raw records may contain values of the wrong type or
+    None for missing fields; validate before turning rows into Products.
+    
+    Attributes:
+        name: Product names
+        concentration: Active ingredient concentrations
+        skin_type: Suitable skin types per product
+        ingredients: Key ingredients per product
+        benefits: Benefits per product
+        usage: Usage instructions
+        side_effects: Potential side effects
+        price: Prices in local currency
+    """
+    
+    name: List[Any]
+    concentration: List[Any]
+    skin_type: List[Any]
+    ingredients: List[Any]
+    benefits: List[Any]
+    usage: List[Any]
+    side_effects: List[Any]
+    price: List[Any]
+    
+    def __post_init__(self):
+        """Ensure all columns have the same length."""
+        lengths = {len(getattr(self, field)) for field in PRODUCT_FIELDS}
+        if len(lengths) > 1:
+            raise ValueError(f"ProductBatch columns differ in length: {sorted(lengths)}")
+    
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductBatch":
+        """Transpose Products into columns."""
+        products = list(products)
+        return cls(**{field: [getattr(product, field) for product in products] for field in PRODUCT_FIELDS})
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "ProductBatch":
+        """Transpose dicts keyed by Product field names; missing fields become None."""
+        records = list(records)
+        return cls(**{field: [record.get(field) for record in records] for field in PRODUCT_FIELDS})
+    
+    def __len__(self) -> int:
+        return len(self.name)
+    
+    def columns(self) -> Dict[str, List[Any]]:
+        """All columns keyed by field name."""
+        return {field: getattr(self, field) for field in PRODUCT_FIELDS}
+    
+    def product(self, index: int) -> Product:
+        """Build the Product in one row."""
+        return Product(**{field: getattr(self, field)[index] for field in PRODUCT_FIELDS})
+    
+    def __iter__(self) -> Iterator[Product]:
+        for index in range(len(self)):
+            yield self.product(index)
+
+
+USAGE_KEYWORDS = KeywordMatcher({
+    "drops": ["drops"],
+    "morning": ["morning"],
+    "night": ["night"]
+})
+
+SIDE_EFFECT_KEYWORDS = KeywordMatcher({
+    "tingling": ["tingling"],
+    "irritation": ["irritation"],
+    "sensitive": ["sensitive"]
+})
+
+
+@dataclass(frozen=True)
+class ProductFeatures:
+    """
+    Derived values computed once per product and shared by logic blocks and templates.
+
+    Attributes:
+        name_tokens: Lowercased words of the product name
+        skin_type_text: Skin types as comma-separated string
+        ingredients_text: Ingredients as comma-separated string
+        benefits_text: Benefits as comma-separated string
+        usage_lower: Lowercased usage instructions
+        side_effects_lower: Lowercased side effects text
+        ingredient_set: Lowercased ingredient names
+        benefit_set: Lowercased benefit names
+        ingredients_count: Number of ingredients
+        benefits_count: Number of benefits
+        skin_type_count: Number of suitable skin types
+        mentions_drops: Usage text mentions drops
+        mentions_morning: Usage text mentions morning application
+        mentions_night: Usage text mentions night application
+        mentions_tingling: Side effects mention tingling
+        mentions_irritation: Side effects mention irritation
+        mentions_sensitive: Side effects mention sensitive skin
+    """
+
+    name_tokens: Tuple[str, ...]
+    skin_type_text: str
+    ingredients_text: str
+    benefits_text: str
+    usage_lower: str
+    side_effects_lower: str
+    ingredient_set: FrozenSet[str]
+    benefit_set: FrozenSet[str]
+    ingredients_count: int
+    benefits_count: int
+    skin_type_count: int
+    mentions_drops: bool
+    mentions_morning: bool
+    mentions_night: bool
+    mentions_tingling: bool
+    mentions_irritation: bool
+    mentions_sensitive: bool
+
+    @classmethod
+    def from_product(cls, product: Product) -> "ProductFeatures":
+        """Derive all features from a Product in a single pass."""
+        usage_lower = product.usage.lower()
+        side_effects_lower = product.side_effects.lower()
+        usage_mentions = USAGE_KEYWORDS.labels(usage_lower)
+        side_effect_mentions = SIDE_EFFECT_KEYWORDS.labels(side_effects_lower)
+
+        return cls(
+            name_tokens=tuple(product.name.lower().split()),
+            skin_type_text=", ".join(product.skin_type),
+            ingredients_text=", ".join(product.ingredients),
+            benefits_text=", ".join(product.benefits),
+            usage_lower=usage_lower,
+            side_effects_lower=side_effects_lower,
+            ingredient_set=frozenset(ing.lower() for ing in product.ingredients),
+            benefit_set=frozenset(ben.lower() for ben in product.benefits),
+            ingredients_count=len(product.ingredients),
+            benefits_count=len(product.benefits),
+            skin_type_count=len(product.skin_type),
+            mentions_drops="drops" in usage_mentions,
+            mentions_morning="morning" in usage_mentions,
+            mentions_night="night" in usage_mentions,
+            mentions_tingling="tingling" in side_effect_mentions,
+            mentions_irritation="irritation" in side_effect_mentions,
+            mentions_sensitive="sensitive" in side_effect_mentions
+        )
+
+
 @dataclass
 class PageOutput:
     """
@@ -72,7 +225,7 @@ class PageOutput:
         """Initialize metadata if not provided."""
         if self.metadata is None:
             self.metadata = {
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": utc_timestamp(),
                 "version": "1.0.0"
             }
     
@@ -1,11 +1,16 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, TYPE_CHECKING
 from dataclasses import dataclass
 import time
-from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
 from src.utils.logger import get_logger
 from src.utils.metrics import MetricsCollector
+from src.utils.clock import RunClock, use_run_clock
 from src.core.exceptions import OrchestrationError
 
+if TYPE_CHECKING:
+    # Imported lazily: agents depend on logic blocks, which import src.core
+    from src.agents.base_agent import BaseAgent
+    from src.core.models import Product
+
 @dataclass
 class PipelineResult:
     success: bool
@@ -15,11 +20,53 @@ class PipelineResult:
     execution_time_ms: float
 
 class Orchestrator:
-    def __init__(self, agents: Dict[str, BaseAgent]):
+    def __init__(self, agents: Dict[str, "BaseAgent"], clock: Optional[RunClock] = None):
         self.agents = agents
+        self.clock = clock
         self.logger = get_logger("orchestrator")
         self.metrics = MetricsCollector()
         self.execution_graph = []
+    
+    @classmethod
+    def from_catalog(cls, products: Iterable["Product"] = (), clock: Optional[RunClock] = None) -> "Orchestrator":
+        """
+        Orchestrator with the default agents, comparing against a catalog
+        
+        The CompetitorIndex and the market and keyword statistics are built
+        once here and reused by every run: ComparisonAgent picks the nearest
+        catalog competitor instead of the fictional product, and the FAQ and
+        product pages price against segment medians and rank SEO keywords by
+        TF-IDF over the catalog.
+        
+        Args:
+            products: Catalog products; empty for a single-product run
+            clock: Run clock shared by every page
+            
+        Returns:
+            Orchestrator ready to run any product in (or outside) the catalog
+        """
+        from src.agents import (
+            DataParserAgent, ValidationAgent, QuestionGenerationAgent,
+            FAQAgent, ProductPageAgent, ComparisonAgent
+        )
+        from src.catalog import CompetitorIndex, KeywordStatistics, MarketStatistics
+        
+        products = list(products)
+        competitor_index = market_stats = keyword_stats = None
+        if products:
+            competitor_index = CompetitorIndex.from_config(products)
+            market_stats = MarketStatistics.from_config(products)
+            keyword_stats = KeywordStatistics.from_products(products)
+        
+        agents = {
+            "parser": DataParserAgent(),
+            "validation": ValidationAgent(),
+            "questions": QuestionGenerationAgent(),
+            "faq": FAQAgent(market_stats=market_stats, keyword_stats=keyword_stats),
+            "product": ProductPageAgent(market_stats=market_stats, keyword_stats=keyword_stats),
+            "comparison": ComparisonAgent(competitor_index=competitor_index)
+        }
+        return cls(agents, clock)
         
     def build_execution_plan(self) -> List[List[str]]:
         """DAG-based execution plan"""
@@ -30,6 +77,8 @@ class Orchestrator:
         ]
     
     def execute_phase(self, phase_agents: List[str], context: Dict) -> Dict:
+        from src.agents.base_agent import AgentInput
+        
         phase_results = {}
         
         for agent_name in phase_agents:
@@ -66,6 +115,11 @@ class Orchestrator:
     
     def run(self, input_data: Dict) -> PipelineResult:
         """Main orchestration pipeline"""
+        # Every page of the run is stamped by one clock
+        with use_run_clock(self.clock or RunClock.from_config()):
+            return self._run(input_data)
+    
+    def _run(self, input_data: Dict) -> PipelineResult:
         start_time = time.time()
         all_outputs = {}
         errors = []
@@ -0,0 +1,306 @@
+"""
+Declarative product rules compiled into flat generated evaluators
+"""
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
+from src.core.models import Product, ProductBatch, ValidationResult, PRODUCT_FIELDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many rows, list comprehensions beat NumPy's per-call overhead
+VECTORIZE_MIN_ROWS = 64
+
+SKIN_TYPES = (
+    "All Skin Types", "Normal", "Dry", "Oily", "Combination", "Sensitive", "Mature", "Acne-prone"
+)
+
+# Rule kinds:
+#   type         field holds `type`: "string", "integer", "number" or "string_list"
+#   range        field value, or its length with measure "length", lies within min..max
+#   vocabulary   every term of the field is one of `values` (case-insensitive)
+#   cross_field  `check` relates field to `other` (see CROSS_FIELD_CHECKS)
+# Failed "error" rules make a product invalid; "warning" rules are only reported.
+# Range, vocabulary and cross-field rules skip values of the wrong type, so a bad
+# value is reported once, by its type rule.
+PRODUCT_RULES: List[Dict[str, Any]] = [
+    {"id": "name.type", "kind": "type", "field": "name", "type": "string", "message": "Product name must be text"},
+    {"id": "name.length", "kind": "range", "field": "name", "measure": "length", "min": 1, "max": 200,
+     "message": "Product name must be 1-200 characters"},
+    {"id": "concentration.type", "kind": "type", "field": "concentration", "type": "string", "message": "Concentration must be text"},
+    {"id": "skin_type.type", "kind": "type", "field": "skin_type", "type": "string_list", "message": "Skin types must be a list of text"},
+    {"id": "skin_type.count", "kind": "range", "field": "skin_type", "measure": "length", "min": 1,
+     "severity": "warning", "message": "No suitable skin types listed"},
+    {"id": "skin_type.vocabulary", "kind": "vocabulary", "field": "skin_type", "values": SKIN_TYPES,
+     "severity": "warning", "message": "Unrecognised skin type"},
+    {"id": "ingredients.type", "kind": "type", "field": "ingredients", "type": "string_list", "message": "Ingredients must be a list of text"},
+    {"id": "ingredients.count", "kind": "range", "field": "ingredients", "measure": "length", "min": 1, "max": 50,
+     "message": "Product must have 1-50 ingredients"},
+    {"id": "benefits.type", "kind": "type", "field": "benefits", "type": "string_list", "message": "Benefits must be a list of text"},
+    {"id": "benefits.count", "kind": "range", "field": "benefits", "measure": "length", "min": 1,
+     "message": "Product must have at least one benefit"},
+    {"id": "usage.type", "kind": "type", "field": "usage", "type": "string", "message": "Usage instructions must be text"},
+    {"id": "usage.length", "kind": "range", "field": "usage", "measure": "length", "min": 1,
+     "severity": "warning", "message": "Usage instructions are empty"},
+    {"id": "side_effects.type", "kind": "type", "field": "side_effects", "type": "string", "message": "Side effects must be text"},
+    {"id": "price.type", "kind": "type", "field": "price", "type": "number", "message": "Price must be a number"},
+    {"id": "price.range", "kind": "range", "field": "price", "min": 1, "max": 100000,
+     "message": "Price must be between 1 and 100000"},
+    {"id": "concentration.active", "kind": "cross_field", "check": "mentions_any", "field": "concentration", "other": "ingredients",
+     "severity": "warning", "message": "Concentration does not name any listed ingredient"}
+]
+
+# Expression testing one value {v} for each type rule
+_TYPE_TESTS = {
+    "string": "isinstance({v}, str)",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "string_list": "(isinstance({v}, list) and all(map(_is_str, {v})))"
+}
+
+SEVERITIES = ("error", "warning")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _value_in_range(column: List[Any], low: float, high: float) -> Sequence[bool]:
+    """Range mask for a numeric column; vectorized for large batches"""
+    if np is not None and len(column) >= VECTORIZE_MIN_ROWS:
+        try:
+            values = np.asarray(column, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass  # mixed types: fall through to the per-value check
+        else:
+            # float() also accepts None (NaN) and bools; those are not numbers and pass, as below
+            numeric = np.fromiter(map(_is_number, column), dtype=bool, count=len(column))
+            return ~numeric | ((values >= low) & (values <= high))
+    return [not _is_number(v) or low <= v <= high for v in column]
+
+
+def _in_vocabulary(value: Any, allowed: FrozenSet[str], accepted: Set[str]) -> bool:
+    """
+    Whether every term of a text or list-of-text value is in the vocabulary
+
+    accepted remembers spellings already found in the vocabulary, so the
+    common case is a single set.issuperset call without lowercasing.
+    """
+    if isinstance(value, str):
+        value = (value,)
+    elif not isinstance(value, list):
+        return True
+    try:
+        if accepted.issuperset(value):
+            return True
+    except TypeError:
+        pass  # unhashable terms are skipped below, like other non-text terms
+    for term in value:
+        if isinstance(term, str):
+            if term.lower() not in allowed:
+                return False
+            accepted.add(term)
+    return True
+
+
+def _mentions_any(text: Any, terms: Any) -> bool:
+    if not isinstance(text, str) or not isinstance(terms, list):
+        return True
+    text = text.lower()
+    for term in terms:
+        if isinstance(term, str) and term.lower() in text:
+            return True
+    return False
+
+
+# cross_field check -> helper(field value, other value) -> passed
+CROSS_FIELD_CHECKS: Dict[str, Callable[[Any, Any], bool]] = {
+    "mentions_any": _mentions_any
+}
+
+_HELPERS = {
+    "_is_str": str.__instancecheck__,
+    "_is_number": _is_number,
+    "_value_in_range": _value_in_range,
+    "_in_vocabulary": _in_vocabulary,
+    **{f"_check_{name}": check for name, check in CROSS_FIELD_CHECKS.items()}
+}
+
+
+def _require_field(rule: Dict[str, Any], key: str = "field") -> str:
+    field = rule.get(key)
+    if field not in PRODUCT_FIELDS:
+        raise ValueError(f"Rule {rule.get('id')!r}: unknown {key} {field!r} (expected one of {', '.join(PRODUCT_FIELDS)})")
+    return field
+
+
+def _compile_rule(rule: Dict[str, Any], constants: List[Any]) -> Tuple[str, str]:
+    """
+    Python expressions for one rule
+
+    Returns:
+        (row expression over the field variables, column expression producing
+        the rule's pass mask over the field columns)
+    """
+    kind = rule.get("kind")
+    field = _require_field(rule)
+
+    if kind == "cross_field":
+        other = _require_field(rule, "other")
+        check = rule.get("check")
+        if check not in CROSS_FIELD_CHECKS:
+            raise ValueError(f"Rule {rule.get('id')!r}: unknown check {check!r} (expected one of {', '.join(CROSS_FIELD_CHECKS)})")
+        return f"_check_{check}({field}, {other})", f"[_check_{check}(v, w) for v, w in zip({field}, {other})]"
+
+    if kind == "type":
+        test = _TYPE_TESTS.get(rule.get("type"))
+        if test is None:
+            raise ValueError(f"Rule {rule.get('id')!r}: unknown type {rule.get('type')!r}")
+    elif kind == "range":
+        constants.extend((rule.get("min", float("-inf")), rule.get("max", float("inf"))))
+        low, high = f"constants[{len(constants) - 2}]", f"constants[{len(constants) - 1}]"
+        if rule.get("measure") == "length":
+            test = f"(not isinstance({{v}}, (list, str)) or {low} <= len({{v}}) <= {high})"
+        else:
+            return f"(not _is_number({field}) or {low} <= {field} <= {high})", f"_value_in_range({field}, {low}, {high})"
+    elif kind == "vocabulary":
+        allowed = frozenset(value.lower() for value in rule["values"])
+        constants.extend((allowed, set(allowed) | set(rule["values"])))
+        test = f"_in_vocabulary({{v}}, constants[{len(constants) - 2}], constants[{len(constants) - 1}])"
+    else:
+        raise ValueError(f"Rule {rule.get('id')!r}: unknown kind {kind!r}")
+
+    return test.format(v=field), f"[{test.format(v='v')} for v in {field}]"
+
+
+class RuleSet:
+    """
+    Validation rules compiled once into flat generated functions.
+
+    Every rule becomes one Python expression, and all of them are joined
+    into a single generated function (as PageSkeleton does for layouts), so
+    evaluation has no per-rule dispatch. A batch is checked column-wise: one
+    comprehension per rule over its field's column, with numeric range rules
+    vectorized by NumPy on large batches. A single product runs the same
+    expressions as a straight sequence of ifs over its fields.
+
+    Example:
+        rules = RuleSet(PRODUCT_RULES)
+        results = rules.validate_batch(ProductBatch.from_products(catalog))
+    """
+
+    def __init__(self, rules: Sequence[Dict[str, Any]] = PRODUCT_RULES):
+        self.rules = tuple(rules)
+        for rule in self.rules:
+            if rule.get("severity", "error") not in SEVERITIES:
+                raise ValueError(f"Rule {rule.get('id')!r}: unknown severity {rule.get('severity')!r}")
+        constants: List[Any] = []
+        expressions = [_compile_rule(rule, constants) for rule in self.rules]
+
+        self.fields = tuple(field for field in PRODUCT_FIELDS if any(field in (rule["field"], rule.get("other")) for rule in self.rules))
+        column_source = "def evaluate(columns, constants):\n"
+        column_source += "".join(f"    {field} = columns[{field!r}]\n" for field in self.fields)
+        column_source += "    return [\n" + "".join(f"        {column},\n" for _, column in expressions) + "    ]\n"
+        row_source = f"def check(constants, {', '.join(self.fields)}):\n    failed = []\n"
+        row_source += "".join(f"    if not {row}:\n        failed.append({index})\n" for index, (row, _) in enumerate(expressions))
+        row_source += "    return failed\n"
+
+        namespace: Dict[str, Any] = dict(_HELPERS)
+        exec(column_source + row_source, namespace)
+        self._evaluate = namespace["evaluate"]
+        self._check = namespace["check"]
+        self._constants = tuple(constants)
+        self._messages = tuple(rule.get("message") or f"{rule['field']} failed rule {rule.get('id')}" for rule in self.rules)
+        self._is_error = tuple(rule.get("severity", "error") == "error" for rule in self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, batch: ProductBatch) -> List[Sequence[bool]]:
+        """
+        Pass masks of every rule
+
+        Returns:
+            One sequence per rule (in rule order) with an entry per product;
+            True where the product satisfies the rule
+        """
+        return self._evaluate(batch.columns(), self._constants)
+
+    def _result(self, failed: Sequence[int]) -> ValidationResult:
+        """ValidationResult for the indices of failed rules"""
+        result = ValidationResult(is_valid=True, errors=[], warnings=[], score=100.0)
+        for rule in failed:
+            if self._is_error[rule]:
+                result.add_error(self._messages[rule])
+            else:
+                result.add_warning(self._messages[rule])
+        if failed:
+            result.score = round(100 * (1 - len(failed) / len(self.rules)), 1)
+        return result
+
+    def validate_batch(self, batch: ProductBatch) -> List[ValidationResult]:
+        """
+        Validate every product of a batch
+
+        Args:
+            batch: Products in columns
+
+        Returns:
+            One ValidationResult per product; score is the share of rules passed (0-100)
+        """
+        rows = len(batch)
+        failed: List[List[int]] = [[] for _ in range(rows)]
+        if self.rules and rows:
+            masks = self.evaluate(batch)
+            if np is not None and rows >= VECTORIZE_MIN_ROWS:
+                passed = np.empty((rows, len(masks)), dtype=bool)
+                for rule, mask in enumerate(masks):
+                    passed[:, rule] = mask
+                # Row-major order: failures come out grouped by product, in rule order
+                for row, rule in zip(*(index.tolist() for index in np.nonzero(~passed))):
+                    failed[row].append(rule)
+            else:
+                for rule, mask in enumerate(masks):
+                    for row, ok in enumerate(mask):
+                        if not ok:
+                            failed[row].append(rule)
+        return [self._result(row_failures) for row_failures in failed]
+
+    def validate(self, product: Union[Product, Dict[str, Any]]) -> ValidationResult:
+        """Validate one Product, or a dict keyed by Product field names"""
+        if isinstance(product, dict):
+            values = [product.get(field) for field in self.fields]
+        else:
+            values = [getattr(product, field) for field in self.fields]
+        return self._result(self._check(self._constants, *values))
+
+
+_default_rule_set: Optional[RuleSet] = None
+
+
+def default_rule_set() -> RuleSet:
+    """RuleSet for PRODUCT_RULES, compiled on first use"""
+    global _default_rule_set
+    if _default_rule_set is None:
+        _default_rule_set = RuleSet(PRODUCT_RULES)
+    return _default_rule_set
+
+
+_field_rule_sets: Dict[FrozenSet[str], RuleSet] = {}
+
+
+def rule_set_for_fields(fields: Iterable[str]) -> RuleSet:
+    """
+    RuleSet of the PRODUCT_RULES that only read the given fields
+
+    Used to check partial product dicts on the keys they have; each
+    field combination is compiled once.
+    """
+    present = frozenset(fields).intersection(PRODUCT_FIELDS)
+    if present not in _field_rule_sets:
+        _field_rule_sets[present] = RuleSet([
+            rule for rule in PRODUCT_RULES
+            if rule["field"] in present and rule.get("other", rule["field"]) in present
+        ])
+    return _field_rule_sets[present]
\ No newline at end of file
@@ -6,8 +6,10 @@ from .base_block import BaseLogicBlock, BlockConfig
 from .benefits_block import generate_benefits_block
 from .usage_block import generate_usage_block
 from .safety_block import generate_safety_block
-from .price_block import generate_price_block
+from .price_block import generate_price_block, generate_price_block_batch
 from .comparison_block import generate_comparison_block
+from .comparison_matrix import ComparisonMatrix
+from .multi_comparison_block import generate_multi_comparison_block
 from .seo_block import generate_seo_metadata
 
 __all__ = [
@@ -17,6 +19,9 @@ __all__ = [
     'generate_usage_block',
     'generate_safety_block',
     'generate_price_block',
+    'generate_price_block_batch',
     'generate_comparison_block',
+    'ComparisonMatrix',
+    'generate_multi_comparison_block',
     'generate_seo_metadata'
 ]
\ No newline at end of file
@@ -1,12 +1,13 @@
-from typing import Dict, Any
-from src.core.models import Product
+from typing import Dict, Any, Optional
+from src.core.models import Product, ProductFeatures
 
-def generate_benefits_block(product: Product) -> Dict[str, Any]:
+def generate_benefits_block(product: Product, features: Optional[ProductFeatures] = None) -> Dict[str, Any]:
     """
     Generate structured benefits information from product data
     
     Args:
         product: Product object containing benefits data
+        features: Precomputed product features (derived from product if omitted)
         
     Returns:
         Dict containing formatted benefits information
@@ -14,6 +15,7 @@ def generate_benefits_block(product: Product) -> Dict[str, Any]:
     
     # Enhanced benefits description
     benefits_list = product.benefits
+    features = features or ProductFeatures.from_product(product)
     
     # Create detailed descriptions for each benefit
     detailed_benefits = []
@@ -48,6 +50,6 @@ def generate_benefits_block(product: Product) -> Dict[str, Any]:
         "benefits_list": benefits_list,
         "detailed_benefits": detailed_benefits,
         "benefits_summary": benefits_summary,
-        "key_advantage": f"Combines {len(product.ingredients)} active ingredients for multiple benefits",
+        "key_advantage": f"Combines {features.ingredients_count} active ingredients for multiple benefits",
         "usage_tip": "For best results, use consistently as part of your daily skincare routine"
     }
\ No newline at end of file
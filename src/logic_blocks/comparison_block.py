@@ -1,49 +1,104 @@
-from typing import Dict, Any, List
-from src.core.models import Product
+from typing import Dict, Any, List, Optional
+from src.core.models import Product, ProductFeatures
 
-def generate_comparison_block(product_a: Product, product_b: Product) -> Dict[str, Any]:
+def generate_comparison_block(
+    product_a: Product,
+    product_b: Product,
+    features_a: Optional[ProductFeatures] = None,
+    features_b: Optional[ProductFeatures] = None,
+    fictional_b: bool = True
+) -> Dict[str, Any]:
     """
     Generate detailed comparison between two products
     
     Args:
         product_a: First product (main product)
         product_b: Second product (comparison product)
+        features_a: Precomputed features of product A (derived if omitted)
+        features_b: Precomputed features of product B (derived if omitted)
+        fictional_b: Whether product B is a fictional stand-in rather than a catalog product
         
     Returns:
         Dict containing comprehensive comparison data
     """
     
+    features_a = features_a or ProductFeatures.from_product(product_a)
+    features_b = features_b or ProductFeatures.from_product(product_b)
+    
     # Ingredients comparison
-    ingredients_a = set(ing.lower() for ing in product_a.ingredients)
-    ingredients_b = set(ing.lower() for ing in product_b.ingredients)
+    ingredients_a = features_a.ingredient_set
+    ingredients_b = features_b.ingredient_set
     
     common_ingredients = ingredients_a.intersection(ingredients_b)
     unique_to_a = ingredients_a - ingredients_b
     unique_to_b = ingredients_b - ingredients_a
     
     # Benefits comparison
-    benefits_a = set(ben.lower() for ben in product_a.benefits)
-    benefits_b = set(ben.lower() for ben in product_b.benefits)
+    benefits_a = features_a.benefit_set
+    benefits_b = features_b.benefit_set
     
     common_benefits = benefits_a.intersection(benefits_b)
     unique_benefits_a = benefits_a - benefits_b
     unique_benefits_b = benefits_b - benefits_a
     
+    return assemble_comparison_block(
+        product_a, product_b, features_a, features_b,
+        sorted(common_ingredients), sorted(unique_to_a), sorted(unique_to_b),
+        sorted(common_benefits), sorted(unique_benefits_a), sorted(unique_benefits_b),
+        fictional_b=fictional_b
+    )
+
+def assemble_comparison_block(
+    product_a: Product,
+    product_b: Product,
+    features_a: ProductFeatures,
+    features_b: ProductFeatures,
+    common_ingredients: List[str],
+    unique_to_a: List[str],
+    unique_to_b: List[str],
+    common_benefits: List[str],
+    unique_benefits_a: List[str],
+    unique_benefits_b: List[str],
+    fictional_b: bool = True
+) -> Dict[str, Any]:
+    """
+    Build the comparison block from already computed set differences
+    
+    Shared by generate_comparison_block and the all-pairs ComparisonMatrix,
+    which derive the ingredient and benefit lists in different ways.
+    
+    Args:
+        product_a: First product (main product)
+        product_b: Second product (comparison product)
+        features_a: Features of product A
+        features_b: Features of product B
+        common_ingredients: Lowercased ingredients in both products
+        unique_to_a: Lowercased ingredients only in product A
+        unique_to_b: Lowercased ingredients only in product B
+        common_benefits: Lowercased benefits in both products
+        unique_benefits_a: Lowercased benefits only in product A
+        unique_benefits_b: Lowercased benefits only in product B
+        fictional_b: Whether product B is a fictional stand-in rather than a catalog product
+        
+    Returns:
+        Dict containing comprehensive comparison data
+    """
+    
     # Price comparison
     price_difference = product_b.price - product_a.price
     price_ratio = product_a.price / product_b.price if product_b.price > 0 else float('inf')
     
     # Value comparison
-    ingredients_per_rupee_a = len(product_a.ingredients) / product_a.price if product_a.price > 0 else 0
-    ingredients_per_rupee_b = len(product_b.ingredients) / product_b.price if product_b.price > 0 else 0
+    ingredients_per_rupee_a = features_a.ingredients_count / product_a.price if product_a.price > 0 else 0
+    ingredients_per_rupee_b = features_b.ingredients_count / product_b.price if product_b.price > 0 else 0
     
-    benefits_per_rupee_a = len(product_a.benefits) / product_a.price if product_a.price > 0 else 0
-    benefits_per_rupee_b = len(product_b.benefits) / product_b.price if product_b.price > 0 else 0
+    benefits_per_rupee_a = features_a.benefits_count / product_a.price if product_a.price > 0 else 0
+    benefits_per_rupee_b = features_b.benefits_count / product_b.price if product_b.price > 0 else 0
     
     # Determine winner in each category
     winners = {
-        "ingredients_count": "A" if len(product_a.ingredients) > len(product_b.ingredients) else "B",
-        "benefits_count": "A" if len(product_a.benefits) > len(product_b.benefits) else "B",
+        "ingredients_count": "A" if features_a.ingredients_count > features_b.ingredients_count else "B",
+        "benefits_count": "A" if features_a.benefits_count > features_b.benefits_count else "B",
         "price": "A" if product_a.price < product_b.price else "B",
         "value_score": "A" if (ingredients_per_rupee_a + benefits_per_rupee_a) > (ingredients_per_rupee_b + benefits_per_rupee_b) else "B"
     }
@@ -75,25 +130,25 @@ def generate_comparison_block(product_a: Product, product_b: Product) -> Dict[st
         product_a.name: {
             "pros": [
                 f"₹{product_a.price} - more affordable" if product_a.price < product_b.price else f"₹{product_a.price} - premium formulation",
-                f"{len(product_a.ingredients)} key ingredients",
-                f"Specifically for {', '.join(product_a.skin_type)} skin",
+                f"{features_a.ingredients_count} key ingredients",
+                f"Specifically for {features_a.skin_type_text} skin",
                 f"Benefits: {', '.join(product_a.benefits[:2])}"
             ],
             "cons": [
                 f"{product_a.side_effects}",
-                f"Limited to {', '.join(product_a.skin_type)} skin types" if len(product_a.skin_type) < 3 else None
+                f"Limited to {features_a.skin_type_text} skin types" if features_a.skin_type_count < 3 else None
             ]
         },
         product_b.name: {
             "pros": [
                 f"₹{product_b.price} - competitive pricing",
-                f"Suitable for {', '.join(product_b.skin_type)}",
+                f"Suitable for {features_b.skin_type_text}",
                 f"Benefits: {', '.join(product_b.benefits[:2])}",
                 f"{product_b.concentration} concentration"
             ],
             "cons": [
-                f"{len(product_b.ingredients)} ingredients (fewer than {product_a.name})" if len(product_b.ingredients) < len(product_a.ingredients) else None,
-                "Fictional product for comparison purposes"
+                f"{features_b.ingredients_count} ingredients (fewer than {product_a.name})" if features_b.ingredients_count < features_a.ingredients_count else None,
+                "Fictional product for comparison purposes" if fictional_b else None
             ]
         }
     }
@@ -111,19 +166,19 @@ def generate_comparison_block(product_a: Product, product_b: Product) -> Dict[st
             "recommendation": overall_recommendation
         },
         "ingredients_analysis": {
-            "common_ingredients": list(common_ingredients),
-            "unique_to_a": list(unique_to_a),
-            "unique_to_b": list(unique_to_b),
-            "total_a": len(product_a.ingredients),
-            "total_b": len(product_b.ingredients),
+            "common_ingredients": common_ingredients,
+            "unique_to_a": unique_to_a,
+            "unique_to_b": unique_to_b,
+            "total_a": features_a.ingredients_count,
+            "total_b": features_b.ingredients_count,
             "winner": winners["ingredients_count"]
         },
         "benefits_analysis": {
-            "common_benefits": list(common_benefits),
-            "unique_to_a": list(unique_benefits_a),
-            "unique_to_b": list(unique_benefits_b),
-            "total_a": len(product_a.benefits),
-            "total_b": len(product_b.benefits),
+            "common_benefits": common_benefits,
+            "unique_to_a": unique_benefits_a,
+            "unique_to_b": unique_benefits_b,
+            "total_a": features_a.benefits_count,
+            "total_b": features_b.benefits_count,
             "winner": winners["benefits_count"]
         },
         "price_analysis": {
@@ -139,7 +194,7 @@ def generate_comparison_block(product_a: Product, product_b: Product) -> Dict[st
         "pros_and_cons": pros_cons,
         "final_verdict": {
             "best_for_budget": product_a.name if product_a.price < product_b.price else product_b.name,
-            "best_for_ingredients": product_a.name if len(product_a.ingredients) > len(product_b.ingredients) else product_b.name,
+            "best_for_ingredients": product_a.name if features_a.ingredients_count > features_b.ingredients_count else product_b.name,
             "best_for_skin_type": product_a.name if "Combination" in product_a.skin_type else product_b.name,
             "overall_value": product_a.name if winner == "A" else product_b.name
         }
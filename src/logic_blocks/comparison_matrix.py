@@ -0,0 +1,198 @@
+"""
+All-pairs comparison engine over a product catalog
+"""
+from typing import Dict, Any, List, Optional, Iterable, Sequence
+from src.core.models import Product, ProductFeatures
+from src.logic_blocks.comparison_block import assemble_comparison_block
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WINNER_A = 1
+WINNER_B = -1
+TIE = 0
+
+
+def _build_vocabulary(term_sets: Iterable[Iterable[str]]) -> Dict[str, int]:
+    """Assign one bit per distinct term, in sorted order"""
+    terms = set()
+    for term_set in term_sets:
+        terms.update(term_set)
+    return {term: bit for bit, term in enumerate(sorted(terms))}
+
+
+def _encode(terms: Iterable[str], vocabulary: Dict[str, int]) -> int:
+    """Encode a set of terms as an integer bitset"""
+    bitset = 0
+    for term in terms:
+        bitset |= 1 << vocabulary[term]
+    return bitset
+
+
+def _decode(bitset: int, terms: Sequence[str]) -> List[str]:
+    """Decode an integer bitset back to its terms, lowest bit first"""
+    decoded = []
+    while bitset:
+        lowest = bitset & -bitset
+        decoded.append(terms[lowest.bit_length() - 1])
+        bitset ^= lowest
+    return decoded
+
+
+class ComparisonMatrix:
+    """
+    Comparison metrics for every ordered pair of products in a catalog.
+
+    Ingredients and benefits are encoded once as integer bitsets over the
+    catalog vocabulary, so per-pair set operations become integer AND/AND-NOT
+    instead of allocating Python sets. Count and winner matrices cover all
+    N x N pairs and are computed together on first access; full comparison
+    blocks are only materialized for the pairs that are requested.
+
+    Matrix entry [i, j] always describes product i as "A" and product j as "B",
+    matching generate_comparison_block(products[i], products[j]).
+    """
+
+    def __init__(self, products: List[Product], features: Optional[List[ProductFeatures]] = None):
+        self.products = list(products)
+        self.features = list(features) if features is not None else [
+            ProductFeatures.from_product(product) for product in self.products
+        ]
+        if len(self.features) != len(self.products):
+            raise ValueError("features must have one entry per product")
+
+        ingredient_vocabulary = _build_vocabulary(f.ingredient_set for f in self.features)
+        benefit_vocabulary = _build_vocabulary(f.benefit_set for f in self.features)
+        self.ingredient_terms = list(ingredient_vocabulary)
+        self.benefit_terms = list(benefit_vocabulary)
+
+        self.ingredient_bitsets = [_encode(f.ingredient_set, ingredient_vocabulary) for f in self.features]
+        self.benefit_bitsets = [_encode(f.benefit_set, benefit_vocabulary) for f in self.features]
+
+        self._index = {product.name: idx for idx, product in enumerate(self.products)}
+        self._metrics = None
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def index_of(self, product_name: str) -> int:
+        """Get the row/column index of a product by name"""
+        if product_name not in self._index:
+            raise KeyError(f"Product not in comparison matrix: {product_name}")
+        return self._index[product_name]
+
+    def block(self, i: int, j: int) -> Dict[str, Any]:
+        """
+        Materialize the full comparison block for one pair
+
+        Args:
+            i: Index of product A
+            j: Index of product B
+
+        Returns:
+            Same structure as generate_comparison_block(products[i], products[j]),
+            with product B treated as a real catalog product
+        """
+        ingredients_a, ingredients_b = self.ingredient_bitsets[i], self.ingredient_bitsets[j]
+        benefits_a, benefits_b = self.benefit_bitsets[i], self.benefit_bitsets[j]
+
+        return assemble_comparison_block(
+            self.products[i], self.products[j], self.features[i], self.features[j],
+            _decode(ingredients_a & ingredients_b, self.ingredient_terms),
+            _decode(ingredients_a & ~ingredients_b, self.ingredient_terms),
+            _decode(ingredients_b & ~ingredients_a, self.ingredient_terms),
+            _decode(benefits_a & benefits_b, self.benefit_terms),
+            _decode(benefits_a & ~benefits_b, self.benefit_terms),
+            _decode(benefits_b & ~benefits_a, self.benefit_terms),
+            fictional_b=False
+        )
+
+    def block_by_name(self, name_a: str, name_b: str) -> Dict[str, Any]:
+        """Materialize the comparison block for a pair identified by product names"""
+        return self.block(self.index_of(name_a), self.index_of(name_b))
+
+    @property
+    def common_ingredients(self):
+        """N x N counts of shared (lowercased) ingredients"""
+        return self._get_metrics()["common_ingredients"]
+
+    @property
+    def unique_ingredients(self):
+        """N x N counts of ingredients in product i but not in product j"""
+        return self._get_metrics()["unique_ingredients"]
+
+    @property
+    def common_benefits(self):
+        """N x N counts of shared (lowercased) benefits"""
+        return self._get_metrics()["common_benefits"]
+
+    @property
+    def unique_benefits(self):
+        """N x N counts of benefits in product i but not in product j"""
+        return self._get_metrics()["unique_benefits"]
+
+    @property
+    def total_scores(self):
+        """N x N category wins (0-4) of product i against product j"""
+        return self._get_metrics()["total_scores"]
+
+    @property
+    def overall_winner(self):
+        """N x N overall winner: WINNER_A, WINNER_B or TIE"""
+        return self._get_metrics()["overall_winner"]
+
+    def _get_metrics(self) -> Dict[str, Any]:
+        if self._metrics is None:
+            self._metrics = self._compute_metrics()
+        return self._metrics
+
+    def _bit_matrix(self, bitsets: List[int], width: int):
+        """Expand bitsets into an N x width 0/1 matrix"""
+        matrix = np.zeros((len(bitsets), width), dtype=np.float32)
+        for row, bitset in enumerate(bitsets):
+            while bitset:
+                lowest = bitset & -bitset
+                matrix[row, lowest.bit_length() - 1] = 1.0
+                bitset ^= lowest
+        return matrix
+
+    def _compute_metrics(self) -> Dict[str, Any]:
+        if np is None:
+            raise ImportError("ComparisonMatrix metrics require numpy (pip install numpy)")
+
+        ingredient_bits = self._bit_matrix(self.ingredient_bitsets, len(self.ingredient_terms))
+        benefit_bits = self._bit_matrix(self.benefit_bitsets, len(self.benefit_terms))
+
+        # Popcount of every pairwise AND at once; counts are small integers, exact in float32
+        common_ingredients = (ingredient_bits @ ingredient_bits.T).astype(np.int32)
+        common_benefits = (benefit_bits @ benefit_bits.T).astype(np.int32)
+        ingredient_set_sizes = ingredient_bits.sum(axis=1).astype(np.int32)
+        benefit_set_sizes = benefit_bits.sum(axis=1).astype(np.int32)
+
+        # Winner rules mirror assemble_comparison_block
+        prices = np.array([product.price for product in self.products], dtype=np.float64)
+        ingredients_count = np.array([f.ingredients_count for f in self.features], dtype=np.float64)
+        benefits_count = np.array([f.benefits_count for f in self.features], dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value = np.where(prices > 0, ingredients_count / prices, 0) + np.where(prices > 0, benefits_count / prices, 0)
+
+        total_scores = (
+            (ingredients_count[:, None] > ingredients_count[None, :]).astype(np.int8)
+            + (benefits_count[:, None] > benefits_count[None, :])
+            + (prices[:, None] < prices[None, :])
+            + (value[:, None] > value[None, :])
+        )
+        # Four categories, so B's score is 4 - A's score
+        overall_winner = np.sign(total_scores - 2).astype(np.int8)
+
+        return {
+            "common_ingredients": common_ingredients,
+            "unique_ingredients": ingredient_set_sizes[:, None] - common_ingredients,
+            "common_benefits": common_benefits,
+            "unique_benefits": benefit_set_sizes[:, None] - common_benefits,
+            "total_scores": total_scores,
+            "overall_winner": overall_winner
+        }
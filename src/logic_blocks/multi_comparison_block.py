@@ -0,0 +1,167 @@
+"""
+N-way comparison of several products in one columnar pass
+"""
+from collections import Counter
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from src.core.models import Product, ProductFeatures
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Two products go through generate_comparison_block (ComparisonAgent.process)
+MIN_COMPARED_PRODUCTS = 3
+MAX_COMPARED_PRODUCTS = 10
+
+# (column, table label, importance, higher_is_better); winner rules mirror assemble_comparison_block
+FEATURE_COLUMNS = (
+    ("price", "Price", "high", False),
+    ("ingredients_count", "Ingredients", "high", True),
+    ("benefits_count", "Benefits", "medium", True),
+    ("combination_skin", "Skin Type", "medium", True),
+    ("high_concentration", "Concentration", "medium", True),
+    ("value_score", "Value", "high", True)
+)
+
+TIE = "Tie"
+
+
+def _build_columns(products: Sequence[Product], features: Sequence[ProductFeatures]) -> Dict[str, List[float]]:
+    """One list per scored feature, each holding a value per product"""
+    prices = [float(product.price) for product in products]
+    ingredients = [f.ingredients_count for f in features]
+    benefits = [f.benefits_count for f in features]
+    return {
+        "price": prices,
+        "ingredients_count": ingredients,
+        "benefits_count": benefits,
+        "combination_skin": [1 if "Combination" in product.skin_type else 0 for product in products],
+        "high_concentration": [1 if "10%" in product.concentration else 0 for product in products],
+        "value_score": [
+            round((i + b) / price, 3) if price > 0 else 0
+            for i, b, price in zip(ingredients, benefits, prices)
+        ]
+    }
+
+
+def _best_masks(columns: Dict[str, List[float]]) -> List[List[bool]]:
+    """
+    For every feature, which products hold the best value
+
+    All features are compared at once: columns are stacked into a
+    features x products matrix, signed so that larger is always better,
+    and each row is compared against its maximum.
+    """
+    rows = [columns[name] if higher else [-value for value in columns[name]] for name, _, _, higher in FEATURE_COLUMNS]
+    if np is not None:
+        matrix = np.array(rows, dtype=np.float64)
+        return (matrix == matrix.max(axis=1, keepdims=True)).tolist()
+    return [[value == max(row) for value in row] for row in rows]
+
+
+def _unique_terms(term_sets: Sequence[frozenset]) -> Tuple[List[str], List[List[str]]]:
+    """(terms in every set, terms found in only one set per set) from one occurrence count"""
+    counts = Counter(term for term_set in term_sets for term in term_set)
+    common = sorted(term for term, count in counts.items() if count == len(term_sets))
+    unique = [sorted(term for term in term_set if counts[term] == 1) for term_set in term_sets]
+    return common, unique
+
+
+def generate_multi_comparison_block(
+    products: Sequence[Product],
+    features: Optional[Sequence[ProductFeatures]] = None
+) -> Dict[str, Any]:
+    """
+    Compare several products (typically a "top 5" category page) at once
+
+    Feature values are collected column by column and every feature's
+    winners come out of a single pass over the stacked columns, instead of
+    N x N calls to generate_comparison_block. A feature where all products
+    are equal is a tie; otherwise every product sharing the best value wins it.
+
+    Args:
+        products: Products to compare (3-10), in display order
+        features: Precomputed features, one per product (derived if omitted)
+
+    Returns:
+        Dict with per-feature columns and winners, scores, ranking,
+        ingredient/benefit overlap and recommendations
+    """
+    products = list(products)
+    if not MIN_COMPARED_PRODUCTS <= len(products) <= MAX_COMPARED_PRODUCTS:
+        raise ValueError(f"N-way comparison needs {MIN_COMPARED_PRODUCTS}-{MAX_COMPARED_PRODUCTS} products, got {len(products)}")
+    features = list(features) if features is not None else [ProductFeatures.from_product(product) for product in products]
+    if len(features) != len(products):
+        raise ValueError("features must have one entry per product")
+
+    names = [product.name for product in products]
+    if len(set(names)) != len(names):
+        raise ValueError("Compared products must have distinct names")
+
+    columns = _build_columns(products, features)
+    masks = _best_masks(columns)
+
+    feature_winners: Dict[str, List[str]] = {}
+    scores = dict.fromkeys(names, 0)
+    for (column, _, _, _), mask in zip(FEATURE_COLUMNS, masks):
+        if all(mask):
+            feature_winners[column] = []
+            continue
+        winners = [name for name, best in zip(names, mask) if best]
+        feature_winners[column] = winners
+        for name in winners:
+            scores[name] += 1
+
+    # Ties on score go to the better value for money, then catalog order
+    order = sorted(range(len(products)), key=lambda i: (-scores[names[i]], -columns["value_score"][i], i))
+    ranking = [
+        {"rank": rank, "product": names[i], "score": scores[names[i]], "value_score": columns["value_score"][i]}
+        for rank, i in enumerate(order, start=1)
+    ]
+    top_score = ranking[0]["score"]
+    leaders = [entry["product"] for entry in ranking if entry["score"] == top_score]
+    overall_winner = leaders[0] if len(leaders) == 1 else TIE
+
+    common_ingredients, unique_ingredients = _unique_terms([f.ingredient_set for f in features])
+    common_benefits, unique_benefits = _unique_terms([f.benefit_set for f in features])
+
+    cheapest = names[min(range(len(products)), key=lambda i: columns["price"][i])]
+    most_unique = names[max(range(len(products)), key=lambda i: len(unique_ingredients[i]))]
+
+    if overall_winner == TIE:
+        recommendation = f"{' and '.join(leaders)} are comparable; choose based on specific needs"
+    else:
+        recommendation = f"{overall_winner} is recommended for better overall value"
+
+    return {
+        "products": names,
+        "columns": columns,
+        "feature_winners": feature_winners,
+        "scores": scores,
+        "ranking": ranking,
+        "summary": {
+            "total_features": len(FEATURE_COLUMNS),
+            "top_score": top_score,
+            "overall_winner": overall_winner,
+            "recommendation": recommendation
+        },
+        "ingredients_analysis": {
+            "common_ingredients": common_ingredients,
+            "unique_ingredients": dict(zip(names, unique_ingredients))
+        },
+        "benefits_analysis": {
+            "common_benefits": common_benefits,
+            "unique_benefits": dict(zip(names, unique_benefits))
+        },
+        "category_recommendations": {
+            "for_budget_shoppers": f"{cheapest} (lowest price)",
+            "for_ingredient_conscious": f"{most_unique} (most unique ingredients)",
+            "for_sensitive_skin": "Consult ingredient list for potential irritants"
+        },
+        "final_verdict": {
+            "best_for_budget": cheapest,
+            "best_for_ingredients": names[max(range(len(products)), key=lambda i: columns["ingredients_count"][i])],
+            "overall_value": ranking[0]["product"]
+        }
+    }
\ No newline at end of file
@@ -1,79 +1,124 @@
-from typing import Dict, Any
-from src.core.models import Product
+from bisect import bisect_right
+from typing import Dict, Any, Optional, Sequence, TYPE_CHECKING
+from src.core.models import Product, ProductFeatures
+from src.utils.fragments import freeze
 
-def generate_price_block(product: Product) -> Dict[str, Any]:
+if TYPE_CHECKING:
+    from src.catalog.market_stats import MarketStatistics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Upper bounds (exclusive) of each price category, in INR
+PRICE_CATEGORY_BOUNDS = (500, 1000, 2000)
+PRICE_CATEGORIES = (
+    ("Budget", "Affordable skincare option"),
+    ("Mid-range", "Good value for quality ingredients"),
+    ("Premium", "High-end formulation with advanced ingredients"),
+    ("Luxury", "Premium skincare with exceptional quality")
+)
+
+# Lower bounds (inclusive) of each value assessment above "Poor value"
+VALUE_SCORE_BOUNDS = (40, 60, 80)
+VALUE_ASSESSMENTS = (
+    ("Poor value", "Explore other options"),
+    ("Fair value", "Consider alternatives in same range"),
+    ("Good value", "Worth considering"),
+    ("Excellent value", "Highly recommended for the price")
+)
+
+# Fallback when no catalog statistics are available:
+# assuming average Vitamin C serum price in India is around ₹800-1200
+MARKET_AVERAGE = 1000
+COMPETITIVE_BAND = 200
+
+# Cost per use calculation (assuming 30ml bottle, 2-3 drops per use)
+ESTIMATED_USES = 150  # Typical for 30ml serum
+
+# Purchase advice shared by every product's price block, built and encoded once
+PURCHASE_TIMING = freeze({
+    "best_time": "During festive sales or brand promotions",
+    "discount_frequency": "Quarterly sales common",
+    "bundle_offers": "Often available with moisturizer combos"
+})
+
+PAYMENT_OPTIONS = freeze(["Credit/Debit Card", "UPI", "EMI available above ₹2000", "Cash on Delivery"])
+
+def generate_price_block(
+    product: Product,
+    features: Optional[ProductFeatures] = None,
+    market_stats: Optional["MarketStatistics"] = None
+) -> Dict[str, Any]:
     """
     Generate comprehensive price analysis and value proposition
     
     Args:
         product: Product object containing price data
+        features: Precomputed product features (derived from product if omitted)
+        market_stats: Catalog price statistics; positions the product against its
+            segment's median and interquartile range instead of MARKET_AVERAGE
         
     Returns:
-        Dict containing price analysis and value information
+        Dict containing price analysis and value information; purchase_advice
+        and payment_options are shared read-only fragments (modifying them
+        raises TypeError; use fragments.thaw for a copy)
     """
     
     price = product.price
+    features = features or ProductFeatures.from_product(product)
     
     # Determine price category
-    if price < 500:
-        price_category = "Budget"
-        category_description = "Affordable skincare option"
-    elif price < 1000:
-        price_category = "Mid-range"
-        category_description = "Good value for quality ingredients"
-    elif price < 2000:
-        price_category = "Premium"
-        category_description = "High-end formulation with advanced ingredients"
-    else:
-        price_category = "Luxury"
-        category_description = "Premium skincare with exceptional quality"
+    price_category, category_description = PRICE_CATEGORIES[bisect_right(PRICE_CATEGORY_BOUNDS, price)]
     
     # Calculate value metrics
-    ingredients_count = len(product.ingredients)
-    benefits_count = len(product.benefits)
+    ingredients_count = features.ingredients_count
+    benefits_count = features.benefits_count
     
     # Simple value score calculation
     value_score = min(100, (ingredients_count * 10 + benefits_count * 15) - (price / 20))
     
     # Value assessment
-    if value_score >= 80:
-        value_assessment = "Excellent value"
-        recommendation = "Highly recommended for the price"
-    elif value_score >= 60:
-        value_assessment = "Good value"
-        recommendation = "Worth considering"
-    elif value_score >= 40:
-        value_assessment = "Fair value"
-        recommendation = "Consider alternatives in same range"
-    else:
-        value_assessment = "Poor value"
-        recommendation = "Explore other options"
+    value_assessment, recommendation = VALUE_ASSESSMENTS[bisect_right(VALUE_SCORE_BOUNDS, value_score)]
     
     # Price comparison with market average
-    # Assuming average Vitamin C serum price in India is around ₹800-1200
-    market_average = 1000
+    market = market_stats.summary_for(product) if market_stats is not None else None
+    market_average = market.median if market else MARKET_AVERAGE
     price_difference = price - market_average
     price_position = "below" if price_difference < 0 else "above"
     
-    # Cost per use calculation (assuming 30ml bottle, 2-3 drops per use)
-    estimated_uses = 150  # Typical for 30ml serum
+    if market is None:
+        competitiveness = "Competitive" if abs(price_difference) < COMPETITIVE_BAND else "Premium priced"
+    elif price < market.p25:
+        competitiveness = "Value priced"
+    elif price <= market.p75:
+        competitiveness = "Competitive"
+    else:
+        competitiveness = "Premium priced"
+    
+    market_position = {
+        "market_average": market_average,
+        "price_difference": abs(price_difference),
+        "position": f"{price_position} market average",
+        "competitiveness": competitiveness
+    }
+    if market:
+        market_position["market_segment"] = market.segment
+        market_position["price_percentiles"] = {"p25": market.p25, "median": market.median, "p75": market.p75}
+        market_position["sample_size"] = market.sample_size
+    
+    estimated_uses = ESTIMATED_USES
     cost_per_use = round(price / estimated_uses, 2)
     
     # Return on investment (ROI) factors
     roi_factors = {
         "ingredient_quality": "High" if "Hyaluronic Acid" in product.ingredients else "Medium",
         "concentration": "Optimal" if "10%" in product.concentration else "Standard",
-        "brand_reputation": "Established" if len(product.name.split()) > 1 else "Emerging",
+        "brand_reputation": "Established" if len(features.name_tokens) > 1 else "Emerging",
         "clinical_backing": "Dermatologist recommended" if price > 700 else "User recommended"
     }
     
-    # Purchase recommendations
-    purchase_timing = {
-        "best_time": "During festive sales or brand promotions",
-        "discount_frequency": "Quarterly sales common",
-        "bundle_offers": "Often available with moisturizer combos"
-    }
-    
     return {
         "price_details": {
             "amount": price,
@@ -89,19 +134,119 @@ def generate_price_block(product: Product) -> Dict[str, Any]:
             "ingredients_per_rupee": round(ingredients_count / (price / 100), 2),
             "benefits_per_rupee": round(benefits_count / (price / 100), 2)
         },
-        "market_position": {
-            "market_average": market_average,
-            "price_difference": abs(price_difference),
-            "position": f"{price_position} market average",
-            "competitiveness": "Competitive" if abs(price_difference) < 200 else "Premium priced"
-        },
+        "market_position": market_position,
         "cost_analysis": {
             "estimated_uses": estimated_uses,
             "cost_per_use": cost_per_use,
-            "daily_cost": round(cost_per_use * (2 if "morning" in product.usage.lower() and "night" in product.usage.lower() else 1), 2),
+            "daily_cost": round(cost_per_use * (2 if features.mentions_morning and features.mentions_night else 1), 2),
             "monthly_cost": round(cost_per_use * 30, 2)
         },
         "roi_factors": roi_factors,
-        "purchase_advice": purchase_timing,
-        "payment_options": ["Credit/Debit Card", "UPI", "EMI available above ₹2000", "Cash on Delivery"]
+        "purchase_advice": PURCHASE_TIMING,
+        "payment_options": PAYMENT_OPTIONS
+    }
+
+def _round_half_even(values, ndigits: int):
+    """Vectorized round() that agrees with Python's correctly rounded builtin"""
+    rounded = np.round(values, ndigits)
+    # np.round scales by 10**ndigits first, which can push a value across a .5 tie
+    scaled = values * 10 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if np.any(near_tie):
+        rounded[near_tie] = [round(value, ndigits) for value in values[near_tie].tolist()]
+    return rounded
+
+def generate_price_block_batch(
+    prices: Sequence[float],
+    ingredient_counts: Sequence[int],
+    benefit_counts: Sequence[int],
+    twice_daily: Optional[Sequence[bool]] = None,
+    market_average: float = MARKET_AVERAGE,
+    market_stats: Optional["MarketStatistics"] = None,
+    products: Optional[Sequence[Product]] = None
+) -> Dict[str, Any]:
+    """
+    Generate price analysis for a whole catalog in one vectorized pass
+    
+    Produces the same values as generate_price_block, laid out column-wise:
+    entry i of every array describes product i.
+    
+    Args:
+        prices: Product prices in INR (must be positive)
+        ingredient_counts: Number of ingredients per product
+        benefit_counts: Number of benefits per product
+        twice_daily: Whether each product is used morning and night
+        market_average: Market average price to position products against
+        market_stats: Catalog price statistics; each row is positioned against
+            its segment's median and interquartile range, as in generate_price_block
+        products: The products behind the rows, used to find their segments
+            (required with market_stats)
+        
+    Returns:
+        Dict of NumPy arrays keyed by the scalar block's field names
+    """
+    
+    if np is None:
+        raise ImportError("generate_price_block_batch requires numpy (pip install numpy)")
+    
+    price = np.asarray(prices, dtype=np.float64)
+    ingredients_count = np.asarray(ingredient_counts, dtype=np.float64)
+    benefits_count = np.asarray(benefit_counts, dtype=np.float64)
+    
+    if not (price.shape == ingredients_count.shape == benefits_count.shape):
+        raise ValueError("prices, ingredient_counts and benefit_counts must have the same shape")
+    if np.any(price <= 0):
+        raise ValueError("All prices must be positive")
+    
+    # Category and assessment lookups: digitize matches bisect_right in the scalar block
+    category_index = np.digitize(price, PRICE_CATEGORY_BOUNDS)
+    category_names = np.array([name for name, _ in PRICE_CATEGORIES], dtype=object)
+    category_descriptions = np.array([desc for _, desc in PRICE_CATEGORIES], dtype=object)
+    
+    value_score = np.minimum(100, (ingredients_count * 10 + benefits_count * 15) - (price / 20))
+    value_index = np.digitize(value_score, VALUE_SCORE_BOUNDS)
+    assessments = np.array([name for name, _ in VALUE_ASSESSMENTS], dtype=object)
+    recommendations = np.array([rec for _, rec in VALUE_ASSESSMENTS], dtype=object)
+    
+    # Per-row market reference: segment median and quartiles, or the fixed average
+    if market_stats is not None:
+        if products is None or len(products) != len(price):
+            raise ValueError("market_stats needs products, one per price")
+        summaries = [market_stats.summary_for(product) for product in products]
+        has_segment = np.array([summary is not None for summary in summaries], dtype=bool)
+        reference = np.array([summary.median if summary else market_average for summary in summaries], dtype=np.float64)
+        p25 = np.array([summary.p25 if summary else np.nan for summary in summaries], dtype=np.float64)
+        p75 = np.array([summary.p75 if summary else np.nan for summary in summaries], dtype=np.float64)
+    else:
+        has_segment = np.zeros(price.shape, dtype=bool)
+        reference = np.full(price.shape, float(market_average))
+        p25 = p75 = reference
+    
+    price_difference = price - reference
+    competitiveness = np.where(
+        has_segment,
+        np.where(price < p25, "Value priced", np.where(price <= p75, "Competitive", "Premium priced")),
+        np.where(np.abs(price_difference) < COMPETITIVE_BAND, "Competitive", "Premium priced")
+    )
+    
+    cost_per_use = _round_half_even(price / ESTIMATED_USES, 2)
+    uses_per_day = 1 if twice_daily is None else np.where(np.asarray(twice_daily, dtype=bool), 2, 1)
+    
+    return {
+        "amount": price,
+        "category": category_names[category_index],
+        "category_description": category_descriptions[category_index],
+        "value_score": np.round(value_score).astype(np.int64),
+        "value_assessment": assessments[value_index],
+        "recommendation": recommendations[value_index],
+        "ingredients_per_rupee": _round_half_even(ingredients_count / (price / 100), 2),
+        "benefits_per_rupee": _round_half_even(benefits_count / (price / 100), 2),
+        "market_average": reference,
+        "price_difference": np.abs(price_difference),
+        "position": np.where(price_difference < 0, "below market average", "above market average"),
+        "competitiveness": competitiveness,
+        "cost_per_use": cost_per_use,
+        "daily_cost": _round_half_even(cost_per_use * uses_per_day, 2),
+        "monthly_cost": _round_half_even(cost_per_use * 30, 2),
+        "clinical_backing": np.where(price > 700, "Dermatologist recommended", "User recommended")
     }
\ No newline at end of file
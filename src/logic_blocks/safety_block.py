@@ -1,22 +1,50 @@
-from typing import Dict, Any
-from src.core.models import Product
+from typing import Dict, Any, Optional
+from src.core.models import Product, ProductFeatures
+from src.utils.fragments import freeze
 
-def generate_safety_block(product: Product) -> Dict[str, Any]:
+# Content shared by every product's safety block, built and encoded once
+PRECAUTIONS = freeze([
+    "Always perform a patch test before first use",
+    "Apply to clean, dry skin",
+    "Start with every other day use for first week",
+    "Avoid sun exposure without sunscreen",
+    "Consult dermatologist if pregnant or breastfeeding"
+])
+
+FIRST_AID = freeze({
+    "eye_contact": "Rinse immediately with plenty of water for 15 minutes",
+    "skin_irritation": "Wash with mild soap and water, apply soothing cream",
+    "ingestion": "Rinse mouth, drink water, seek medical attention",
+    "allergic_reaction": "Discontinue use immediately, seek medical help if severe"
+})
+
+SAFETY_RATINGS = freeze({
+    "dermatologist_tested": True,
+    "hypoallergenic": "suitable for most skin types",
+    "cruelty_free": True,
+    "paraben_free": "check ingredient list",
+    "fragrance_free": "unscented formulation"
+})
+
+def generate_safety_block(product: Product, features: Optional[ProductFeatures] = None) -> Dict[str, Any]:
     """
     Generate comprehensive safety information
     
     Args:
         product: Product object containing safety data
+        features: Precomputed product features (derived from product if omitted)
         
     Returns:
-        Dict containing safety information and warnings
+        Dict containing safety information and warnings; precautions,
+        first_aid_measures and safety_ratings are shared read-only fragments
+        (modifying them raises TypeError; use fragments.thaw for a copy)
     """
     
-    side_effects_text = product.side_effects
+    features = features or ProductFeatures.from_product(product)
     
     # Parse side effects
     side_effects = []
-    if "tingling" in side_effects_text.lower():
+    if features.mentions_tingling:
         side_effects.append({
             "effect": "Mild tingling sensation",
             "frequency": "Common for sensitive skin",
@@ -24,7 +52,7 @@ def generate_safety_block(product: Product) -> Dict[str, Any]:
             "action": "Usually subsides within minutes. Reduce frequency if persistent."
         })
     
-    if "irritation" in side_effects_text.lower():
+    if features.mentions_irritation:
         side_effects.append({
             "effect": "Skin irritation or redness",
             "frequency": "Rare",
@@ -43,7 +71,7 @@ def generate_safety_block(product: Product) -> Dict[str, Any]:
     
     # Contraindications
     contraindications = []
-    if "sensitive" in side_effects_text.lower():
+    if features.mentions_sensitive:
         contraindications.append("Extremely sensitive skin")
     
     # Always include these
@@ -53,38 +81,12 @@ def generate_safety_block(product: Product) -> Dict[str, Any]:
         "Active skin infections"
     ])
     
-    # Precautions
-    precautions = [
-        "Always perform a patch test before first use",
-        "Apply to clean, dry skin",
-        "Start with every other day use for first week",
-        "Avoid sun exposure without sunscreen",
-        "Consult dermatologist if pregnant or breastfeeding"
-    ]
-    
-    # First aid measures
-    first_aid = {
-        "eye_contact": "Rinse immediately with plenty of water for 15 minutes",
-        "skin_irritation": "Wash with mild soap and water, apply soothing cream",
-        "ingestion": "Rinse mouth, drink water, seek medical attention",
-        "allergic_reaction": "Discontinue use immediately, seek medical help if severe"
-    }
-    
-    # Safety ratings and certifications
-    safety_ratings = {
-        "dermatologist_tested": True,
-        "hypoallergenic": "suitable for most skin types",
-        "cruelty_free": True,
-        "paraben_free": "check ingredient list",
-        "fragrance_free": "unscented formulation"
-    }
-    
     return {
         "side_effects": side_effects,
         "contraindications": contraindications,
-        "precautions": precautions,
-        "first_aid_measures": first_aid,
-        "safety_ratings": safety_ratings,
+        "precautions": PRECAUTIONS,
+        "first_aid_measures": FIRST_AID,
+        "safety_ratings": SAFETY_RATINGS,
         "patch_test_instructions": "Apply small amount to inner forearm, wait 24 hours",
         "discontinuation_advice": "Stop use if severe irritation occurs and consult professional",
         "storage_warning": "Keep out of reach of children, store in original container"
@@ -1,10 +1,30 @@
 """
 SEO metadata generation logic block
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from src.catalog.keywords import KeywordStatistics, keyword_terms
 
-def generate_seo_metadata(product_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate SEO metadata for content pages"""
+MAX_KEYWORDS = 10
+
+# Shared stand-in when no catalog is given: every IDF is 1.0, so keywords
+# rank by term frequency (rank() only reads the counters)
+_NO_CATALOG = KeywordStatistics()
+
+def generate_seo_metadata(
+    product_data: Dict[str, Any],
+    keyword_stats: Optional[KeywordStatistics] = None
+) -> Dict[str, Any]:
+    """
+    Generate SEO metadata for content pages
+    
+    Args:
+        product_data: Product fields as returned by Product.to_dict()
+        keyword_stats: Catalog document frequencies; keywords are ranked by
+            TF-IDF against them, or by term frequency when omitted
+    
+    Returns:
+        Dict containing title, meta description, keywords and OpenGraph tags
+    """
     
     title = f"{product_data.get('name', 'Product')} - Benefits, Usage & Review"
     
@@ -21,19 +41,14 @@ def generate_seo_metadata(product_data: Dict[str, Any]) -> Dict[str, Any]:
     
     description = ". ".join(description_parts) + f". Price: ₹{product_data.get('price', 'N/A')}"
     
-    # Generate keywords
-    keywords = set()
-    if product_data.get('name'):
-        keywords.update(product_data['name'].lower().split())
-    if product_data.get('ingredients'):
-        keywords.update([ing.lower() for ing in product_data['ingredients']])
-    if product_data.get('benefits'):
-        keywords.update([benefit.lower() for benefit in product_data['benefits']])
+    # Rank keywords by TF-IDF against the catalog
+    keyword_stats = keyword_stats or _NO_CATALOG
+    keywords = [term for term, _ in keyword_stats.rank(keyword_terms(product_data), limit=MAX_KEYWORDS)]
     
     return {
         "title": title,
         "meta_description": description[:160],  # Truncate for SEO
-        "keywords": list(keywords)[:10],  # Top 10 keywords
+        "keywords": keywords,
         "og_tags": {
             "og:title": title,
             "og:description": description[:300],
@@ -1,23 +1,51 @@
-from typing import Dict, Any
-from src.core.models import Product
+from typing import Dict, Any, Optional
+from src.core.models import Product, ProductFeatures
+from src.utils.fragments import freeze
 
-def generate_usage_block(product: Product) -> Dict[str, Any]:
+# Content shared by every product's usage block, built and encoded once
+PRECAUTIONS = freeze([
+    "Perform a patch test before first use",
+    "Avoid contact with eyes",
+    "Store in a cool, dry place away from direct sunlight",
+    "Use within 6 months of opening"
+])
+
+PRODUCT_COMPATIBILITY = freeze({
+    "compatible_with": ["Moisturizers", "Sunscreens", "Most serums"],
+    "incompatible_with": ["Strong acids (AHA/BHA) in same routine", "Retinol (unless specified)"],
+    "recommended_order": "After cleansing, before moisturizing"
+})
+
+RESULTS_TIMELINE = freeze({
+    "immediate": "Instant hydration and glow",
+    "1_week": "Improved skin texture",
+    "4_weeks": "Visible brightening and even tone",
+    "8_weeks": "Reduced dark spots and full benefits"
+})
+
+def generate_usage_block(product: Product, features: Optional[ProductFeatures] = None) -> Dict[str, Any]:
     """
     Generate detailed usage instructions
     
     Args:
         product: Product object containing usage data
+        features: Precomputed product features (derived from product if omitted)
         
     Returns:
-        Dict containing comprehensive usage information
+        Dict containing comprehensive usage information; precautions,
+        product_compatibility and results_timeline are shared read-only
+        fragments (modifying them raises TypeError; use fragments.thaw for a copy)
     """
     
     # Parse the usage instruction
     usage_text = product.usage
+    features = features or ProductFeatures.from_product(product)
+    mentions_morning = features.mentions_morning
+    mentions_night = features.mentions_night
     
     # Enhanced usage breakdown
     steps = []
-    if "drops" in usage_text.lower():
+    if features.mentions_drops:
         steps.append("Cleanse your face thoroughly and pat dry")
         steps.append("Dispense 2-3 drops onto your fingertips")
         steps.append("Gently pat and press onto face and neck")
@@ -28,48 +56,24 @@ def generate_usage_block(product: Product) -> Dict[str, Any]:
     
     # Determine frequency
     frequency = "Daily"
-    if "morning" in usage_text.lower() and "night" not in usage_text.lower():
+    if mentions_morning and not mentions_night:
         frequency = "Once daily (morning)"
-    elif "night" in usage_text.lower() and "morning" not in usage_text.lower():
+    elif mentions_night and not mentions_morning:
         frequency = "Once daily (night)"
-    elif "morning" in usage_text.lower() and "night" in usage_text.lower():
+    elif mentions_morning and mentions_night:
         frequency = "Twice daily (morning and night)"
     
     # Best time for application
-    best_time = "Morning" if "morning" in usage_text.lower() else "Evening"
-    
-    # Precautions and tips
-    precautions = [
-        "Perform a patch test before first use",
-        "Avoid contact with eyes",
-        "Store in a cool, dry place away from direct sunlight",
-        "Use within 6 months of opening"
-    ]
-    
-    # Compatibility with other products
-    compatible_with = ["Moisturizers", "Sunscreens", "Most serums"]
-    incompatible_with = ["Strong acids (AHA/BHA) in same routine", "Retinol (unless specified)"]
-    
-    # Expected results timeline
-    results_timeline = {
-        "immediate": "Instant hydration and glow",
-        "1_week": "Improved skin texture",
-        "4_weeks": "Visible brightening and even tone",
-        "8_weeks": "Reduced dark spots and full benefits"
-    }
+    best_time = "Morning" if mentions_morning else "Evening"
     
     return {
         "basic_instruction": usage_text,
         "detailed_steps": steps,
         "frequency": frequency,
         "best_time": best_time,
-        "precautions": precautions,
-        "product_compatibility": {
-            "compatible_with": compatible_with,
-            "incompatible_with": incompatible_with,
-            "recommended_order": "After cleansing, before moisturizing"
-        },
-        "results_timeline": results_timeline,
+        "precautions": PRECAUTIONS,
+        "product_compatibility": PRODUCT_COMPATIBILITY,
+        "results_timeline": RESULTS_TIMELINE,
         "storage_instructions": "Keep lid tightly closed, store below 25°C",
         "shelf_life": "24 months unopened, 6 months after opening"
     }
\ No newline at end of file
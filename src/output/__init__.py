@@ -0,0 +1,34 @@
+"""
+Output package - bulk sinks and stores for generated pages
+"""
+
+from .bulk_writer import ShardedPageWriter, ShardLocation, load_manifest, read_shard_page
+from .page_store import PageStore, PageStoreWriter
+from .compressed_writer import BlockCompressedWriter, BlockCompressedReader
+from .sqlite_sink import SQLitePageSink
+from .html_renderer import HtmlBuilder, HtmlFragment, render_html, write_html
+from .sitemap import SitemapWriter, JsonLdFeedWriter, generate_feeds, iter_shard_pages
+from .page_validator import ValidationReport, validate_page, validate_outputs
+
+__all__ = [
+    'ShardedPageWriter',
+    'ShardLocation',
+    'load_manifest',
+    'read_shard_page',
+    'PageStore',
+    'PageStoreWriter',
+    'BlockCompressedWriter',
+    'BlockCompressedReader',
+    'SQLitePageSink',
+    'HtmlBuilder',
+    'HtmlFragment',
+    'render_html',
+    'write_html',
+    'SitemapWriter',
+    'JsonLdFeedWriter',
+    'generate_feeds',
+    'iter_shard_pages',
+    'ValidationReport',
+    'validate_page',
+    'validate_outputs'
+]
\ No newline at end of file
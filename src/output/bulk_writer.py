@@ -0,0 +1,215 @@
+"""
+Sharded JSONL bulk writer with a background I/O thread
+"""
+import json
+import queue
+import re
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, IO, Optional, Tuple, Union
+from src.utils.atomic_writer import atomic_write
+from src.utils.codec import JsonCodec
+
+MANIFEST_NAME = "manifest.json"
+DEFAULT_MAX_SHARD_BYTES = 64 * 1024 * 1024
+DEFAULT_QUEUE_SIZE = 1024
+DEFAULT_BUFFER_BYTES = 1024 * 1024
+
+_CLOSE = object()
+_SHARD_NAME = re.compile(r"(?P<page_type>.+)-\d{5}\.jsonl")
+
+
+@dataclass(frozen=True)
+class ShardLocation:
+    """Where one page lives: shard path (relative to the output root), byte offset and length"""
+
+    shard: str
+    offset: int
+    length: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ShardedPageWriter:
+    """
+    Appends pages to size-capped JSONL shards, one shard series per page type.
+
+    write() only enqueues the page; a single background thread encodes it
+    (compact JSON, one page per line) and appends it through a large write
+    buffer, so encoding and disk I/O overlap with page generation. The queue
+    is bounded: when the writer falls behind, write() blocks instead of
+    buffering an unbounded backlog.
+
+    Shards are named <page_type>/<page_type>-00000.jsonl and roll over once
+    they would exceed max_shard_bytes. close() writes manifest.json mapping
+    product id -> page type -> shard, offset and length. A directory is
+    written by one writer per run; existing shards are overwritten, and
+    close() removes shards of an earlier run that this run did not reach.
+
+    Example:
+        with ShardedPageWriter("outputs/bulk") as writer:
+            for product_id, result in results:
+                for page_type, page in result.outputs.items():
+                    writer.write(page_type, product_id, page)
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_shard_bytes: int = DEFAULT_MAX_SHARD_BYTES,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        codec: Optional[JsonCodec] = None
+    ):
+        if max_shard_bytes <= 0:
+            raise ValueError("max_shard_bytes must be positive")
+        self.directory = Path(directory)
+        self.max_shard_bytes = max_shard_bytes
+        self.buffer_bytes = buffer_bytes
+        # One page per line: the codec must not emit newlines
+        self.codec = codec or JsonCodec(indent=None)
+        if self.codec.indent is not None:
+            raise ValueError("Bulk shards need a compact codec (indent=None)")
+
+        self.manifest: Dict[str, Dict[str, ShardLocation]] = {}
+        self.pages_written = 0
+        self._shards: Dict[str, Tuple[IO[bytes], str, int]] = {}
+        self._shard_counts: Dict[str, int] = {}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="bulk-page-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, directory: Union[str, Path]) -> "ShardedPageWriter":
+        """Writer tuned by output.bulk.max_shard_mb, queue_size and buffer_kb"""
+        from src.core.config import ConfigManager
+
+        config = ConfigManager()
+        return cls(
+            directory,
+            max_shard_bytes=int(config.get("output.bulk.max_shard_mb", 64) * 1024 * 1024),
+            queue_size=config.get("output.bulk.queue_size", DEFAULT_QUEUE_SIZE),
+            buffer_bytes=config.get("output.bulk.buffer_kb", 1024) * 1024
+        )
+
+    def write(self, page_type: str, product_id: str, page: Dict[str, Any]):
+        """
+        Queue one page for writing
+
+        Args:
+            page_type: Shard series the page belongs to (e.g. "faq"); used
+                as a directory name, so it must not contain path separators
+            product_id: Key under which the manifest records the page
+            page: Page content; must not be mutated after this call
+        """
+        if self._closed:
+            raise RuntimeError("ShardedPageWriter is closed")
+        if not page_type or "/" in page_type or "\\" in page_type or ".." in page_type:
+            raise ValueError(f"Invalid page type for a shard directory: {page_type!r}")
+        self._raise_error()
+        self._queue.put((page_type, product_id, page))
+
+    def close(self):
+        """Flush all queued pages, close the shards and write the manifest"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._raise_error()
+
+        manifest = {
+            "pages": self.pages_written,
+            "products": {
+                product_id: {page_type: location.to_dict() for page_type, location in pages.items()}
+                for product_id, pages in self.manifest.items()
+            }
+        }
+        atomic_write(self.directory / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+        self._remove_stale_shards()
+
+    def __enter__(self) -> "ShardedPageWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError("Bulk page writer failed") from self._error
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _CLOSE:
+                    break
+                self._append(*item)
+        except BaseException as e:  # surfaced to the producer on its next call
+            self._error = e
+            # Keep draining so a blocked producer can reach close()
+            while self._queue.get() is not _CLOSE:
+                pass
+        finally:
+            for handle, _, _ in self._shards.values():
+                handle.close()
+
+    def _append(self, page_type: str, product_id: str, page: Dict[str, Any]):
+        line = self.codec.encode(page) + b"\n"
+        handle, shard, offset = self._shard_for(page_type, len(line))
+        handle.write(line)
+        self._shards[page_type] = (handle, shard, offset + len(line))
+        self.manifest.setdefault(product_id, {})[page_type] = ShardLocation(shard, offset, len(line) - 1)
+        self.pages_written += 1
+
+    def _remove_stale_shards(self):
+        # Only after the new manifest is in place, so no manifest lists a removed shard
+        written = {
+            f"{page_type}/{page_type}-{number:05d}.jsonl"
+            for page_type, count in self._shard_counts.items()
+            for number in range(count)
+        }
+        for path in self.directory.glob("*/*.jsonl"):
+            match = _SHARD_NAME.fullmatch(path.name)
+            if match and match.group("page_type") == path.parent.name and f"{path.parent.name}/{path.name}" not in written:
+                path.unlink()
+                try:
+                    path.parent.rmdir()
+                except OSError:  # still holds current shards or other files
+                    pass
+
+    def _shard_for(self, page_type: str, size: int) -> Tuple[IO[bytes], str, int]:
+        current = self._shards.get(page_type)
+        if current is not None and (current[2] == 0 or current[2] + size <= self.max_shard_bytes):
+            return current
+        if current is not None:
+            current[0].close()
+
+        number = self._shard_counts.get(page_type, 0)
+        self._shard_counts[page_type] = number + 1
+        shard = f"{page_type}/{page_type}-{number:05d}.jsonl"
+        path = self.directory / shard
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._shards[page_type] = (open(path, "wb", buffering=self.buffer_bytes), shard, 0)
+        return self._shards[page_type]
+
+
+def load_manifest(directory: Union[str, Path]) -> Dict[str, Dict[str, ShardLocation]]:
+    """Product id -> page type -> shard location, as written by ShardedPageWriter.close()"""
+    with open(Path(directory) / MANIFEST_NAME, "rb") as f:
+        products = json.loads(f.read())["products"]
+    return {
+        product_id: {page_type: ShardLocation(**location) for page_type, location in pages.items()}
+        for product_id, pages in products.items()
+    }
+
+
+def read_shard_page(directory: Union[str, Path], location: ShardLocation, codec: Optional[JsonCodec] = None) -> Dict[str, Any]:
+    """Read one page back from a shard by seeking to its manifest location"""
+    with open(Path(directory) / location.shard, "rb") as f:
+        f.seek(location.offset)
+        return (codec or JsonCodec(indent=None)).decode(f.read(location.length))
\ No newline at end of file
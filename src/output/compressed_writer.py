@@ -0,0 +1,209 @@
+"""
+Streaming compressed page output in independently compressed blocks
+"""
+import gzip
+import json
+import lzma
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from src.utils.atomic_writer import AtomicFile, atomic_write
+from src.utils.codec import JsonCodec
+
+DEFAULT_BLOCK_BYTES = 1024 * 1024
+INDEX_SUFFIX = ".idx"
+
+PathLike = Union[str, Path]
+
+
+def _gzip(level: int) -> Callable[[bytes], bytes]:
+    # mtime=0 keeps blocks reproducible
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _lzma(level: int) -> Callable[[bytes], bytes]:
+    return lambda data: lzma.compress(data, preset=level)
+
+
+# format -> (compressor factory, decompressor, default level, file suffix)
+COMPRESSION_FORMATS = {
+    "gzip": (_gzip, gzip.decompress, 6, ".jsonl.gz"),
+    "lzma": (_lzma, lzma.decompress, 6, ".jsonl.xz")
+}
+
+
+class BlockCompressedWriter:
+    """
+    Streams pages as JSON lines into a file of independently compressed blocks.
+
+    Pages are buffered into blocks of about block_bytes (a page never spans
+    two blocks). Each full block is handed to a thread pool; zlib and lzma
+    release the GIL while compressing, so blocks compress in parallel with
+    each other and with page generation. Finished blocks are written in
+    order, and at most 2 x workers blocks are in flight at once.
+
+    Each block is a complete gzip member or xz stream, so the file is a
+    valid .gz/.xz that zcat or xzcat read whole. A JSON sidecar
+    (<file>.idx) records every block's offset, sizes and first page number,
+    which is what BlockCompressedReader seeks by. The data goes to a temp
+    file that close() renames into place before writing the index, so a
+    crashed run never leaves a truncated file behind its old index.
+
+    Example:
+        with BlockCompressedWriter("outputs/pages.jsonl.gz") as writer:
+            for page in pages:
+                writer.write(page)
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        compression: str = "gzip",
+        block_bytes: int = DEFAULT_BLOCK_BYTES,
+        workers: int = 4,
+        level: Optional[int] = None,
+        codec: Optional[JsonCodec] = None
+    ):
+        if compression not in COMPRESSION_FORMATS:
+            raise ValueError(f"Unknown compression: {compression} (expected one of {', '.join(COMPRESSION_FORMATS)})")
+        factory, _, default_level, _ = COMPRESSION_FORMATS[compression]
+        self.path = Path(path)
+        self.compression = compression
+        self.block_bytes = block_bytes
+        self.codec = codec or JsonCodec(indent=None)
+        if self.codec.indent is not None:
+            raise ValueError("Compressed JSON lines need a compact codec (indent=None)")
+
+        self._compress = factory(default_level if level is None else level)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="block-compress")
+        self._max_pending = 2 * workers
+        self._pending: Deque[Tuple[Future, int, int]] = deque()
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._pages = 0
+        self._block_first_page = 0
+        self._blocks: List[Dict[str, int]] = []
+        self._file = AtomicFile(self.path)
+        self._offset = 0
+
+    @classmethod
+    def from_config(cls, path: PathLike) -> "BlockCompressedWriter":
+        """Writer for output.compression.format, block_kb, workers and level"""
+        from src.core.config import ConfigManager
+
+        config = ConfigManager()
+        return cls(
+            path,
+            compression=config.get("output.compression.format", "gzip"),
+            block_bytes=config.get("output.compression.block_kb", 1024) * 1024,
+            workers=config.get("output.compression.workers", 4),
+            level=config.get("output.compression.level", None)
+        )
+
+    def write(self, page: Union[Dict[str, Any], bytes]):
+        """Append one page (a dict, or already-encoded single-line compact JSON)"""
+        if isinstance(page, bytes):
+            if b"\n" in page:
+                raise ValueError("Pre-encoded pages must be single-line JSON")
+            line = page
+        else:
+            line = self.codec.encode(page)
+        self._buffer.append(line)
+        self._buffer.append(b"\n")
+        self._buffered += len(line) + 1
+        self._pages += 1
+        if self._buffered >= self.block_bytes:
+            self._submit_block()
+
+    def _submit_block(self):
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        self._pending.append((self._pool.submit(self._compress, data), len(data), self._block_first_page))
+        self._block_first_page = self._pages
+        while len(self._pending) > self._max_pending:
+            self._write_oldest()
+
+    def _write_oldest(self):
+        future, raw_length, first_page = self._pending.popleft()
+        compressed = future.result()
+        self._file.write(compressed)
+        self._blocks.append({
+            "offset": self._offset,
+            "length": len(compressed),
+            "raw_length": raw_length,
+            "first_page": first_page
+        })
+        self._offset += len(compressed)
+
+    def close(self):
+        """Compress the last partial block, finish writing and store the block index"""
+        if self._file.closed:
+            return
+        try:
+            self._submit_block()
+            while self._pending:
+                self._write_oldest()
+        except BaseException:
+            self._file.discard()
+            raise
+        finally:
+            self._pool.shutdown()
+        self._file.commit()
+
+        index = {"compression": self.compression, "pages": self._pages, "blocks": self._blocks}
+        atomic_write(Path(str(self.path) + INDEX_SUFFIX), json.dumps(index, indent=2).encode("utf-8"))
+
+    def __enter__(self) -> "BlockCompressedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class BlockCompressedReader:
+    """
+    Random access into a BlockCompressedWriter file via its block index.
+
+    read_block() seeks straight to one block and decompresses only it;
+    page() finds the block holding a page number by binary search.
+    """
+
+    def __init__(self, path: PathLike, codec: Optional[JsonCodec] = None):
+        self.path = Path(path)
+        self.codec = codec or JsonCodec(indent=None)
+        with open(str(self.path) + INDEX_SUFFIX, "rb") as f:
+            index = json.loads(f.read())
+        self.compression = index["compression"]
+        self.page_count = index["pages"]
+        self.blocks = index["blocks"]
+        self._decompress = COMPRESSION_FORMATS[self.compression][1]
+        self._first_pages = [block["first_page"] for block in self.blocks]
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def read_block(self, block_number: int) -> List[bytes]:
+        """Encoded pages of one block"""
+        block = self.blocks[block_number]
+        with open(self.path, "rb") as f:
+            f.seek(block["offset"])
+            data = self._decompress(f.read(block["length"]))
+        return data.split(b"\n")[:-1]
+
+    def page(self, page_number: int) -> Dict[str, Any]:
+        """Decoded page by its position in the stream"""
+        if not 0 <= page_number < self.page_count:
+            raise IndexError(f"Page {page_number} out of range (0-{self.page_count - 1})")
+        block_number = bisect_right(self._first_pages, page_number) - 1
+        lines = self.read_block(block_number)
+        return self.codec.decode(lines[page_number - self._first_pages[block_number]])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for block_number in range(len(self.blocks)):
+            for line in self.read_block(block_number):
+                yield self.codec.decode(line)
\ No newline at end of file
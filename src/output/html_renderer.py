@@ -0,0 +1,287 @@
+"""
+Static HTML rendering of FAQ, product and comparison pages
+"""
+import html
+import json
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple, Union
+from src.utils.atomic_writer import atomic_write
+
+_escape = html.escape
+
+
+class HtmlFragment:
+    """
+    An HTML snippet with named fields, parsed once at import time.
+
+    Fields use str.format syntax; values are HTML-escaped unless the field
+    is marked raw, as in "{body:raw}". Rendering only appends the
+    pre-split literals and values to a builder.
+    """
+
+    __slots__ = ("_parts",)
+
+    def __init__(self, source: str):
+        parts: List[Tuple[str, Optional[str], bool]] = []
+        for literal, field, spec, _ in Formatter().parse(source):
+            parts.append((literal, field, spec == "raw"))
+        self._parts = tuple(parts)
+
+    def render(self, builder: "HtmlBuilder", **values: Any):
+        """Append the snippet with values filled in"""
+        chunks = builder.chunks
+        for literal, field, raw in self._parts:
+            if literal:
+                chunks.append(literal)
+            if field is not None:
+                value = values[field]
+                chunks.append(value if raw else _escape(str(value)))
+
+
+class HtmlBuilder:
+    """Streaming string builder: chunks are only joined (or written) once"""
+
+    __slots__ = ("chunks",)
+
+    def __init__(self):
+        self.chunks: List[str] = []
+
+    def raw(self, markup: str):
+        """Append trusted markup"""
+        self.chunks.append(markup)
+
+    def text(self, value: Any):
+        """Append escaped text"""
+        self.chunks.append(_escape(str(value)))
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks)
+
+    def write_to(self, stream: IO[str]):
+        """Stream the chunks to a text file without joining them"""
+        stream.writelines(self.chunks)
+
+
+PAGE_START = HtmlFragment(
+    '<!DOCTYPE html>\n<html lang="{lang}">\n<head>\n<meta charset="utf-8">\n'
+    '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+    '<title>{title}</title>\n<meta name="description" content="{description}">\n'
+)
+KEYWORDS = HtmlFragment('<meta name="keywords" content="{keywords}">\n')
+JSON_LD = HtmlFragment('<script type="application/ld+json">{markup:raw}</script>\n')
+BODY_START = HtmlFragment('</head>\n<body class="page-{content_type}">\n<main>\n')
+PAGE_END = HtmlFragment('</main>\n</body>\n</html>\n')
+HERO = HtmlFragment('<header class="hero layout-{layout}" id="{section}">\n<h1>{title}</h1>\n')
+SUBTITLE = HtmlFragment('<p class="subtitle">{subtitle}</p>\n')
+TAGLINE = HtmlFragment('<p class="tagline">{tagline}</p>\n')
+SECTION_START = HtmlFragment('<section class="section-{type} layout-{layout}" id="{section}">\n<h2>{heading:raw}</h2>\n')
+SECTION_END = HtmlFragment('</section>\n')
+FAQ_QUESTION = HtmlFragment('<dt id="{id}">{question}</dt>\n<dd>')
+TABLE_HEADER = HtmlFragment('<th scope="col">{label}</th>')
+TABLE_ROW = HtmlFragment(
+    '<tr class="importance-{importance}"><th scope="row">{feature}</th>'
+    '<td>{value_a}</td><td>{value_b}</td><td class="winner">{winner}</td></tr>\n'
+)
+# N-way comparison rows: one cell per product between these two
+TABLE_ROW_START = HtmlFragment('<tr class="importance-{importance}"><th scope="row">{feature}</th>')
+TABLE_ROW_END = HtmlFragment('<td class="winner">{winner}</td></tr>\n')
+
+_labels: Dict[str, str] = {}
+
+
+def _label(key: str) -> str:
+    """Escaped human-readable heading for a dict key (cached)"""
+    label = _labels.get(key)
+    if label is None:
+        label = _labels[key] = _escape(key.replace("_", " ").strip().capitalize())
+    return label
+
+
+def _render_value(value: Any, builder: HtmlBuilder):
+    """Render nested section data as definition and bullet lists"""
+    chunks = builder.chunks
+    if isinstance(value, dict):
+        chunks.append("<dl>\n")
+        for key, item in value.items():
+            chunks.append("<dt>")
+            chunks.append(_label(str(key)))
+            chunks.append("</dt><dd>")
+            _render_value(item, builder)
+            chunks.append("</dd>\n")
+        chunks.append("</dl>\n")
+    elif isinstance(value, list):
+        chunks.append("<ul>\n")
+        for item in value:
+            chunks.append("<li>")
+            _render_value(item, builder)
+            chunks.append("</li>\n")
+        chunks.append("</ul>\n")
+    elif isinstance(value, bool):
+        chunks.append("Yes" if value else "No")
+    elif value is not None:
+        chunks.append(_escape(str(value)))
+
+
+def _plain_text(value: Any) -> str:
+    """Flatten structured answers (lists of dicts, ...) into one line of text"""
+    if isinstance(value, dict):
+        return ", ".join(_plain_text(item) for item in value.values() if item not in (None, ""))
+    if isinstance(value, list):
+        return "; ".join(_plain_text(item) for item in value)
+    return str(value)
+
+
+def _json_ld(markup: Dict[str, Any]) -> str:
+    """schema.org markup as a script body; "</" is escaped so it cannot close the tag"""
+    markup = {"@context": "https://schema.org", **markup}
+    return json.dumps(markup, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def _head(builder: HtmlBuilder, content_type: str, title: str, description: str, keywords: List[str],
+          markup: Optional[Dict[str, Any]], lang: str):
+    PAGE_START.render(builder, lang=lang, title=title, description=description)
+    if keywords:
+        KEYWORDS.render(builder, keywords=", ".join(keywords))
+    if markup:
+        JSON_LD.render(builder, markup=_json_ld(markup))
+    BODY_START.render(builder, content_type=content_type)
+
+
+def _product_sections(content: Dict[str, Any]) -> List[Tuple[str, str, str, Any]]:
+    """(section, type, layout, data) in display order, for either output schema"""
+    structure = content.get("page_structure")
+    sections = content.get("content", {})
+    if isinstance(structure, list):  # compact schema: references into content
+        return [(entry["section"], entry["type"], entry["layout"], sections.get(entry["section"], {})) for entry in structure]
+    ordered = sorted(structure.items(), key=lambda item: item[1].get("priority", 0))
+    return [(name, entry["type"], entry["layout"], entry.get("content", {})) for name, entry in ordered]
+
+
+def _render_product(content: Dict[str, Any], seo: Dict[str, Any], builder: HtmlBuilder, lang: str):
+    optimization = content.get("seo_optimization", {})
+    header = content.get("content", {}).get("header", {})
+    title = seo.get("title") or header.get("title", "Product")
+    description = optimization.get("meta_description") or seo.get("meta_description", "")
+    _head(builder, "product_page", title, description, seo.get("keywords", []), optimization.get("schema_markup"), lang)
+
+    for section, section_type, layout, data in _product_sections(content):
+        if section_type == "hero":
+            HERO.render(builder, layout=layout, section=section, title=data.get("title", title))
+            if data.get("subtitle"):
+                SUBTITLE.render(builder, subtitle=data["subtitle"])
+            if data.get("tagline"):
+                TAGLINE.render(builder, tagline=data["tagline"])
+            builder.raw("</header>\n")
+            continue
+        SECTION_START.render(builder, type=section_type, layout=layout, section=section, heading=_label(section))
+        _render_value(data, builder)
+        SECTION_END.render(builder)
+
+
+def _faq_markup(questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "@type": "FAQPage",
+        "mainEntity": [
+            {"@type": "Question", "name": item["question"], "acceptedAnswer": {"@type": "Answer", "text": _plain_text(item["answer"])}}
+            for item in questions
+        ]
+    }
+
+
+def _render_faq(content: Dict[str, Any], seo: Dict[str, Any], builder: HtmlBuilder, lang: str):
+    questions = content.get("questions", [])
+    title = seo.get("title") or "Frequently Asked Questions"
+    _head(builder, "faq", title, seo.get("meta_description", ""), seo.get("keywords", []), _faq_markup(questions), lang)
+
+    builder.raw("<h1>")
+    builder.text(title)
+    builder.raw("</h1>\n")
+    by_id = {item["id"]: item for item in questions}
+    for category in content.get("categories", []):
+        SECTION_START.render(builder, type="faq", layout="list", section=category["name"], heading=_label(category["name"]))
+        builder.raw("<dl>\n")
+        for question_id in category["question_ids"]:
+            item = by_id[question_id]
+            FAQ_QUESTION.render(builder, id=question_id, question=item["question"])
+            _render_value(item["answer"], builder)
+            builder.raw("</dd>\n")
+        builder.raw("</dl>\n")
+        SECTION_END.render(builder)
+
+
+def _render_comparison(content: Dict[str, Any], seo: Dict[str, Any], builder: HtmlBuilder, lang: str):
+    optimization = content.get("seo_optimization", {})
+    title = optimization.get("title") or seo.get("title") or " vs ".join(content.get("products", {}))
+    description = optimization.get("meta_description") or seo.get("meta_description", "")
+    keywords = optimization.get("keywords") or seo.get("keywords", [])
+    _head(builder, "comparison_page", title, description, keywords, optimization.get("schema_markup"), lang)
+
+    builder.raw("<h1>")
+    builder.text(title)
+    builder.raw("</h1>\n")
+
+    table = content.get("comparison_table")
+    if table:
+        SECTION_START.render(builder, type="table", layout="table", section="comparison_table", heading=_label("comparison_table"))
+        builder.raw("<table>\n<thead><tr>")
+        for label in table["headers"]:
+            TABLE_HEADER.render(builder, label=label)
+        builder.raw("</tr></thead>\n<tbody>\n")
+        for row in table["rows"]:
+            if "values" in row:
+                TABLE_ROW_START.render(builder, importance=row.get("importance", ""), feature=row["feature"])
+                for value in row["values"]:
+                    builder.raw("<td>")
+                    builder.text(value)
+                    builder.raw("</td>")
+                TABLE_ROW_END.render(builder, winner=row.get("winner", ""))
+                continue
+            TABLE_ROW.render(builder, **{field: row.get(field, "") for field in ("importance", "feature", "value_a", "value_b", "winner")})
+        builder.raw("</tbody>\n</table>\n")
+        SECTION_END.render(builder)
+
+    for section in ("summary", "detailed_analysis", "recommendations"):
+        if section in content:
+            SECTION_START.render(builder, type="analysis", layout="stacked", section=section, heading=_label(section))
+            _render_value(content[section], builder)
+            SECTION_END.render(builder)
+
+
+# metadata.content_type -> page renderer
+PAGE_RENDERERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any], HtmlBuilder, str], None]] = {
+    "product_page": _render_product,
+    "faq": _render_faq,
+    "comparison_page": _render_comparison
+}
+
+
+def render_html_into(page: Dict[str, Any], builder: HtmlBuilder, lang: str = "en"):
+    """
+    Render a page into an existing builder
+
+    Args:
+        page: Agent result ({"page_type", "content", "metadata"}) or bare template output
+        builder: Builder the HTML is appended to
+        lang: Value of the html lang attribute
+    """
+    content = page["content"] if "page_type" in page else page
+    seo = (page.get("metadata") or {}).get("seo", {}) if "page_type" in page else {}
+    content_type = content.get("metadata", {}).get("content_type")
+    renderer = PAGE_RENDERERS.get(content_type)
+    if renderer is None:
+        raise ValueError(f"No HTML renderer for content type: {content_type}")
+    renderer(content, seo, builder, lang)
+    PAGE_END.render(builder)
+
+
+def render_html(page: Dict[str, Any], lang: str = "en") -> str:
+    """Render a FAQ, product or comparison page to a complete HTML document"""
+    builder = HtmlBuilder()
+    render_html_into(page, builder, lang)
+    return builder.getvalue()
+
+
+def write_html(page: Dict[str, Any], filename: Union[str, Path], lang: str = "en") -> bool:
+    """Render a page to disk atomically; returns False if the file was already up to date"""
+    return atomic_write(filename, render_html(page, lang).encode("utf-8"))
\ No newline at end of file
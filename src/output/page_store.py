@@ -0,0 +1,245 @@
+"""
+Memory-mapped page store: append-only data file plus a sorted offset index
+"""
+import hashlib
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from src.utils.atomic_writer import atomic_write
+from src.utils.codec import JsonCodec
+from .bulk_writer import load_manifest
+
+DATA_NAME = "pages.dat"
+INDEX_NAME = "pages.idx"
+
+# Index: header, then the sorted key hashes and their record offsets, `count` of each
+_INDEX_MAGIC = b"PGIX"
+_INDEX_HEADER = struct.Struct("<4sIQQ")  # magic, version, count, indexed data size
+_INDEX_VERSION = 1
+# Data record: key length, page length, key bytes, page bytes
+_RECORD_HEADER = struct.Struct("<HI")
+
+PathLike = Union[str, Path]
+
+
+def _store_key(product_id: str, page_type: str) -> bytes:
+    return f"{product_id}\x1f{page_type}".encode("utf-8")
+
+
+def _key_hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _read_record(data: memoryview, offset: int) -> Tuple[int, int, int]:
+    """(key start, key length, page length) of the record at offset, bounds-checked"""
+    if offset + _RECORD_HEADER.size > len(data):
+        raise ValueError(f"Corrupt page store: record header at offset {offset} runs past the end of {DATA_NAME}")
+    key_length, page_length = _RECORD_HEADER.unpack_from(data, offset)
+    start = offset + _RECORD_HEADER.size
+    if start + key_length + page_length > len(data):
+        raise ValueError(f"Corrupt page store: record at offset {offset} runs past the end of {DATA_NAME}")
+    return start, key_length, page_length
+
+
+class PageStore:
+    """
+    Read-only view of a page store, served straight from mmap.
+
+    The index holds the 64-bit key hashes sorted, next to the record
+    offsets, so a lookup is a binary search over the mapped hash column
+    plus one key comparison. get() returns a memoryview slice of the mapped
+    data file: no read, no copy and no parsing of unrelated pages. Only the
+    data covered by the index is visible, so a reader never sees a record
+    whose append has not been indexed yet.
+
+    Slices stay valid until close(); release them before closing.
+
+    Example:
+        with PageStore("outputs/store") as store:
+            raw = store.get("glowboost-serum", "product")
+    """
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+        self._maps = []
+        index = self._map(self.directory / INDEX_NAME)
+        try:
+            count, data_size = self._check_files(index)
+        except ValueError:
+            index.close()
+            raise
+
+        columns = memoryview(index)[_INDEX_HEADER.size:]
+        self._count = count
+        self._hashes = columns[:count * 8].cast("Q")
+        self._offsets = columns[count * 8:count * 16].cast("Q")
+        self._data = memoryview(self._map(self.directory / DATA_NAME, data_size))
+
+    def _check_files(self, index) -> Tuple[int, int]:
+        """(page count, indexed data size) once the index and data file are known to match"""
+        if len(index) < _INDEX_HEADER.size:
+            raise ValueError(f"Not a page store index: {self.directory / INDEX_NAME}")
+        magic, version, count, data_size = _INDEX_HEADER.unpack_from(index, 0)
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+            raise ValueError(f"Not a page store index: {self.directory / INDEX_NAME}")
+        if len(index) < _INDEX_HEADER.size + count * 16:
+            raise ValueError(f"Corrupt page store: {self.directory / INDEX_NAME} is truncated")
+        if os.path.getsize(self.directory / DATA_NAME) < data_size:
+            raise ValueError(f"Corrupt page store: {self.directory / DATA_NAME} is shorter than its index")
+        return count, data_size
+
+    def _map(self, path: Path, length: Optional[int] = None):
+        if length == 0:
+            return b""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), length or 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return self.get(*key) is not None
+
+    def get(self, product_id: str, page_type: str) -> Optional[memoryview]:
+        """
+        Encoded page for a product, as a zero-copy slice of the data file
+
+        Args:
+            product_id: Product the page was stored under
+            page_type: Page type (e.g. "faq", "product", "comparison")
+
+        Returns:
+            The page bytes, or None if the store has no such page
+        """
+        key = _store_key(product_id, page_type)
+        key_hash = _key_hash(key)
+        position = bisect_left(self._hashes, key_hash)
+        # Equal hashes sit next to each other; the stored key settles collisions
+        while position < self._count and self._hashes[position] == key_hash:
+            start, key_length, page_length = _read_record(self._data, self._offsets[position])
+            if self._data[start:start + key_length] == key:
+                start += key_length
+                return self._data[start:start + page_length]
+            position += 1
+        return None
+
+    def get_page(self, product_id: str, page_type: str, codec: Optional[JsonCodec] = None) -> Optional[Dict[str, Any]]:
+        """Decoded page for a product, or None"""
+        raw = self.get(product_id, page_type)
+        if raw is None:
+            return None
+        return (codec or JsonCodec(indent=None)).decode(raw.tobytes())
+
+    def keys(self) -> Iterator[Tuple[str, str]]:
+        """(product_id, page_type) of every stored page, in index order"""
+        for position in range(self._count):
+            start, key_length, _ = _read_record(self._data, self._offsets[position])
+            product_id, page_type = bytes(self._data[start:start + key_length]).decode("utf-8").split("\x1f")
+            yield product_id, page_type
+
+    def close(self):
+        """Unmap the store; raises BufferError while get() slices are still alive"""
+        for view in (self._hashes, self._offsets, self._data):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class PageStoreWriter:
+    """
+    Appends pages to a page store and rewrites its index on close.
+
+    The data file is only ever appended to; storing a page again appends a
+    new record and the index points at the newest one. The index is built in
+    memory and replaced atomically, so readers opened before close() keep
+    serving the previous index.
+
+    Example:
+        with PageStoreWriter("outputs/store") as writer:
+            writer.put("glowboost-serum", "product", page)
+    """
+
+    def __init__(self, directory: PathLike, codec: Optional[JsonCodec] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.codec = codec or JsonCodec(indent=None)
+        # key -> (hash, record offset)
+        self._entries: Dict[bytes, Tuple[int, int]] = {}
+
+        data_path = self.directory / DATA_NAME
+        if (self.directory / INDEX_NAME).exists():
+            with PageStore(self.directory) as store:
+                for position in range(len(store)):
+                    offset = store._offsets[position]
+                    start, key_length, _ = _read_record(store._data, offset)
+                    self._entries[bytes(store._data[start:start + key_length])] = (store._hashes[position], offset)
+                data_size = len(store._data)
+        else:
+            data_size = 0
+        # Drop any records appended after the last index was written
+        with open(data_path, "ab") as f:
+            f.truncate(data_size)
+        self._data = open(data_path, "ab")
+        self._size = self._data.tell()
+
+    def put(self, product_id: str, page_type: str, page: Union[Dict[str, Any], bytes]):
+        """
+        Append a page (a dict, or already-encoded JSON bytes)
+
+        Args:
+            product_id: Product the page belongs to
+            page_type: Page type (e.g. "faq", "product", "comparison")
+            page: Page content
+        """
+        if "\x1f" in product_id or "\x1f" in page_type:
+            raise ValueError("Product ids and page types must not contain \\x1f (the key separator)")
+        payload = page if isinstance(page, (bytes, bytearray, memoryview)) else self.codec.encode(page)
+        key = _store_key(product_id, page_type)
+        if len(key) > 0xFFFF:
+            raise ValueError("Product id and page type exceed 65535 encoded bytes")
+        self._data.write(_RECORD_HEADER.pack(len(key), len(payload)))
+        self._data.write(key)
+        self._data.write(payload)
+        self._entries[key] = (_key_hash(key), self._size)
+        self._size += _RECORD_HEADER.size + len(key) + len(payload)
+
+    def add_shards(self, directory: PathLike):
+        """Import every page listed in a ShardedPageWriter manifest"""
+        for product_id, pages in load_manifest(directory).items():
+            for page_type, location in pages.items():
+                with open(Path(directory) / location.shard, "rb") as f:
+                    f.seek(location.offset)
+                    self.put(product_id, page_type, f.read(location.length))
+
+    def close(self):
+        """Flush the data file and atomically write the index"""
+        if self._data.closed:
+            return
+        self._data.flush()
+        os.fsync(self._data.fileno())
+        self._data.close()
+
+        entries = sorted(self._entries.values())
+        count = len(entries)
+        index = bytearray(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, count, self._size))
+        index += struct.pack(f"<{count}Q", *(entry[0] for entry in entries))
+        index += struct.pack(f"<{count}Q", *(entry[1] for entry in entries))
+        atomic_write(self.directory / INDEX_NAME, bytes(index))
+
+    def __enter__(self) -> "PageStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
\ No newline at end of file
@@ -0,0 +1,289 @@
+"""
+Single-parse, parallel validation of generated pages against per-page-type schemas
+"""
+import gzip
+import lzma
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from src.utils.codec import JsonCodec
+from src.utils.validator import compile_schema
+
+PathLike = Union[str, Path]
+
+# Bookkeeping files written next to pages; never validated as pages
+SKIPPED_FILES = frozenset({".output-manifest.json", "manifest.json"})
+PAGE_SUFFIXES = (".json", ".jsonl", ".jsonl.gz", ".jsonl.xz")
+# Errors kept per report; the count covers all of them
+MAX_REPORTED_ERRORS = 50
+
+_METADATA = {
+    "type": "object",
+    "required": ["generated_at"],
+    "properties": {"generated_at": {"type": "string"}}
+}
+
+# page_type -> schema of the page "content"
+PAGE_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "FAQ": {
+        "type": "object",
+        "required": ["metadata", "questions"],
+        "properties": {
+            "metadata": _METADATA,
+            "questions": {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "object",
+                    "required": ["id", "question", "answer"],
+                    "properties": {"id": {"type": "string"}, "question": {"type": "string"}}
+                }
+            }
+        }
+    },
+    "ProductPage": {
+        "type": "object",
+        "required": ["metadata"],
+        "properties": {"metadata": _METADATA},
+        "anyOf": [
+            {
+                "required": ["page_structure", "content"],
+                "properties": {"page_structure": {"anyOf": [{"type": "object"}, {"type": "array"}]}, "content": {"type": "object"}}
+            },
+            {
+                "required": ["product_info"],
+                "properties": {
+                    "product_info": {
+                        "type": "object",
+                        "required": ["name", "price"],
+                        "properties": {"name": {"type": "string"}, "price": {"type": "number", "minimum": 0}}
+                    }
+                }
+            }
+        ]
+    },
+    "ComparisonPage": {
+        "type": "object",
+        "required": ["metadata"],
+        "properties": {"metadata": _METADATA},
+        "anyOf": [
+            {
+                "required": ["products", "comparison_table"],
+                "properties": {
+                    "products": {"type": "object"},
+                    "comparison_table": {
+                        "type": "object",
+                        "required": ["headers", "rows"],
+                        "properties": {
+                            "headers": {"type": "array", "minItems": 3},
+                            "rows": {"type": "array", "minItems": 1, "items": {"type": "object", "required": ["feature", "winner"]}}
+                        }
+                    }
+                }
+            },
+            {"required": ["product_a", "product_b"]}
+        ]
+    }
+}
+
+# metadata.content_type of bare template output -> page_type
+CONTENT_TYPES = {"faq": "FAQ", "product_page": "ProductPage", "comparison_page": "ComparisonPage"}
+
+_ENVELOPE_SCHEMA = {
+    "type": "object",
+    "required": ["page_type", "content"],
+    "properties": {"page_type": {"type": "string", "enum": sorted(PAGE_SCHEMAS)}, "content": {"type": "object"}}
+}
+
+_validate_envelope = compile_schema(_ENVELOPE_SCHEMA)
+_page_validators: Dict[str, Callable[[Any], List[str]]] = {
+    page_type: compile_schema(schema) for page_type, schema in PAGE_SCHEMAS.items()
+}
+
+
+def validate_page(page: Any) -> Tuple[Optional[str], List[str]]:
+    """
+    Check one decoded page against the schema for its type
+
+    Args:
+        page: Agent result ({"page_type", "content", ...}) or bare template output
+
+    Returns:
+        (page_type or None if it cannot be determined, errors)
+    """
+    if isinstance(page, dict) and "page_type" not in page:
+        page_type = CONTENT_TYPES.get((page.get("metadata") or {}).get("content_type"))
+        if page_type is None:
+            return None, ["$: no page_type and no known metadata.content_type"]
+        return page_type, _page_validators[page_type](page)
+
+    errors = _validate_envelope(page)
+    if errors:
+        page_type = page.get("page_type") if isinstance(page, dict) else None
+        return page_type if isinstance(page_type, str) and page_type in PAGE_SCHEMAS else None, errors
+    page_type = page["page_type"]
+    return page_type, [f"$.content{error[1:]}" for error in _page_validators[page_type](page["content"])]
+
+
+@dataclass
+class ValidationReport:
+    """Counts and sampled errors from validating a set of output files"""
+
+    files: int = 0
+    pages: int = 0
+    valid_pages: int = 0
+    error_count: int = 0
+    pages_by_type: Counter = field(default_factory=Counter)
+    invalid_by_type: Counter = field(default_factory=Counter)
+    errors: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    def add_error(self, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def merge(self, other: "ValidationReport"):
+        """Fold another (worker) report into this one"""
+        self.files += other.files
+        self.pages += other.pages
+        self.valid_pages += other.valid_pages
+        self.pages_by_type.update(other.pages_by_type)
+        self.invalid_by_type.update(other.invalid_by_type)
+        self.error_count += other.error_count - len(other.errors)
+        for message in other.errors:
+            self.add_error(message)
+
+    def format(self) -> str:
+        """Human-readable summary"""
+        lines = [f"{self.files} files, {self.pages} pages, {self.valid_pages} valid ({self.elapsed:.2f}s)"]
+        for page_type in sorted(self.pages_by_type):
+            lines.append(f"  {page_type}: {self.pages_by_type[page_type]} pages, {self.invalid_by_type[page_type]} invalid")
+        if self.error_count:
+            lines.append(f"{self.error_count} errors" + (f" (first {len(self.errors)} shown)" if self.error_count > len(self.errors) else "") + ":")
+            lines.extend(f"  {message}" for message in self.errors)
+        return "\n".join(lines)
+
+
+def _read_lines(path: Path) -> Iterator[bytes]:
+    name = path.name
+    if name.endswith(".gz"):
+        opener = gzip.open
+    elif name.endswith(".xz"):
+        opener = lzma.open
+    else:
+        opener = open
+    with opener(path, "rb") as f:
+        yield from f
+
+
+def _check(report: ValidationReport, where: str, page: Any):
+    page_type, errors = validate_page(page)
+    report.pages += 1
+    report.pages_by_type[page_type or "unknown"] += 1
+    if errors:
+        report.invalid_by_type[page_type or "unknown"] += 1
+        for error in errors:
+            report.add_error(f"{where}: {error}")
+    else:
+        report.valid_pages += 1
+
+
+def validate_files(paths: Sequence[PathLike]) -> ValidationReport:
+    """
+    Validate page files in this process, decoding every page exactly once
+
+    .json files hold one page; .jsonl shards (optionally block-compressed
+    .jsonl.gz / .jsonl.xz) hold one page per line.
+    """
+    codec = JsonCodec(indent=None)
+    report = ValidationReport()
+    for path in map(Path, paths):
+        report.files += 1
+        try:
+            if path.suffix == ".json":
+                data = path.read_bytes()
+                if not data.strip():
+                    report.add_error(f"{path}: empty file")
+                    continue
+                try:
+                    page = codec.decode(data)
+                except ValueError as e:
+                    report.add_error(f"{path}: invalid JSON: {e}")
+                    continue
+                _check(report, str(path), page)
+                continue
+
+            for line_number, line in enumerate(_read_lines(path), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    page = codec.decode(line)
+                except ValueError as e:
+                    report.add_error(f"{path}:{line_number}: invalid JSON: {e}")
+                    continue
+                _check(report, f"{path}:{line_number}", page)
+        except (OSError, EOFError, lzma.LZMAError) as e:
+            report.add_error(f"{path}: unreadable: {e}")
+    return report
+
+
+def find_page_files(paths: Iterable[PathLike]) -> List[Path]:
+    """Page files under the given files and directories, skipping manifests and indexes"""
+    found: List[Path] = []
+    for path in map(Path, paths):
+        candidates = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for candidate in candidates:
+            if candidate.is_file() and candidate.name not in SKIPPED_FILES and candidate.name.endswith(PAGE_SUFFIXES):
+                found.append(candidate)
+    return found
+
+
+def _chunks(files: List[Path], count: int) -> List[List[Path]]:
+    """Split files into count groups of similar total size (largest first, greedy)"""
+    groups: List[List[Path]] = [[] for _ in range(count)]
+    sizes = [0] * count
+    for path in sorted(files, key=lambda p: p.stat().st_size, reverse=True):
+        smallest = sizes.index(min(sizes))
+        groups[smallest].append(path)
+        sizes[smallest] += path.stat().st_size
+    return [group for group in groups if group]
+
+
+def validate_outputs(paths: Iterable[PathLike], workers: Optional[int] = None) -> ValidationReport:
+    """
+    Validate every page under the given output files and directories
+
+    Files are split into one group per worker by size and validated on a
+    process pool, so parsing and schema checks use every core; a single
+    group is validated in-process.
+
+    Args:
+        paths: Output directories (walked recursively), .json pages or shards
+        workers: Worker processes; defaults to the CPU count
+
+    Returns:
+        Merged ValidationReport
+    """
+    start = time.perf_counter()
+    files = find_page_files(paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+    groups = _chunks(files, workers) if files else []
+
+    report = ValidationReport()
+    if len(groups) <= 1:
+        report.merge(validate_files(groups[0] if groups else []))
+    else:
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            for partial in pool.map(validate_files, groups):
+                report.merge(partial)
+    report.elapsed = time.perf_counter() - start
+    return report
\ No newline at end of file
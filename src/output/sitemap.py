@@ -0,0 +1,235 @@
+"""
+Streaming sitemap and JSON-LD feed generation
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+from src.utils.codec import JsonCodec
+
+# Sitemap protocol limits per file
+MAX_SITEMAP_URLS = 50000
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+_SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+_URLSET_START = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{_SITEMAP_NAMESPACE}">\n'.encode("utf-8")
+_URLSET_END = b"</urlset>\n"
+_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+PathLike = Union[str, Path]
+
+
+def slugify(name: str) -> str:
+    """URL slug for a product name: "GlowBoost Vitamin C" -> "glowboost-vitamin-c" """
+    return _SLUG_PATTERN.sub("-", name.lower()).strip("-")
+
+
+def _lastmod(generated_at: Optional[str]) -> Optional[str]:
+    # W3C date; the run clock's timestamps are UTC
+    return generated_at[:10] if generated_at else None
+
+
+def _open_temp(path: Path) -> IO[bytes]:
+    return open(path.with_name(path.name + ".tmp"), "wb")
+
+
+def _commit_temp(handle: IO[bytes], path: Path):
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+    os.replace(handle.name, path)
+
+
+class SitemapWriter:
+    """
+    Streams URLs into sitemap files and writes a sitemap index on close.
+
+    A sitemap is closed and a new one started at 50,000 URLs or 50 MB, the
+    protocol limits. Only the file being written is open; nothing but one
+    (name, lastmod) pair per finished sitemap is kept in memory. Each file
+    is written under a .tmp name and renamed into place when complete.
+    """
+
+    def __init__(self, directory: PathLike, base_url: str, max_urls: int = MAX_SITEMAP_URLS, max_bytes: int = MAX_SITEMAP_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url.rstrip("/")
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.url_count = 0
+        self.sitemaps: List[Tuple[str, Optional[str]]] = []
+        self._handle: Optional[IO[bytes]] = None
+        self._urls = 0
+        self._bytes = 0
+        self._lastmod: Optional[str] = None
+
+    def add(self, path: str, lastmod: Optional[str] = None):
+        """Add one URL (a path below base_url) with an optional W3C lastmod date"""
+        entry = "<url><loc>" + escape(self.base_url + path) + "</loc>"
+        if lastmod:
+            entry += "<lastmod>" + lastmod + "</lastmod>"
+        encoded = (entry + "</url>\n").encode("utf-8")
+
+        if self._handle is not None and (self._urls >= self.max_urls or self._bytes + len(encoded) + len(_URLSET_END) > self.max_bytes):
+            self._finish_sitemap()
+        if self._handle is None:
+            self._handle = _open_temp(self._sitemap_path(len(self.sitemaps)))
+            self._handle.write(_URLSET_START)
+            self._urls = 0
+            self._bytes = len(_URLSET_START)
+            self._lastmod = None
+
+        self._handle.write(encoded)
+        self._urls += 1
+        self._bytes += len(encoded)
+        self.url_count += 1
+        if lastmod and (self._lastmod is None or lastmod > self._lastmod):
+            self._lastmod = lastmod
+
+    def _sitemap_path(self, number: int) -> Path:
+        return self.directory / f"sitemap-{number + 1:05d}.xml"
+
+    def _finish_sitemap(self):
+        path = self._sitemap_path(len(self.sitemaps))
+        self._handle.write(_URLSET_END)
+        _commit_temp(self._handle, path)
+        self._handle = None
+        self.sitemaps.append((path.name, self._lastmod))
+
+    def close(self) -> Path:
+        """Finish the open sitemap and write sitemap_index.xml; returns the index path"""
+        if self._handle is not None:
+            self._finish_sitemap()
+        index_path = self.directory / "sitemap_index.xml"
+        handle = _open_temp(index_path)
+        handle.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{_SITEMAP_NAMESPACE}">\n'.encode("utf-8"))
+        for name, lastmod in self.sitemaps:
+            entry = "<sitemap><loc>" + escape(f"{self.base_url}/{name}") + "</loc>"
+            if lastmod:
+                entry += "<lastmod>" + lastmod + "</lastmod>"
+            handle.write((entry + "</sitemap>\n").encode("utf-8"))
+        handle.write(b"</sitemapindex>\n")
+        _commit_temp(handle, index_path)
+        return index_path
+
+
+class JsonLdFeedWriter:
+    """
+    Streams schema.org objects into one JSON-LD document ({"@context", "@graph"}).
+
+    Items are encoded and written as they arrive, so memory use does not
+    grow with the catalog.
+    """
+
+    def __init__(self, path: PathLike, codec: Optional[JsonCodec] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.codec = codec or JsonCodec(indent=None)
+        self.item_count = 0
+        self._handle = _open_temp(self.path)
+        self._handle.write(b'{"@context":"https://schema.org","@graph":[\n')
+
+    def add(self, item: Dict[str, Any]):
+        """Append one schema.org object"""
+        if self.item_count:
+            self._handle.write(b",\n")
+        self._handle.write(self.codec.encode(item))
+        self.item_count += 1
+
+    def close(self):
+        """Finish the document and move it into place"""
+        self._handle.write(b"\n]}\n")
+        _commit_temp(self._handle, self.path)
+
+
+@dataclass
+class FeedSummary:
+    """What a feed run produced"""
+
+    urls: int = 0
+    products: int = 0
+    sitemaps: List[str] = field(default_factory=list)
+    skipped: int = 0
+
+
+def _page_url(content_type: str, content: Dict[str, Any], metadata: Dict[str, Any]) -> Optional[str]:
+    if content_type == "product_page":
+        name = metadata.get("product_name") or content.get("seo_optimization", {}).get("schema_markup", {}).get("name")
+        return f"/products/{slugify(name)}/" if name else None
+    if content_type == "faq":
+        name = metadata.get("product_name")
+        return f"/products/{slugify(name)}/faq/" if name else None
+    if content_type == "comparison_page":
+        names = content.get("metadata", {}).get("products_compared") or metadata.get("compared_products")
+        return "/compare/" + "-vs-".join(slugify(name) for name in names) + "/" if names else None
+    return None
+
+
+def generate_feeds(
+    pages: Iterable[Dict[str, Any]],
+    output_dir: PathLike,
+    base_url: str,
+    max_urls: int = MAX_SITEMAP_URLS
+) -> FeedSummary:
+    """
+    Write sitemaps, a sitemap index and a JSON-LD product feed in one pass
+
+    Every page becomes a sitemap URL; product pages also contribute their
+    seo_optimization.schema_markup (with the page URL added) to
+    products.jsonld. Pages are consumed one at a time, so a generator over
+    bulk shards runs in constant memory.
+
+    Args:
+        pages: Agent results ({"page_type", "content", "metadata"}) or bare template output
+        output_dir: Directory for sitemap-*.xml, sitemap_index.xml and products.jsonld
+        base_url: Site root, e.g. "https://shop.example.com"
+        max_urls: URLs per sitemap file
+
+    Returns:
+        FeedSummary with counts and the sitemap file names
+    """
+    output_dir = Path(output_dir)
+    sitemap = SitemapWriter(output_dir, base_url, max_urls=max_urls)
+    feed = JsonLdFeedWriter(output_dir / "products.jsonld")
+    summary = FeedSummary()
+
+    for page in pages:
+        content = page["content"] if "page_type" in page else page
+        metadata = (page.get("metadata") or {}) if "page_type" in page else {}
+        page_metadata = content.get("metadata", {})
+        content_type = page_metadata.get("content_type")
+        path = _page_url(content_type, content, metadata)
+        if path is None:
+            summary.skipped += 1
+            continue
+
+        sitemap.add(path, _lastmod(page_metadata.get("generated_at")))
+        markup = content.get("seo_optimization", {}).get("schema_markup")
+        if content_type == "product_page" and markup:
+            feed.add({**markup, "url": sitemap.base_url + path})
+
+    sitemap.close()
+    feed.close()
+    summary.urls = sitemap.url_count
+    summary.products = feed.item_count
+    summary.sitemaps = [name for name, _ in sitemap.sitemaps]
+    return summary
+
+
+def iter_shard_pages(directory: PathLike, codec: Optional[JsonCodec] = None) -> Iterator[Dict[str, Any]]:
+    """Stream every page of a ShardedPageWriter directory, one line at a time"""
+    codec = codec or JsonCodec(indent=None)
+    directory = Path(directory)
+    for shard in sorted(directory.glob("*/*.jsonl")):
+        with open(shard, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield codec.decode(line)
+
+
+def iter_pipeline_pages(outputs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Pages of one or more PipelineResult.outputs dicts"""
+    for result_outputs in outputs:
+        yield from result_outputs.values()
@@ -0,0 +1,144 @@
+"""
+SQLite output sink with batched transactional inserts
+"""
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from src.core.models import PageOutput
+from src.utils.atomic_writer import content_hash
+from src.utils.fragments import canonical_json
+
+DEFAULT_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    product_name TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    generated_at TEXT,
+    content TEXT NOT NULL,
+    metadata TEXT,
+    UNIQUE (product_name, page_type)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_page_type ON pages (page_type);
+CREATE INDEX IF NOT EXISTS idx_pages_content_hash ON pages (content_hash);
+"""
+# UNIQUE (product_name, page_type) doubles as the product name index
+
+_UPSERT = """
+INSERT OR REPLACE INTO pages (product_name, page_type, content_hash, generated_at, content, metadata)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+PageLike = Union[PageOutput, Dict[str, Any]]
+
+
+def _generated_at(content: Dict[str, Any], metadata: Dict[str, Any]) -> Optional[str]:
+    for source in (metadata, content.get("metadata") or {}):
+        if "generated_at" in source:
+            return source["generated_at"]
+    return None
+
+
+class SQLitePageSink:
+    """
+    Writes generated pages into one SQLite database.
+
+    Rows are buffered and inserted with executemany, one transaction per
+    batch, so a full catalog costs a handful of commits rather than one per
+    page. The database runs in WAL mode: readers can query it while a run is
+    writing. Pages are keyed by (product_name, page_type); writing a page
+    again replaces it. content_hash is the SHA-256 of the canonical content
+    encoding, which is also what the content column stores.
+
+    Example:
+        with SQLitePageSink("outputs/pages.db") as sink:
+            for page in result.outputs.values():
+                sink.write(page, product_name=product.name)
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.pages_written = 0
+        self._rows: List[Tuple] = []
+
+        self._connection = sqlite3.connect(str(self.path))
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent with NORMAL; only the last commits can be lost on power failure
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, path: Optional[Union[str, Path]] = None) -> "SQLitePageSink":
+        """Sink at output.sqlite.path (unless given) with output.sqlite.batch_size"""
+        from src.core.config import ConfigManager
+
+        config = ConfigManager()
+        return cls(
+            path or config.get("output.sqlite.path", "outputs/pages.db"),
+            batch_size=config.get("output.sqlite.batch_size", DEFAULT_BATCH_SIZE)
+        )
+
+    def write(self, page: PageLike, product_name: Optional[str] = None):
+        """
+        Queue a page for insertion
+
+        Args:
+            page: PageOutput, or an agent result dict with page_type, content and metadata
+            product_name: Product the page belongs to; defaults to metadata.product_name,
+                or "A vs B vs C" from metadata.compared_products for N-way comparison pages
+        """
+        if isinstance(page, PageOutput):
+            page = page.to_dict()
+        content = page["content"]
+        metadata = page.get("metadata") or {}
+        product_name = product_name or metadata.get("product_name") or " vs ".join(metadata.get("compared_products") or ())
+        if not product_name:
+            raise ValueError(f"No product name for {page['page_type']} page")
+
+        encoded = canonical_json(content)
+        self._rows.append((
+            product_name,
+            page["page_type"],
+            content_hash(encoded),
+            _generated_at(content, metadata),
+            encoded.decode("utf-8"),
+            canonical_json(metadata).decode("utf-8")
+        ))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Insert all buffered pages in one transaction"""
+        if not self._rows:
+            return
+        with self._connection:
+            self._connection.executemany(_UPSERT, self._rows)
+        self.pages_written += len(self._rows)
+        self._rows = []
+
+    def get(self, product_name: str, page_type: str) -> Optional[Dict[str, Any]]:
+        """Stored content of one page (buffered pages included), or None"""
+        self.flush()
+        row = self._connection.execute(
+            "SELECT content FROM pages WHERE product_name = ? AND page_type = ?", (product_name, page_type)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def close(self):
+        """Flush remaining pages and close the database"""
+        if self._connection is None:
+            return
+        self.flush()
+        self._connection.close()
+        self._connection = None
+
+    def __enter__(self) -> "SQLitePageSink":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
\ No newline at end of file
@@ -3,13 +3,25 @@ Templates package - output structure definitions
 """
 
 from .base_template import BaseTemplate
+from .skeleton import PageSkeleton, Slot
+from .schemas import OUTPUT_SCHEMAS, resolve_schema
 from .faq_template import faq_template
 from .product_template import product_template
-from .comparison_template import comparison_template
+from .comparison_template import comparison_template, multi_comparison_template
+from .locales import LOCALES, Locale, get_locale, locales_from_config
 
 __all__ = [
     'BaseTemplate',
+    'PageSkeleton',
+    'Slot',
+    'OUTPUT_SCHEMAS',
+    'resolve_schema',
     'faq_template',
     'product_template',
-    'comparison_template'
+    'comparison_template',
+    'multi_comparison_template',
+    'LOCALES',
+    'Locale',
+    'get_locale',
+    'locales_from_config'
 ]
\ No newline at end of file
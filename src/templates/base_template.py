@@ -2,14 +2,14 @@
 Base template class with validation and rendering capabilities
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-from datetime import datetime
-import json
+from typing import Dict, Any, Optional
+from src.utils.clock import utc_timestamp
+from src.utils.codec import JsonCodec, get_codec
 
 class BaseTemplate(ABC):
     def __init__(self, template_name: str):
         self.template_name = template_name
-        self.created_at = datetime.utcnow().isoformat()
+        self.created_at = utc_timestamp()
         
     @abstractmethod
     def render(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -35,7 +35,11 @@ class BaseTemplate(ABC):
             "content": content
         }
     
-    def to_json(self, data: Dict[str, Any], indent: int = 2) -> str:
-        """Convert rendered template to JSON string"""
-        rendered = self.render(data)
-        return json.dumps(rendered, indent=indent, ensure_ascii=False)
\ No newline at end of file
+    def to_json(self, data: Dict[str, Any], indent: Optional[int] = None) -> str:
+        """Convert rendered template to JSON string (configured formatting unless indent is given)"""
+        codec = JsonCodec(indent=indent) if indent is not None else None
+        return self.to_json_bytes(data, codec).decode("utf-8")
+    
+    def to_json_bytes(self, data: Dict[str, Any], codec: Optional[JsonCodec] = None) -> bytes:
+        """Render template straight to encoded JSON, using the configured codec by default"""
+        return (codec or get_codec()).encode(self.render(data))
\ No newline at end of file
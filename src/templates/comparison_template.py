@@ -1,8 +1,101 @@
-from typing import Dict, Any
-from datetime import datetime
-from src.core.models import Product
+from typing import Dict, Any, List, Optional, Sequence
+from src.utils.clock import utc_timestamp
+from src.core.models import Product, ProductFeatures
+from src.templates.skeleton import PageSkeleton, Slot
+from src.templates.schemas import OUTPUT_SCHEMAS, DEFAULT_SCHEMA
+from src.logic_blocks.multi_comparison_block import FEATURE_COLUMNS, TIE
 
-def comparison_template(product_a: Product, product_b: Product, comparison_data: Dict[str, Any]) -> Dict[str, Any]:
+_COMPARISON_LAYOUT = {
+    "metadata": {
+        "template_version": OUTPUT_SCHEMAS["full"],
+        "generated_at": Slot("generated_at"),
+        "content_type": "comparison_page",
+        "products_compared": Slot("products_compared"),
+        "analysis_depth": "comprehensive"
+    },
+    "summary": Slot("summary"),
+    "products": Slot("products"),
+    "comparison_table": Slot("comparison_table"),
+    "detailed_analysis": Slot("detailed_analysis"),
+    "recommendations": {
+        "by_audience": [
+            {
+                "audience": "Budget-conscious buyers",
+                "recommendation": Slot("budget_recommendation"),
+                "reasoning": "Based on price comparison and value analysis",
+                "priority": "high"
+            },
+            {
+                "audience": "Ingredient-focused users",
+                "recommendation": Slot("ingredient_recommendation"),
+                "reasoning": "Based on unique ingredient analysis",
+                "priority": "medium"
+            },
+            {
+                "audience": "First-time users",
+                "recommendation": Slot("first_time_recommendation"),
+                "reasoning": "Lower investment for trying Vitamin C serums",
+                "priority": "medium"
+            }
+        ],
+        "final_verdict": Slot("final_verdict")
+    },
+    "methodology": {
+        "scoring_system": "Category-based comparison with weighted scoring",
+        "factors_considered": ["Price", "Ingredients", "Benefits", "Skin Compatibility", "Value"],
+        "weight_assignment": "Equal weighting for simplicity",
+        "limitations": [
+            "Does not consider personal skin sensitivity",
+            "Brand reputation not factored",
+            "User reviews not included in analysis"
+        ]
+    },
+    "interactive_features": {
+        "sortable_table": True,
+        "filter_by_category": True,
+        "export_options": ["JSON", "CSV", "PDF"],
+        "shareable": True
+    },
+    "seo_optimization": {
+        "title": Slot("seo_title"),
+        "meta_description": Slot("seo_description"),
+        "keywords": [
+            Slot("versus_keyword"),
+            "comparison",
+            "which is better",
+            "skincare serum comparison"
+        ],
+        "schema_markup": {
+            "@type": "ComparativeAnalysis",
+            "comparedProducts": Slot("compared_products_markup"),
+            "datePublished": Slot("date_published")
+        }
+    }
+}
+
+# Sections that are identical on every comparison page
+_STATIC_SECTIONS = ("methodology", "interactive_features")
+
+# Page layouts compiled once; only the slots are filled per comparison
+COMPARISON_PAGE = PageSkeleton(_COMPARISON_LAYOUT)
+COMPARISON_PAGE_COMPACT = PageSkeleton({
+    key: {
+        **value,
+        "template_version": OUTPUT_SCHEMAS["compact"],
+        "schema": "compact"
+    } if key == "metadata" else value
+    for key, value in _COMPARISON_LAYOUT.items()
+    if key not in _STATIC_SECTIONS
+})
+
+def comparison_template(
+    product_a: Product,
+    product_b: Product,
+    comparison_data: Dict[str, Any],
+    features_a: Optional[ProductFeatures] = None,
+    features_b: Optional[ProductFeatures] = None,
+    schema: str = DEFAULT_SCHEMA
+) -> Dict[str, Any]:
     """
     Template for comparison page generation
     
@@ -10,11 +103,17 @@ def comparison_template(product_a: Product, product_b: Product, comparison_data:
         product_a: First product
         product_b: Second product
         comparison_data: Pre-computed comparison analysis
+        features_a: Precomputed features of product A (derived if omitted)
+        features_b: Precomputed features of product B (derived if omitted)
+        schema: Output schema, "full" or "compact" (see templates.schemas)
         
     Returns:
         Dict with structured comparison page content
     """
     
+    features_a = features_a or ProductFeatures.from_product(product_a)
+    features_b = features_b or ProductFeatures.from_product(product_b)
+    
     # Create comparison table
     comparison_table = {
         "headers": ["Feature", product_a.name, product_b.name, "Winner"],
@@ -29,24 +128,24 @@ def comparison_template(product_a: Product, product_b: Product, comparison_data:
             },
             {
                 "feature": "Ingredients",
-                "value_a": f"{len(product_a.ingredients)}",
-                "value_b": f"{len(product_b.ingredients)}",
+                "value_a": f"{features_a.ingredients_count}",
+                "value_b": f"{features_b.ingredients_count}",
                 "winner": comparison_data["ingredients_analysis"]["winner"],
-                "difference": f"{abs(len(product_a.ingredients) - len(product_b.ingredients))}",
+                "difference": f"{abs(features_a.ingredients_count - features_b.ingredients_count)}",
                 "importance": "high"
             },
             {
                 "feature": "Benefits",
-                "value_a": f"{len(product_a.benefits)}",
-                "value_b": f"{len(product_b.benefits)}",
+                "value_a": f"{features_a.benefits_count}",
+                "value_b": f"{features_b.benefits_count}",
                 "winner": comparison_data["benefits_analysis"]["winner"],
-                "difference": f"{abs(len(product_a.benefits) - len(product_b.benefits))}",
+                "difference": f"{abs(features_a.benefits_count - features_b.benefits_count)}",
                 "importance": "medium"
             },
             {
                 "feature": "Skin Type",
-                "value_a": ", ".join(product_a.skin_type),
-                "value_b": ", ".join(product_b.skin_type),
+                "value_a": features_a.skin_type_text,
+                "value_b": features_b.skin_type_text,
                 "winner": "A" if "Combination" in product_a.skin_type else "B" if "Combination" in product_b.skin_type else "Tie",
                 "difference": "Specialized vs General",
                 "importance": "medium"
@@ -72,86 +171,132 @@ def comparison_template(product_a: Product, product_b: Product, comparison_data:
         "confidence_score": min(100, (max(comparison_data["summary"]["total_score_a"], comparison_data["summary"]["total_score_b"]) / 4) * 100)
     }
     
-    # Create recommendation section
-    recommendations = [
-        {
-            "audience": "Budget-conscious buyers",
-            "recommendation": comparison_data["category_recommendations"]["for_budget_shoppers"],
-            "reasoning": "Based on price comparison and value analysis",
-            "priority": "high"
-        },
-        {
-            "audience": "Ingredient-focused users",
-            "recommendation": comparison_data["category_recommendations"]["for_ingredient_conscious"],
-            "reasoning": "Based on unique ingredient analysis",
-            "priority": "medium"
-        },
-        {
-            "audience": "First-time users",
-            "recommendation": f"Start with {product_a.name if product_a.price < product_b.price else product_b.name}",
-            "reasoning": "Lower investment for trying Vitamin C serums",
-            "priority": "medium"
-        }
-    ]
+    generated_at = utc_timestamp()
     
-    # Generate structured comparison page
-    comparison_page = {
-        "metadata": {
-            "template_version": "1.0.0",
-            "generated_at": datetime.utcnow().isoformat(),
-            "content_type": "comparison_page",
-            "products_compared": [product_a.name, product_b.name],
-            "analysis_depth": "comprehensive"
-        },
-        "summary": summary,
-        "products": {
+    if schema not in OUTPUT_SCHEMAS:
+        raise ValueError(f"Unknown output schema: {schema}")
+    skeleton = COMPARISON_PAGE_COMPACT if schema == "compact" else COMPARISON_PAGE
+    
+    return skeleton.render(
+        generated_at=generated_at,
+        products_compared=[product_a.name, product_b.name],
+        summary=summary,
+        products={
             product_a.name: product_a.to_dict(),
             product_b.name: product_b.to_dict()
         },
-        "comparison_table": comparison_table,
-        "detailed_analysis": comparison_data,
-        "recommendations": {
-            "by_audience": recommendations,
-            "final_verdict": {
-                "winner": comparison_data["final_verdict"]["overall_value"],
-                "reason": f"Wins {summary['a_wins'] if summary['overall_winner'] == 'A' else summary['b_wins']} out of {summary['total_comparisons']} categories",
-                "confidence": f"{summary['confidence_score']}%"
-            }
-        },
-        "methodology": {
-            "scoring_system": "Category-based comparison with weighted scoring",
-            "factors_considered": ["Price", "Ingredients", "Benefits", "Skin Compatibility", "Value"],
-            "weight_assignment": "Equal weighting for simplicity",
-            "limitations": [
-                "Does not consider personal skin sensitivity",
-                "Brand reputation not factored",
-                "User reviews not included in analysis"
-            ]
-        },
-        "interactive_features": {
-            "sortable_table": True,
-            "filter_by_category": True,
-            "export_options": ["JSON", "CSV", "PDF"],
-            "shareable": True
+        comparison_table=comparison_table,
+        detailed_analysis=comparison_data,
+        budget_recommendation=comparison_data["category_recommendations"]["for_budget_shoppers"],
+        ingredient_recommendation=comparison_data["category_recommendations"]["for_ingredient_conscious"],
+        first_time_recommendation=f"Start with {product_a.name if product_a.price < product_b.price else product_b.name}",
+        final_verdict={
+            "winner": comparison_data["final_verdict"]["overall_value"],
+            "reason": f"Wins {summary['a_wins'] if summary['overall_winner'] == 'A' else summary['b_wins']} out of {summary['total_comparisons']} categories",
+            "confidence": f"{summary['confidence_score']}%"
         },
-        "seo_optimization": {
-            "title": f"{product_a.name} vs {product_b.name} - Detailed Comparison 2024",
-            "meta_description": f"Comprehensive comparison between {product_a.name} and {product_b.name}. We analyze price, ingredients, benefits, and determine which is better for your needs.",
-            "keywords": [
-                f"{product_a.name} vs {product_b.name}",
-                "comparison",
-                "which is better",
-                "skincare serum comparison"
-            ],
-            "schema_markup": {
-                "@type": "ComparativeAnalysis",
-                "comparedProducts": [
-                    {"@type": "Product", "name": product_a.name},
-                    {"@type": "Product", "name": product_b.name}
-                ],
-                "datePublished": datetime.utcnow().isoformat()
-            }
+        seo_title=f"{product_a.name} vs {product_b.name} - Detailed Comparison 2024",
+        seo_description=f"Comprehensive comparison between {product_a.name} and {product_b.name}. We analyze price, ingredients, benefits, and determine which is better for your needs.",
+        versus_keyword=f"{product_a.name} vs {product_b.name}",
+        compared_products_markup=[
+            {"@type": "Product", "name": product_a.name},
+            {"@type": "Product", "name": product_b.name}
+        ],
+        date_published=generated_at
+    )
+
+def _display_columns(products: Sequence[Product], features: Sequence[ProductFeatures], comparison_data: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Table cell text for every feature column, one entry per product"""
+    columns = comparison_data["columns"]
+    return {
+        "price": [f"₹{product.price}" for product in products],
+        "ingredients_count": [str(count) for count in columns["ingredients_count"]],
+        "benefits_count": [str(count) for count in columns["benefits_count"]],
+        "combination_skin": [f.skin_type_text for f in features],
+        "high_concentration": [product.concentration for product in products],
+        "value_score": [str(score) for score in columns["value_score"]]
+    }
+
+def multi_comparison_template(
+    products: Sequence[Product],
+    comparison_data: Dict[str, Any],
+    features: Optional[Sequence[ProductFeatures]] = None,
+    schema: str = DEFAULT_SCHEMA
+) -> Dict[str, Any]:
+    """
+    Template for N-way comparison pages (e.g. "top 5 serums")
+    
+    The table is assembled column-wise: every feature contributes one
+    column of cell values, and rows are produced by a single transpose.
+    Rows carry a "values" list in product order instead of value_a/value_b,
+    and "winner" names the winning product(s) or "Tie".
+    
+    Args:
+        products: Compared products, in display order
+        comparison_data: Output of generate_multi_comparison_block for the same products
+        features: Precomputed features, one per product (derived if omitted)
+        schema: Output schema, "full" or "compact" (see templates.schemas)
+        
+    Returns:
+        Dict with structured comparison page content
+    """
+    
+    products = list(products)
+    features = list(features) if features is not None else [ProductFeatures.from_product(product) for product in products]
+    names = comparison_data["products"]
+    display = _display_columns(products, features, comparison_data)
+    winners = comparison_data["feature_winners"]
+    
+    # Transpose feature columns into table rows
+    columns = [display[column] for column, _, _, _ in FEATURE_COLUMNS]
+    rows = [
+        {
+            "feature": label,
+            "values": list(cells),
+            "winners": winners[column],
+            "winner": ", ".join(winners[column]) or TIE,
+            "importance": importance
         }
+        for (column, label, importance, _), cells in zip(FEATURE_COLUMNS, columns)
+    ]
+    comparison_table = {"headers": ["Feature", *names, "Winner"], "rows": rows}
+    
+    verdict = comparison_data["summary"]
+    summary = {
+        "total_comparisons": len(rows),
+        "wins": comparison_data["scores"],
+        "ties": sum(1 for row in rows if not row["winners"]),
+        "ranking": comparison_data["ranking"],
+        "overall_winner": verdict["overall_winner"],
+        "confidence_score": round(verdict["top_score"] / verdict["total_features"] * 100, 1)
     }
     
-    return comparison_page
\ No newline at end of file
+    generated_at = utc_timestamp()
+    
+    if schema not in OUTPUT_SCHEMAS:
+        raise ValueError(f"Unknown output schema: {schema}")
+    skeleton = COMPARISON_PAGE_COMPACT if schema == "compact" else COMPARISON_PAGE
+    
+    versus = " vs ".join(names)
+    recommendations = comparison_data["category_recommendations"]
+    return skeleton.render(
+        generated_at=generated_at,
+        products_compared=list(names),
+        summary=summary,
+        products={product.name: product.to_dict() for product in products},
+        comparison_table=comparison_table,
+        detailed_analysis=comparison_data,
+        budget_recommendation=recommendations["for_budget_shoppers"],
+        ingredient_recommendation=recommendations["for_ingredient_conscious"],
+        first_time_recommendation=f"Start with {comparison_data['final_verdict']['best_for_budget']}",
+        final_verdict={
+            "winner": comparison_data["final_verdict"]["overall_value"],
+            "reason": f"Wins {verdict['top_score']} out of {summary['total_comparisons']} categories",
+            "confidence": f"{summary['confidence_score']}%"
+        },
+        seo_title=f"{versus} - Detailed Comparison 2024",
+        seo_description=f"Comprehensive comparison of {len(names)} serums: {', '.join(names)}. We analyze price, ingredients, benefits, and rank them for your needs.",
+        versus_keyword=versus,
+        compared_products_markup=[{"@type": "Product", "name": name} for name in names],
+        date_published=generated_at
+    )
\ No newline at end of file
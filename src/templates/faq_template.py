@@ -1,36 +1,53 @@
 from typing import List, Tuple, Dict, Any
-from datetime import datetime
+from src.utils.clock import utc_timestamp
+from src.utils.keyword_matcher import KeywordMatcher
+from src.templates.schemas import OUTPUT_SCHEMAS, DEFAULT_SCHEMA
 
-def faq_template(qa_pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+# Checked in declaration order; the first matching category wins
+QUESTION_CATEGORIES = KeywordMatcher({
+    "informational": ["what is", "what does", "explain", "describe"],
+    "usage": ["how to", "how do i", "instructions", "apply"],
+    "safety": ["safe", "side effect", "risk", "pregnant"],
+    "purchase": ["price", "buy", "purchase", "cost", "worth"],
+    "comparison": ["compare", "vs", "difference", "alternative"],
+    "ingredients": ["ingredient", "formula", "composition"]
+})
+
+def faq_template(qa_pairs: List[Tuple[str, str]], schema: str = DEFAULT_SCHEMA) -> Dict[str, Any]:
     """
     Template for FAQ page generation
     
     Args:
         qa_pairs: List of (question, answer) tuples
+        schema: Output schema, "full" or "compact" (see templates.schemas)
         
     Returns:
         Dict with structured FAQ content
     """
     
-    # Create FAQ items
+    # One timestamp per render, shared by the page and every item
+    generated_at = utc_timestamp()
+    question_categories = categorize_questions([question for question, _ in qa_pairs])
+    
+    # Build items, category index and importance index in a single pass
     faq_items = []
-    for idx, (question, answer) in enumerate(qa_pairs, 1):
+    categories: Dict[str, List[str]] = {}
+    by_importance: Dict[str, List[str]] = {"high": [], "medium": [], "low": []}
+    for idx, ((question, answer), category) in enumerate(zip(qa_pairs, question_categories), 1):
+        item_id = f"faq_{idx:03d}"
+        importance = "high" if idx <= 3 else "medium"
         faq_items.append({
-            "id": f"faq_{idx:03d}",
+            "id": item_id,
             "question": question,
             "answer": answer,
-            "category": _categorize_question(question),
-            "importance": "high" if idx <= 3 else "medium",
-            "last_updated": datetime.utcnow().isoformat()
+            "category": category,
+            "importance": importance,
+            "last_updated": generated_at
         })
-    
-    # Create FAQ categories
-    categories = {}
-    for item in faq_items:
-        category = item["category"]
         if category not in categories:
             categories[category] = []
-        categories[category].append(item["id"])
+        categories[category].append(item_id)
+        by_importance[importance].append(item_id)
     
     # Generate FAQ summary
     summary = {
@@ -40,48 +57,54 @@ def faq_template(qa_pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
         "coverage_score": min(100, len(faq_items) * 10)  # Simple coverage metric
     }
     
+    categories_section = [
+        {
+            "name": category,
+            "question_count": len(questions),
+            "question_ids": questions
+        }
+        for category, questions in categories.items()
+    ]
+    
+    if schema == "compact":
+        # Category membership is already listed once under "categories"
+        return {
+            "metadata": {
+                "template_version": OUTPUT_SCHEMAS["compact"],
+                "schema": "compact",
+                "generated_at": generated_at,
+                "content_type": "faq"
+            },
+            "summary": summary,
+            "categories": categories_section,
+            "questions": faq_items,
+            "navigation": {
+                "by_importance": by_importance
+            }
+        }
+    if schema != "full":
+        raise ValueError(f"Unknown output schema: {schema}")
+    
     # Generate structured response
     return {
         "metadata": {
-            "template_version": "1.0.0",
-            "generated_at": datetime.utcnow().isoformat(),
+            "template_version": OUTPUT_SCHEMAS["full"],
+            "generated_at": generated_at,
             "content_type": "faq"
         },
         "summary": summary,
-        "categories": [
-            {
-                "name": category,
-                "question_count": len(questions),
-                "question_ids": questions
-            }
-            for category, questions in categories.items()
-        ],
+        "categories": categories_section,
         "questions": faq_items,
         "navigation": {
-            "by_category": {cat: [q["id"] for q in faq_items if q["category"] == cat] for cat in categories},
-            "by_importance": {
-                "high": [q["id"] for q in faq_items if q["importance"] == "high"],
-                "medium": [q["id"] for q in faq_items if q["importance"] == "medium"],
-                "low": [q["id"] for q in faq_items if q["importance"] == "low"]
-            }
+            "by_category": {category: list(questions) for category, questions in categories.items()},
+            "by_importance": by_importance
         }
     }
 
+def categorize_questions(questions: List[str]) -> List[str]:
+    """Categorize many questions in a single keyword scan"""
+    return QUESTION_CATEGORIES.first_label_batch([question.lower() for question in questions], "general")
+
 def _categorize_question(question: str) -> str:
     """Categorize question based on keywords"""
-    question_lower = question.lower()
-    
-    if any(word in question_lower for word in ["what is", "what does", "explain", "describe"]):
-        return "informational"
-    elif any(word in question_lower for word in ["how to", "how do i", "instructions", "apply"]):
-        return "usage"
-    elif any(word in question_lower for word in ["safe", "side effect", "risk", "pregnant"]):
-        return "safety"
-    elif any(word in question_lower for word in ["price", "buy", "purchase", "cost", "worth"]):
-        return "purchase"
-    elif any(word in question_lower for word in ["compare", "vs", "difference", "alternative"]):
-        return "comparison"
-    elif any(word in question_lower for word in ["ingredient", "formula", "composition"]):
-        return "ingredients"
-    else:
-        return "general"
\ No newline at end of file
+    return QUESTION_CATEGORIES.first_label(question.lower(), "general")
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Locale layer: message catalogs and number/currency formatting
+"""
+from dataclasses import dataclass, replace
+from string import Formatter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LOCALE = "en-IN"
+# Prices are stored in INR; other currencies are converted at these rates
+BASE_CURRENCY = "INR"
+
+
+@dataclass(frozen=True)
+class LocaleSpec:
+    """
+    Formatting rules for one locale.
+
+    Attributes:
+        code: BCP 47 tag, e.g. "fr-FR"
+        language: Message catalog to use
+        currency: ISO 4217 currency prices are shown in
+        currency_symbol: Symbol written next to amounts
+        symbol_after: Whether the symbol follows the amount ("12,50 €")
+        decimal_separator: Decimal mark
+        group_separator: Thousands separator
+        grouping: Group sizes from the right; the last one repeats ((3, 2) gives 12,34,567)
+        rate: Units of currency per INR
+    """
+
+    code: str
+    language: str
+    currency: str
+    currency_symbol: str
+    symbol_after: bool = False
+    decimal_separator: str = "."
+    group_separator: str = ","
+    grouping: Tuple[int, ...] = (3,)
+    rate: float = 1.0
+
+
+LOCALES = {
+    "en-IN": LocaleSpec("en-IN", "en", "INR", "₹", grouping=(3, 2)),
+    "en-US": LocaleSpec("en-US", "en", "USD", "$", rate=0.012),
+    "hi-IN": LocaleSpec("hi-IN", "hi", "INR", "₹", grouping=(3, 2)),
+    "fr-FR": LocaleSpec("fr-FR", "fr", "EUR", " €", symbol_after=True, decimal_separator=",", group_separator=" ", rate=0.011),
+    "de-DE": LocaleSpec("de-DE", "de", "EUR", " €", symbol_after=True, decimal_separator=",", group_separator=".", rate=0.011)
+}
+
+
+class NumberFormatter:
+    """Formats numbers and INR prices for one locale"""
+
+    def __init__(self, spec: LocaleSpec):
+        self.spec = spec
+
+    def number(self, value: float, decimals: int = 0) -> str:
+        """Group and punctuate a number, e.g. 1234567.5 -> "12,34,567.50" for en-IN"""
+        spec = self.spec
+        text = f"{abs(value):.{decimals}f}"
+        integer, _, fraction = text.partition(".")
+
+        groups: List[str] = []
+        sizes = iter(spec.grouping)
+        size = next(sizes)
+        while len(integer) > size:
+            groups.append(integer[-size:])
+            integer = integer[:-size]
+            size = next(sizes, size)
+        groups.append(integer)
+
+        result = spec.group_separator.join(reversed(groups))
+        if fraction:
+            result += spec.decimal_separator + fraction
+        return "-" + result if value < 0 else result
+
+    def currency(self, amount_inr: float, decimals: Optional[int] = None) -> str:
+        """Convert an INR amount to the locale currency and format it with its symbol"""
+        spec = self.spec
+        amount = amount_inr * spec.rate
+        if decimals is None:
+            decimals = 0 if spec.currency == BASE_CURRENCY and float(amount).is_integer() else 2
+        number = self.number(amount, decimals)
+        return number + spec.currency_symbol if spec.symbol_after else spec.currency_symbol + number
+
+    def convert(self, amount_inr: float) -> float:
+        """INR amount in the locale currency, rounded to cents"""
+        return round(amount_inr * self.spec.rate, 2)
+
+
+CATALOGS: Dict[str, Dict[str, str]] = {
+    "en": {
+        "header.subtitle": "{concentration} for {skin_types} Skin",
+        "header.tagline": "Advanced Skincare Serum",
+        "overview.description": "A potent serum featuring {ingredients} for visible brightening and spot reduction.",
+        "overview.concentration": "Concentration: {concentration}",
+        "overview.skin_type": "Skin Type: {skin_types}",
+        "overview.ingredients": "Key Ingredients: {ingredients}",
+        "cta.primary": "Get {name} for {price}",
+        "cta.secondary": "Free shipping on orders above {threshold}",
+        "price.Budget": "Budget",
+        "price.Mid-range": "Mid-range",
+        "price.Premium": "Premium",
+        "price.Luxury": "Luxury",
+        "section.header": "Overview",
+        "section.overview": "About",
+        "section.benefits": "Benefits",
+        "section.usage_instructions": "How to use",
+        "section.safety_information": "Safety",
+        "section.pricing": "Price",
+        "section.call_to_action": "Buy"
+    },
+    "hi": {
+        "header.subtitle": "{skin_types} त्वचा के लिए {concentration}",
+        "header.tagline": "उन्नत स्किनकेयर सीरम",
+        "overview.description": "{ingredients} युक्त एक प्रभावी सीरम, जो त्वचा को निखारता है और दाग-धब्बे कम करता है।",
+        "overview.concentration": "सांद्रता: {concentration}",
+        "overview.skin_type": "त्वचा का प्रकार: {skin_types}",
+        "overview.ingredients": "मुख्य सामग्री: {ingredients}",
+        "cta.primary": "{name} {price} में खरीदें",
+        "cta.secondary": "{threshold} से अधिक के ऑर्डर पर मुफ़्त डिलीवरी",
+        "price.Budget": "किफ़ायती",
+        "price.Mid-range": "मध्यम",
+        "price.Premium": "प्रीमियम",
+        "price.Luxury": "लक्ज़री",
+        "section.header": "परिचय",
+        "section.overview": "विवरण",
+        "section.benefits": "फ़ायदे",
+        "section.usage_instructions": "उपयोग विधि",
+        "section.safety_information": "सुरक्षा",
+        "section.pricing": "कीमत",
+        "section.call_to_action": "खरीदें"
+    },
+    "fr": {
+        "header.subtitle": "{concentration} pour peaux {skin_types}",
+        "header.tagline": "Sérum de soin avancé",
+        "overview.description": "Un sérum puissant à base de {ingredients} pour un teint visiblement plus éclatant et des taches atténuées.",
+        "overview.concentration": "Concentration : {concentration}",
+        "overview.skin_type": "Type de peau : {skin_types}",
+        "overview.ingredients": "Ingrédients clés : {ingredients}",
+        "cta.primary": "{name} pour {price}",
+        "cta.secondary": "Livraison gratuite dès {threshold} d'achat",
+        "price.Budget": "Petit prix",
+        "price.Mid-range": "Milieu de gamme",
+        "price.Premium": "Premium",
+        "price.Luxury": "Luxe",
+        "section.header": "Présentation",
+        "section.overview": "À propos",
+        "section.benefits": "Bienfaits",
+        "section.usage_instructions": "Utilisation",
+        "section.safety_information": "Sécurité",
+        "section.pricing": "Prix",
+        "section.call_to_action": "Acheter"
+    },
+    "de": {
+        "header.subtitle": "{concentration} für {skin_types} Haut",
+        "header.tagline": "Fortschrittliches Pflegeserum",
+        "overview.description": "Ein wirksames Serum mit {ingredients} für sichtbar strahlendere Haut und weniger Pigmentflecken.",
+        "overview.concentration": "Konzentration: {concentration}",
+        "overview.skin_type": "Hauttyp: {skin_types}",
+        "overview.ingredients": "Wichtigste Inhaltsstoffe: {ingredients}",
+        "cta.primary": "{name} für {price} kaufen",
+        "cta.secondary": "Kostenloser Versand ab {threshold}",
+        "price.Budget": "Günstig",
+        "price.Mid-range": "Mittelklasse",
+        "price.Premium": "Premium",
+        "price.Luxury": "Luxus",
+        "section.header": "Übersicht",
+        "section.overview": "Über das Produkt",
+        "section.benefits": "Vorteile",
+        "section.usage_instructions": "Anwendung",
+        "section.safety_information": "Sicherheit",
+        "section.pricing": "Preis",
+        "section.call_to_action": "Kaufen"
+    }
+}
+
+
+class MessageCatalog:
+    """
+    Messages for one language, each split into literals and fields once.
+
+    Messages missing from the catalog fall back to the English catalog, so a
+    partial translation never breaks rendering.
+    """
+
+    def __init__(self, messages: Dict[str, str], fallback: Optional["MessageCatalog"] = None):
+        self._compiled = {key: self._compile(source) for key, source in messages.items()}
+        self._fallback = fallback
+
+    @staticmethod
+    def _compile(source: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+        return tuple((literal, field) for literal, field, _, _ in Formatter().parse(source))
+
+    def format(self, key: str, **values: Any) -> str:
+        """Render a message with its fields filled in"""
+        parts = self._compiled.get(key)
+        if parts is None:
+            if self._fallback is None:
+                raise KeyError(f"Unknown message: {key}")
+            return self._fallback.format(key, **values)
+        return "".join(literal + (str(values[field]) if field is not None else "") for literal, field in parts)
+
+    def get(self, key: str, default: str) -> str:
+        """Message without fields, or default when no catalog has it"""
+        try:
+            return self.format(key)
+        except KeyError:
+            return default
+
+
+_ENGLISH = MessageCatalog(CATALOGS["en"])
+_CATALOGS = {language: _ENGLISH if language == "en" else MessageCatalog(messages, _ENGLISH) for language, messages in CATALOGS.items()}
+
+
+@dataclass(frozen=True)
+class Locale:
+    """A locale ready to render: its spec, message catalog and number formatter"""
+
+    spec: LocaleSpec
+    messages: MessageCatalog
+    numbers: NumberFormatter
+
+    @property
+    def code(self) -> str:
+        return self.spec.code
+
+
+_locale_cache: Dict[LocaleSpec, Locale] = {}
+
+
+def get_locale(code: str, rate: Optional[float] = None) -> Locale:
+    """
+    Compiled locale for a tag such as "fr-FR" (cached)
+
+    Args:
+        code: One of LOCALES
+        rate: Override the INR exchange rate of the locale currency
+
+    Returns:
+        Locale with catalog and formatter
+    """
+    if code not in LOCALES:
+        raise ValueError(f"Unknown locale: {code} (expected one of {', '.join(LOCALES)})")
+    spec = LOCALES[code] if rate is None else replace(LOCALES[code], rate=rate)
+    locale = _locale_cache.get(spec)
+    if locale is None:
+        locale = _locale_cache[spec] = Locale(spec, _CATALOGS[spec.language], NumberFormatter(spec))
+    return locale
+
+
+def locales_from_config(codes: Optional[Sequence[str]] = None) -> List[Locale]:
+    """Locales listed in localization.locales (or codes), with localization.exchange_rates applied"""
+    from src.core.config import ConfigManager
+
+    config = ConfigManager()
+    codes = codes or config.get("localization.locales", [DEFAULT_LOCALE])
+    rates = config.get("localization.exchange_rates", {}) or {}
+    return [get_locale(code, rates.get(LOCALES[code].currency) if code in LOCALES else None) for code in codes]
\ No newline at end of file
@@ -1,12 +1,119 @@
 from typing import Dict, Any
-from datetime import datetime
+from src.utils.clock import utc_timestamp
+from src.templates.skeleton import PageSkeleton, Slot
+from src.templates.schemas import OUTPUT_SCHEMAS, DEFAULT_SCHEMA
 
-def product_template(sections: Dict[str, Any]) -> Dict[str, Any]:
+# Page layout compiled once; only the slots are filled per product
+PRODUCT_PAGE = PageSkeleton({
+    "metadata": {
+        "template_version": OUTPUT_SCHEMAS["full"],
+        "generated_at": Slot("generated_at"),
+        "content_type": "product_page",
+        "sections_count": Slot("sections_count"),
+        "page_structure": "modular"
+    },
+    "page_structure": {
+        "header": {
+            "type": "hero",
+            "content": Slot("header"),
+            "layout": "centered",
+            "priority": 1
+        },
+        "overview": {
+            "type": "intro",
+            "content": Slot("overview"),
+            "layout": "two_column",
+            "priority": 2
+        },
+        "benefits": {
+            "type": "features",
+            "content": Slot("benefits"),
+            "layout": "grid",
+            "priority": 3
+        },
+        "usage": {
+            "type": "instructions",
+            "content": Slot("usage_instructions"),
+            "layout": "step_by_step",
+            "priority": 4
+        },
+        "safety": {
+            "type": "disclaimer",
+            "content": Slot("safety_information"),
+            "layout": "warning",
+            "priority": 5
+        },
+        "pricing": {
+            "type": "pricing",
+            "content": Slot("pricing"),
+            "layout": "comparison",
+            "priority": 6
+        },
+        "cta": {
+            "type": "action",
+            "content": Slot("call_to_action"),
+            "layout": "button_group",
+            "priority": 7
+        }
+    },
+    "content": Slot("sections"),
+    "seo_optimization": {
+        "heading_structure": ["h1", "h2", "h3", "h2", "h3", "h2", "h2"],
+        "keyword_density": Slot("keyword_density"),
+        "meta_description": Slot("meta_description"),
+        "schema_markup": Slot("schema_markup")
+    },
+    "accessibility": {
+        "alt_text_provided": True,
+        "aria_labels": True,
+        "contrast_ratio": "AAA compliant",
+        "keyboard_navigable": True
+    },
+    "performance": {
+        "estimated_load_time": "1.2s",
+        "content_size": "medium",
+        "optimization_suggestions": [
+            "Lazy load images",
+            "Minify CSS/JS",
+            "Implement caching"
+        ]
+    }
+})
+
+# Compact schema: every section appears once under "content" and
+# page_structure only references it; static scaffolding is omitted
+PRODUCT_PAGE_COMPACT = PageSkeleton({
+    "metadata": {
+        "template_version": OUTPUT_SCHEMAS["compact"],
+        "schema": "compact",
+        "generated_at": Slot("generated_at"),
+        "content_type": "product_page",
+        "sections_count": Slot("sections_count")
+    },
+    "page_structure": [
+        {"section": "header", "type": "hero", "layout": "centered"},
+        {"section": "overview", "type": "intro", "layout": "two_column"},
+        {"section": "benefits", "type": "features", "layout": "grid"},
+        {"section": "usage_instructions", "type": "instructions", "layout": "step_by_step"},
+        {"section": "safety_information", "type": "disclaimer", "layout": "warning"},
+        {"section": "pricing", "type": "pricing", "layout": "comparison"},
+        {"section": "call_to_action", "type": "action", "layout": "button_group"}
+    ],
+    "content": Slot("sections"),
+    "seo_optimization": {
+        "keyword_density": Slot("keyword_density"),
+        "meta_description": Slot("meta_description"),
+        "schema_markup": Slot("schema_markup")
+    }
+})
+
+def product_template(sections: Dict[str, Any], schema: str = DEFAULT_SCHEMA) -> Dict[str, Any]:
     """
     Template for product page generation
     
     Args:
         sections: Dictionary containing product page sections
+        schema: Output schema, "full" or "compact" (see templates.schemas)
         
     Returns:
         Dict with structured product page content
@@ -40,93 +147,44 @@ def product_template(sections: Dict[str, Any]) -> Dict[str, Any]:
         elif isinstance(default_content, dict):
             sections[section] = {**default_content, **sections[section]}
     
-    # Generate structured product page
-    product_page = {
-        "metadata": {
-            "template_version": "1.0.0",
-            "generated_at": datetime.utcnow().isoformat(),
-            "content_type": "product_page",
-            "sections_count": len(sections),
-            "page_structure": "modular"
-        },
-        "page_structure": {
-            "header": {
-                "type": "hero",
-                "content": sections["header"],
-                "layout": "centered",
-                "priority": 1
-            },
-            "overview": {
-                "type": "intro",
-                "content": sections["overview"],
-                "layout": "two_column",
-                "priority": 2
-            },
-            "benefits": {
-                "type": "features",
-                "content": sections["benefits"],
-                "layout": "grid",
-                "priority": 3
-            },
-            "usage": {
-                "type": "instructions",
-                "content": sections["usage_instructions"],
-                "layout": "step_by_step",
-                "priority": 4
-            },
-            "safety": {
-                "type": "disclaimer",
-                "content": sections["safety_information"],
-                "layout": "warning",
-                "priority": 5
-            },
-            "pricing": {
-                "type": "pricing",
-                "content": sections["pricing"],
-                "layout": "comparison",
-                "priority": 6
-            },
-            "cta": {
-                "type": "action",
-                "content": sections["call_to_action"],
-                "layout": "button_group",
-                "priority": 7
-            }
+    header = sections["header"]
+    overview = sections["overview"]
+    price_details = sections["pricing"].get("price_details", {})
+    title_words = header.get("title", "").lower().split()
+    
+    values = {
+        "generated_at": utc_timestamp(),
+        "sections_count": len(sections),
+        "sections": sections,
+        "keyword_density": {
+            "primary": title_words[0] if header.get("title") else "product",
+            "secondary": [word for word in title_words[1:3] if word]
         },
-        "content": sections,
-        "seo_optimization": {
-            "heading_structure": ["h1", "h2", "h3", "h2", "h3", "h2", "h2"],
-            "keyword_density": {
-                "primary": sections["header"].get("title", "").lower().split()[0] if sections["header"].get("title") else "product",
-                "secondary": [word for word in sections["header"].get("title", "").lower().split()[1:3] if word]
-            },
-            "meta_description": sections["overview"].get("description", "")[:155] + "..." if sections["overview"].get("description") else "",
-            "schema_markup": {
-                "@type": "Product",
-                "name": sections["header"].get("title", "Product"),
-                "description": sections["overview"].get("description", ""),
-                "offers": {
-                    "@type": "Offer",
-                    "price": sections["pricing"].get("price_details", {}).get("amount", 0),
-                    "priceCurrency": sections["pricing"].get("price_details", {}).get("currency", "INR")
-                }
+        "meta_description": overview.get("description", "")[:155] + "..." if overview.get("description") else "",
+        "schema_markup": {
+            "@type": "Product",
+            "name": header.get("title", "Product"),
+            "description": overview.get("description", ""),
+            "offers": {
+                "@type": "Offer",
+                "price": price_details.get("amount", 0),
+                "priceCurrency": price_details.get("currency", "INR")
             }
-        },
-        "accessibility": {
-            "alt_text_provided": True,
-            "aria_labels": True,
-            "contrast_ratio": "AAA compliant",
-            "keyboard_navigable": True
-        },
-        "performance": {
-            "estimated_load_time": "1.2s",
-            "content_size": "medium",
-            "optimization_suggestions": [
-                "Lazy load images",
-                "Minify CSS/JS",
-                "Implement caching"
-            ]
         }
     }
     
-    return product_page
\ No newline at end of file
+    if schema == "compact":
+        return PRODUCT_PAGE_COMPACT.render(**values)
+    if schema != "full":
+        raise ValueError(f"Unknown output schema: {schema}")
+    
+    return PRODUCT_PAGE.render(
+        header=header,
+        overview=overview,
+        benefits=sections["benefits"],
+        usage_instructions=sections["usage_instructions"],
+        safety_information=sections["safety_information"],
+        pricing=sections["pricing"],
+        call_to_action=sections["call_to_action"],
+        **values
+    )
\ No newline at end of file
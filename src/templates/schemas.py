@@ -0,0 +1,29 @@
+"""
+Versioned output schemas shared by the page templates
+"""
+
+# Schema name -> template_version stamped into page metadata
+OUTPUT_SCHEMAS = {
+    "full": "1.0.0",
+    "compact": "2.0.0"
+}
+DEFAULT_SCHEMA = "full"
+
+
+def resolve_schema(schema: str = None) -> str:
+    """
+    Validate a schema name, defaulting to the output.schema setting
+
+    Args:
+        schema: "full" (every section repeated in page_structure, plus static
+            scaffolding) or "compact" (each section once, no boilerplate)
+
+    Returns:
+        The schema name
+    """
+    if schema is None:
+        from src.core.config import ConfigManager
+        schema = ConfigManager().get("output.schema", DEFAULT_SCHEMA)
+    if schema not in OUTPUT_SCHEMAS:
+        raise ValueError(f"Unknown output schema: {schema} (expected one of {', '.join(OUTPUT_SCHEMAS)})")
+    return schema
@@ -0,0 +1,85 @@
+"""
+Compiled page skeletons with named slots
+"""
+from typing import Any, Dict, List
+from src.utils.fragments import freeze
+
+
+class Slot:
+    """Placeholder for a per-render value in a page skeleton"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r})"
+
+
+def _contains_slot(layout: Any) -> bool:
+    if isinstance(layout, Slot):
+        return True
+    if isinstance(layout, dict):
+        return any(_contains_slot(value) for value in layout.values())
+    if isinstance(layout, list):
+        return any(_contains_slot(value) for value in layout)
+    return False
+
+
+def _compile(layout: Any, constants: List[Any], slot_names: List[str]) -> str:
+    """
+    Compile a layout into a Python expression building it
+
+    Slots read from `values`; subtrees without slots are frozen once and
+    referenced from `constants`, so only the path to each slot is rebuilt.
+    """
+    if isinstance(layout, Slot):
+        slot_names.append(layout.name)
+        return f"values[{layout.name!r}]"
+
+    if not _contains_slot(layout):
+        constants.append(freeze(layout))
+        return f"constants[{len(constants) - 1}]"
+
+    if isinstance(layout, dict):
+        items = []
+        for key, value in layout.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Skeleton keys must be strings, not {key!r}")
+            items.append(f"{key!r}: {_compile(value, constants, slot_names)}")
+        return "{" + ", ".join(items) + "}"
+    return "[" + ", ".join(_compile(value, constants, slot_names) for value in layout) + "]"
+
+
+class PageSkeleton:
+    """
+    A page layout compiled once, rendered by filling named slots.
+
+    The layout is compiled into a single Python expression. Subtrees without
+    slots are frozen into shared fragments at compile time, so rendering only
+    builds the containers leading to a slot and encode_json splices the
+    constant parts from cache. Render cost therefore follows the number of
+    slots, not the size of the layout.
+
+    Example:
+        skeleton = PageSkeleton({"title": Slot("title"), "layout": {"columns": 2}})
+        skeleton.render(title="GlowBoost")
+    """
+
+    def __init__(self, layout: Dict[str, Any]):
+        constants: List[Any] = []
+        slot_names: List[str] = []
+        expression = _compile(layout, constants, slot_names)
+        self.slot_names = frozenset(slot_names)
+        namespace: Dict[str, Any] = {}
+        exec(f"def render(values, constants):\n    return {expression}", namespace)
+        self._render = namespace["render"]
+        self._constants = tuple(constants)
+
+    def render(self, **values: Any) -> Dict[str, Any]:
+        """Fill every slot and return the page"""
+        missing = self.slot_names - values.keys()
+        if missing:
+            raise ValueError(f"Missing values for slots: {', '.join(sorted(missing))}")
+        return self._render(values, self._constants)
@@ -3,17 +3,36 @@ Utilities package - shared helper functions and tools
 """
 
 from .logger import setup_logging, get_logger
-from .validator import validate_json_schema
+from .validator import validate_json_schema, compile_schema
 from .metrics import MetricsCollector, AgentMetrics
 from .file_handler import save_output, load_json, ensure_directory
+from .fragments import freeze, thaw, encode_json, canonical_json
+from .clock import RunClock, get_run_clock, use_run_clock
+from .codec import JsonCodec, get_codec
+from .atomic_writer import AtomicFile, OutputManifest, atomic_write
+from .keyword_matcher import KeywordMatcher
 
 __all__ = [
     'setup_logging',
     'get_logger',
     'validate_json_schema',
+    'compile_schema',
     'MetricsCollector',
     'AgentMetrics',
     'save_output',
     'load_json',
-    'ensure_directory'
+    'ensure_directory',
+    'freeze',
+    'thaw',
+    'encode_json',
+    'canonical_json',
+    'RunClock',
+    'get_run_clock',
+    'use_run_clock',
+    'JsonCodec',
+    'get_codec',
+    'AtomicFile',
+    'OutputManifest',
+    'atomic_write',
+    'KeywordMatcher'
 ]
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Atomic, skip-if-unchanged file writes
+"""
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+MANIFEST_NAME = ".output-manifest.json"
+
+PathLike = Union[str, Path]
+
+
+def content_hash(payload: bytes) -> str:
+    """SHA-256 hex digest of a payload"""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename; directories cannot be opened for fsync on Windows"""
+    if os.name != "posix":
+        return
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class OutputManifest:
+    """
+    Content hashes of the files in an output directory.
+
+    Each entry records a file's SHA-256 together with the size and mtime it
+    had when written. While a file's size and mtime still match, the
+    recorded hash is trusted and the file is never re-read, so checking a
+    large unchanged tree costs one stat per file. A file touched by anything
+    else is re-hashed.
+
+    Example:
+        manifest = OutputManifest.for_directory("outputs")
+        atomic_write("outputs/faq.json", payload, manifest)
+        manifest.save()
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                self._entries = json.loads(f.read()).get("files", {})
+
+    @classmethod
+    def for_directory(cls, directory: PathLike) -> "OutputManifest":
+        """Manifest stored alongside the outputs it describes"""
+        return cls(Path(directory) / MANIFEST_NAME)
+
+    def _key(self, path: Path) -> str:
+        return os.path.relpath(path, self.path.parent)
+
+    def digest(self, path: PathLike) -> Optional[str]:
+        """Hash of the file as it is on disk, or None if it does not exist"""
+        path = Path(path)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(self._key(path))
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+
+        digest = _file_hash(path)
+        self.record(path, digest)
+        return digest
+
+    def record(self, path: PathLike, digest: str):
+        """Remember the hash of a file just written"""
+        path = Path(path)
+        st = path.stat()
+        with self._lock:
+            self._entries[self._key(path)] = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            self._dirty = True
+
+    def save(self):
+        """Write the manifest (atomically) if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"files": self._entries}, indent=2, sort_keys=True).encode("utf-8")
+            self._dirty = False
+        _replace(self.path, payload)
+
+
+_umask: Optional[int] = None
+_umask_lock = threading.Lock()
+
+
+def _get_umask() -> int:
+    """Process umask, read on the first write rather than at import"""
+    global _umask
+    with _umask_lock:
+        if _umask is None:
+            # os.umask can only be read by setting it; restored immediately, once per process
+            _umask = os.umask(0o022)
+            os.umask(_umask)
+        return _umask
+
+
+def _target_mode(path: Path) -> int:
+    """Permissions for the replacement: the existing file's, or what open() would create"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_get_umask()
+
+
+class AtomicFile:
+    """
+    Binary file streamed to a temp file beside its target and renamed over
+    it by commit().
+
+    For output written piece by piece, where atomic_write would need the
+    whole payload in memory. Until commit() readers keep seeing the
+    previous file; discard() drops the temp file instead.
+
+    Example:
+        out = AtomicFile("outputs/pages.jsonl.gz")
+        for block in blocks:
+            out.write(block)
+        out.commit()
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.temp_name = tempfile.mkstemp(dir=str(self.path.parent), prefix=f".{self.path.name}.", suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write(self, data: bytes) -> int:
+        return self._file.write(data)
+
+    def commit(self):
+        """Fsync the temp file and rename it over the target"""
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            # mkstemp creates the file 0600; give it the mode the target should have
+            # (os.chmod by name, as os.fchmod is POSIX-only)
+            os.chmod(self.temp_name, _target_mode(self.path))
+            os.replace(self.temp_name, str(self.path))
+        except BaseException:
+            self.discard()
+            raise
+        _fsync_directory(self.path.parent)
+
+    def discard(self):
+        """Close and delete the temp file, leaving the target untouched"""
+        self._file.close()
+        try:
+            os.unlink(self.temp_name)
+        except FileNotFoundError:
+            pass
+
+
+def _replace(path: Path, payload: bytes):
+    """Write payload to a temp file beside path, fsync it and rename it over path"""
+    out = AtomicFile(path)
+    try:
+        out.write(payload)
+    except BaseException:
+        out.discard()
+        raise
+    out.commit()
+
+
+def atomic_write(filename: PathLike, payload: bytes, manifest: Optional[OutputManifest] = None) -> bool:
+    """
+    Write payload to filename unless the file already holds exactly it
+
+    The existing file is compared by content hash (from the manifest when
+    given, otherwise by reading it; files of a different size are never
+    read). Real writes go to a temp file in the same directory, are fsynced
+    and renamed into place, so readers see either the old or the new file,
+    never a truncated one. Byte-identical reruns rely on deterministic
+    output (see clock.RunClock.fixed).
+
+    Args:
+        filename: Target path
+        payload: Complete file content
+        manifest: Optional manifest to consult and update
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    path = Path(filename)
+    digest = content_hash(payload)
+
+    if manifest is not None:
+        unchanged = manifest.digest(path) == digest
+    else:
+        try:
+            unchanged = path.stat().st_size == len(payload) and _file_hash(path) == digest
+        except FileNotFoundError:
+            unchanged = False
+    if unchanged:
+        return False
+
+    _replace(path, payload)
+    if manifest is not None:
+        manifest.record(path, digest)
+    return True
\ No newline at end of file
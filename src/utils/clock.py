@@ -0,0 +1,81 @@
+"""
+Run clock - the single source of timestamps written into outputs
+"""
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Iterator, Optional
+
+
+class RunClock:
+    """
+    Timestamp source for one pipeline run.
+
+    A clock pinned to an instant stamps every page of a run with the same
+    time. A deterministic clock is pinned to SOURCE_DATE_EPOCH (or the Unix
+    epoch) and also asks writers for key-sorted output, so identical inputs
+    produce byte-identical files. An unpinned clock reads the wall clock on
+    every call, which is the behaviour outside of a run.
+
+    Attributes:
+        instant: Pinned UTC time, or None to read the wall clock
+        deterministic: Whether outputs must be reproducible byte for byte
+    """
+
+    def __init__(self, instant: Optional[datetime] = None, deterministic: bool = False):
+        self.instant = instant
+        self.deterministic = deterministic
+
+    @classmethod
+    def started_now(cls) -> "RunClock":
+        """Clock pinned to the current wall-clock time"""
+        return cls(datetime.utcnow())
+
+    @classmethod
+    def fixed(cls, instant: Optional[datetime] = None) -> "RunClock":
+        """Deterministic clock pinned to instant, SOURCE_DATE_EPOCH or the Unix epoch"""
+        if instant is None:
+            epoch = os.environ.get("SOURCE_DATE_EPOCH")
+            instant = datetime.utcfromtimestamp(int(epoch)) if epoch else datetime(1970, 1, 1)
+        return cls(instant, deterministic=True)
+
+    @classmethod
+    def from_config(cls) -> "RunClock":
+        """Deterministic clock when output.deterministic is set, otherwise started_now()"""
+        from src.core.config import ConfigManager
+
+        if ConfigManager().get("output.deterministic", False):
+            return cls.fixed()
+        return cls.started_now()
+
+    def now(self) -> datetime:
+        """Current run time (UTC, naive)"""
+        return self.instant if self.instant is not None else datetime.utcnow()
+
+    def isoformat(self) -> str:
+        """Current run time as an ISO 8601 string"""
+        return self.now().isoformat()
+
+
+_current_clock: ContextVar[RunClock] = ContextVar("run_clock", default=RunClock())
+
+
+def get_run_clock() -> RunClock:
+    """Clock of the run in progress (a wall clock outside of any run)"""
+    return _current_clock.get()
+
+
+@contextmanager
+def use_run_clock(clock: RunClock) -> Iterator[RunClock]:
+    """Make clock the run clock for the duration of a with-block"""
+    token = _current_clock.set(clock)
+    try:
+        yield clock
+    finally:
+        _current_clock.reset(token)
+
+
+def utc_timestamp() -> str:
+    """ISO timestamp from the current run clock"""
+    return _current_clock.get().isoformat()
@@ -0,0 +1,118 @@
+"""
+JSON codec used by every output writer and reader
+"""
+import json
+from typing import Any, Optional, Union
+from .fragments import encode_json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib backend is always available
+    orjson = None
+
+# output.format -> default indent (None = single line, no whitespace)
+OUTPUT_FORMATS = {
+    "json": 2,
+    "json-compact": None
+}
+BACKENDS = ("auto", "orjson", "stdlib")
+_COMPACT_SEPARATORS = (",", ":")
+
+
+class JsonCodec:
+    """
+    Encodes pages straight to UTF-8 bytes and decodes them back.
+
+    The stdlib backend encodes through encode_json, so shared fragments are
+    spliced from cache. The orjson backend is used for everything orjson can
+    produce identically (2-space or compact indent, UTF-8 output); other
+    settings such as ensure_ascii or a custom indent use the stdlib backend.
+    Decoding always uses orjson when it is installed.
+
+    Attributes:
+        indent: Indentation width, or None for compact single-line output
+        ensure_ascii: Escape non-ASCII characters
+        sort_keys: Sort dictionary keys by default
+        backend: "orjson" or "stdlib", the encoder actually in use
+    """
+
+    def __init__(
+        self,
+        indent: Optional[int] = 2,
+        ensure_ascii: bool = False,
+        sort_keys: bool = False,
+        backend: str = "auto"
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend} (expected one of {', '.join(BACKENDS)})")
+        if backend == "orjson" and orjson is None:
+            raise ImportError("The orjson JSON backend requires orjson (pip install orjson)")
+
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.sort_keys = sort_keys
+        fast = orjson is not None and indent in (None, 2) and not ensure_ascii
+        self.backend = "orjson" if backend != "stdlib" and fast else "stdlib"
+
+        self._orjson_options = 0
+        if self.backend == "orjson":
+            self._orjson_options = orjson.OPT_NON_STR_KEYS
+            if indent is not None:
+                self._orjson_options |= orjson.OPT_INDENT_2
+
+    @classmethod
+    def from_config(cls) -> "JsonCodec":
+        """Codec for output.format, output.indent, output.ensure_ascii and output.json_backend"""
+        from src.core.config import ConfigManager
+
+        config = ConfigManager()
+        output_format = config.get("output.format", "json")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format} (expected one of {', '.join(OUTPUT_FORMATS)})")
+
+        indent = OUTPUT_FORMATS[output_format]
+        if indent is not None:
+            indent = config.get("output.indent", indent)
+        return cls(
+            indent=indent,
+            ensure_ascii=config.get("output.ensure_ascii", False),
+            backend=config.get("output.json_backend", "auto")
+        )
+
+    def encode(self, data: Any, sort_keys: Optional[bool] = None) -> bytes:
+        """
+        Encode data to JSON bytes
+
+        Args:
+            data: JSON-serializable data
+            sort_keys: Override the codec's sort_keys setting
+
+        Returns:
+            Encoded UTF-8 bytes
+        """
+        if sort_keys is None:
+            sort_keys = self.sort_keys
+
+        if self.backend == "orjson":
+            options = self._orjson_options | orjson.OPT_SORT_KEYS if sort_keys else self._orjson_options
+            return orjson.dumps(data, option=options)
+
+        separators = _COMPACT_SEPARATORS if self.indent is None else None
+        return encode_json(data, indent=self.indent, ensure_ascii=self.ensure_ascii, sort_keys=sort_keys, separators=separators)
+
+    def decode(self, raw: Union[bytes, str]) -> Any:
+        """Decode JSON bytes or text"""
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
+
+_default_codec: Optional[JsonCodec] = None
+
+
+def get_codec() -> JsonCodec:
+    """Process-wide codec built from the output settings on first use"""
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = JsonCodec.from_config()
+    return _default_codec
\ No newline at end of file
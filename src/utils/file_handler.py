@@ -3,8 +3,11 @@ File handling utilities for reading and writing data
 """
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
+from .codec import JsonCodec, get_codec
+from .atomic_writer import OutputManifest, atomic_write
+from .clock import get_run_clock
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +20,25 @@ def ensure_directory(directory_path: str) -> bool:
         logger.error(f"Failed to create directory {directory_path}: {e}")
         return False
 
-def save_output(filename: str, data: Dict[str, Any], indent: int = 2) -> bool:
+def save_output(
+    filename: str,
+    data: Dict[str, Any],
+    indent: Optional[int] = None,
+    sort_keys: Optional[bool] = None,
+    codec: Optional[JsonCodec] = None,
+    manifest: Optional[OutputManifest] = None
+) -> bool:
     """
     Save data to JSON file with proper error handling
+    
+    Data is encoded by the configured codec (see codec.get_codec), which
+    honours output.format, output.indent and output.ensure_ascii unless an
+    explicit indent or codec is given. Keys are sorted when sort_keys is
+    set, or by default when the codec sorts them or the run clock is
+    deterministic.
+    
+    The file is replaced atomically and left untouched when its content
+    is unchanged (see atomic_writer.atomic_write).
     """
     try:
         # Ensure directory exists
@@ -27,10 +46,16 @@ def save_output(filename: str, data: Dict[str, Any], indent: int = 2) -> bool:
         ensure_directory(str(filepath.parent))
         
         # Save to file
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent, ensure_ascii=False)
+        codec = codec or get_codec()
+        if indent is not None and indent != codec.indent:
+            codec = JsonCodec(indent=indent, ensure_ascii=codec.ensure_ascii, sort_keys=codec.sort_keys)
+        if sort_keys is None:
+            sort_keys = codec.sort_keys or get_run_clock().deterministic
         
-        logger.info(f"Successfully saved output to {filename}")
+        if atomic_write(filepath, codec.encode(data, sort_keys=sort_keys), manifest):
+            logger.info(f"Successfully saved output to {filename}")
+        else:
+            logger.info(f"Output unchanged, skipped {filename}")
         return True
         
     except Exception as e:
@@ -42,8 +67,8 @@ def load_json(filename: str) -> Dict[str, Any]:
     Load JSON file with error handling
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filename, 'rb') as f:
+            return get_codec().decode(f.read())
     except FileNotFoundError:
         logger.error(f"File not found: {filename}")
         raise
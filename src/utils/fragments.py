@@ -0,0 +1,243 @@
+"""
+Immutable shared content fragments with cached JSON encodings
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_ESCAPE_UNICODE = json.encoder.py_encode_basestring
+_ESCAPE_ASCII = json.encoder.py_encode_basestring_ascii
+if json.encoder.c_encode_basestring is not None:
+    _ESCAPE_UNICODE = json.encoder.c_encode_basestring
+if json.encoder.c_encode_basestring_ascii is not None:
+    _ESCAPE_ASCII = json.encoder.c_encode_basestring_ascii
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} fragments are shared and cannot be modified")
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict shared across every page that includes it.
+
+    Serializes like a plain dict; encode_json additionally reuses its
+    encoding instead of walking it again.
+    """
+
+    __slots__ = ("_encodings",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encodings: Dict[Tuple, str] = {}
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list shared across every page that includes it"""
+
+    __slots__ = ("_encodings",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._encodings: Dict[Tuple, str] = {}
+
+    __setitem__ = __delitem__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+    __iadd__ = __imul__ = _immutable
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into shared fragments"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Recursively copy fragments back into plain, modifiable dicts and lists
+
+    Pages built from shared fragments are read-only where they include
+    them; thaw a page (or any part of it) before editing it in place.
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+class _EncoderOptions:
+    __slots__ = ("indent", "sort_keys", "ensure_ascii", "escape", "item_separator", "key_separator", "default")
+
+    def __init__(self, indent, sort_keys, ensure_ascii, default, separators=None):
+        if indent is not None and not isinstance(indent, str):
+            indent = " " * indent
+        self.indent = indent
+        self.sort_keys = sort_keys
+        self.ensure_ascii = ensure_ascii
+        self.escape = _ESCAPE_ASCII if ensure_ascii else _ESCAPE_UNICODE
+        if separators is None:
+            separators = ("," if indent is not None else ", ", ": ")
+        self.item_separator, self.key_separator = separators
+        self.default = default
+
+
+def _encode_float(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _encode_key(key: Any) -> str:
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _encode_float(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+
+def _encode(value: Any, chunks: List[str], level: int, options: _EncoderOptions):
+    if isinstance(value, str):
+        chunks.append(options.escape(value))
+    elif value is None:
+        chunks.append("null")
+    elif value is True:
+        chunks.append("true")
+    elif value is False:
+        chunks.append("false")
+    elif isinstance(value, int):
+        chunks.append(int.__repr__(value))
+    elif isinstance(value, float):
+        chunks.append(_encode_float(value))
+    elif isinstance(value, (FrozenDict, FrozenList)):
+        key = (level, options.indent, options.sort_keys, options.ensure_ascii, options.item_separator, options.key_separator)
+        encoded = value._encodings.get(key)
+        if encoded is None:
+            fragment_chunks: List[str] = []
+            if isinstance(value, FrozenDict):
+                _encode_dict(value, fragment_chunks, level, options)
+            else:
+                _encode_list(value, fragment_chunks, level, options)
+            encoded = value._encodings[key] = "".join(fragment_chunks)
+        chunks.append(encoded)
+    elif isinstance(value, (list, tuple)):
+        _encode_list(value, chunks, level, options)
+    elif isinstance(value, dict):
+        _encode_dict(value, chunks, level, options)
+    elif options.default is not None:
+        _encode(options.default(value), chunks, level, options)
+    else:
+        raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def _encode_list(value, chunks: List[str], level: int, options: _EncoderOptions):
+    if not value:
+        chunks.append("[]")
+        return
+    if options.indent is not None:
+        newline = "\n" + options.indent * (level + 1)
+        separator = options.item_separator + newline
+        chunks.append("[" + newline)
+    else:
+        separator = options.item_separator
+        chunks.append("[")
+
+    first = True
+    for item in value:
+        if not first:
+            chunks.append(separator)
+        first = False
+        _encode(item, chunks, level + 1, options)
+
+    chunks.append("\n" + options.indent * level + "]" if options.indent is not None else "]")
+
+
+def _encode_dict(value, chunks: List[str], level: int, options: _EncoderOptions):
+    if not value:
+        chunks.append("{}")
+        return
+    if options.indent is not None:
+        newline = "\n" + options.indent * (level + 1)
+        separator = options.item_separator + newline
+        chunks.append("{" + newline)
+    else:
+        separator = options.item_separator
+        chunks.append("{")
+
+    items = sorted(value.items()) if options.sort_keys else value.items()
+    first = True
+    for key, item in items:
+        if not first:
+            chunks.append(separator)
+        first = False
+        chunks.append(options.escape(_encode_key(key)))
+        chunks.append(options.key_separator)
+        _encode(item, chunks, level + 1, options)
+
+    chunks.append("\n" + options.indent * level + "}" if options.indent is not None else "}")
+
+
+def encode_json(
+    data: Any,
+    indent: Optional[int] = 2,
+    ensure_ascii: bool = False,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+    separators: Optional[Tuple[str, str]] = None
+) -> bytes:
+    """
+    Encode data to UTF-8 JSON, splicing in cached fragment encodings
+
+    Output is byte-for-byte what json.dumps(data, indent=indent,
+    ensure_ascii=ensure_ascii, sort_keys=sort_keys, separators=separators)
+    produces; FrozenDict and
+    FrozenList values are encoded once per nesting level and reused.
+
+    Args:
+        data: JSON-serializable data
+        indent: Indentation width, or None for single-line output
+        ensure_ascii: Escape non-ASCII characters
+        sort_keys: Sort dictionary keys
+        default: Fallback converter for otherwise unserializable objects
+        separators: (item_separator, key_separator), as for json.dumps
+
+    Returns:
+        Encoded JSON bytes
+    """
+    chunks: List[str] = []
+    _encode(data, chunks, 0, _EncoderOptions(indent, sort_keys, ensure_ascii, default, separators))
+    return "".join(chunks).encode("utf-8")
+
+
+def canonical_json(data: Any) -> bytes:
+    """
+    Canonical encoding: sorted keys, no insignificant whitespace, UTF-8
+
+    Equal data always yields equal bytes, so the result can be hashed to
+    detect unchanged pages.
+    """
+    return encode_json(data, indent=None, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,91 @@
+"""
+Compiled multi-pattern keyword matching
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Regex for a keyword trie; shared prefixes are matched once"""
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    # Greedy optional group: the longest keyword at a position wins
+    return pattern + "?" if terminal else pattern
+
+
+class KeywordMatcher:
+    """
+    Finds every labelled keyword occurring in a text in one scan.
+
+    Keywords are compiled into a single trie-shaped regex, so each text
+    position is matched against all keywords at once rather than once per
+    keyword. Matching is plain substring containment, like
+    `keyword in text`; callers lowercase text when they want
+    case-insensitive matches.
+
+    Labels keep their declaration order, which first_label() uses as
+    priority.
+
+    Example:
+        matcher = KeywordMatcher({"usage": ["how to", "apply"], "safety": ["safe"]})
+        matcher.labels("how to apply safely")  # frozenset({"usage", "safety"})
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        self.labels_in_order = list(keywords)
+        priority = {label: rank for rank, label in enumerate(self.labels_in_order)}
+        labels_by_keyword: Dict[str, set] = {}
+        for label, words in keywords.items():
+            for word in words:
+                if not word:
+                    raise ValueError(f"Invalid keyword for label {label!r}: {word!r}")
+                labels_by_keyword.setdefault(word, set()).add(label)
+
+        trie: Dict[str, dict] = {}
+        for word in labels_by_keyword:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        # A match reports the longest keyword starting at a position; any
+        # shorter keyword starting there is a prefix of it, so fold their labels in
+        self._labels_by_match: Dict[str, FrozenSet[str]] = {
+            word: frozenset(
+                label
+                for prefix, labels in labels_by_keyword.items() if word.startswith(prefix)
+                for label in labels
+            )
+            for word in labels_by_keyword
+        }
+        self._rank_by_match: Dict[str, int] = {
+            word: min(priority[label] for label in labels)
+            for word, labels in self._labels_by_match.items()
+        }
+        self._pattern = re.compile("(?=(" + _trie_pattern(trie) + "))") if trie else None
+
+    def labels(self, text: str) -> FrozenSet[str]:
+        """Labels of every keyword found in a text"""
+        if self._pattern is None:
+            return frozenset()
+        return frozenset().union(*map(self._labels_by_match.__getitem__, set(self._pattern.findall(text))))
+
+    def first_label(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Highest-priority label found in a text, or default"""
+        if self._pattern is None:
+            return default
+        hits = self._pattern.findall(text)
+        return self.labels_in_order[min(map(self._rank_by_match.__getitem__, hits))] if hits else default
+
+    def labels_batch(self, texts: Sequence[str]) -> List[FrozenSet[str]]:
+        """labels() for many texts"""
+        return [self.labels(text) for text in texts]
+
+    def first_label_batch(self, texts: Sequence[str], default: Optional[str] = None) -> List[Optional[str]]:
+        """first_label() for many texts"""
+        return [self.first_label(text, default) for text in texts]
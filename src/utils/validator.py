@@ -2,9 +2,25 @@
 Validation utilities for data and schemas
 """
 import json
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List
 from pathlib import Path
 
+# JSON Schema type name -> Python types (bool is excluded from the numeric types)
+_JSON_TYPES = {
+    "object": (dict,),
+    "array": (list, tuple),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),)
+}
+
+SchemaCheck = Callable[[Any, str, List[str]], None]
+
+class _Stop(Exception):
+    """Raised by a failed type check: the remaining checks do not apply"""
+
 def validate_json_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     """
     Validate data against JSON schema
@@ -33,23 +49,135 @@ def validate_json_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     
     return True
 
-def validate_product_data(data: Dict[str, Any]) -> tuple[bool, str]:
-    """Validate product-specific business rules"""
-    errors = []
+def _compile_check(schema: Dict[str, Any]) -> SchemaCheck:
+    """Turn one schema node into a chain of small closures"""
+    checks: List[SchemaCheck] = []
+
+    if "type" in schema:
+        type_name = schema["type"]
+        python_types = _JSON_TYPES[type_name]
+        numeric = type_name in ("integer", "number")
+
+        def check_type(value, path, errors):
+            if not isinstance(value, python_types) or (numeric and isinstance(value, bool)):
+                errors.append(f"{path}: expected {type_name}, got {type(value).__name__}")
+                raise _Stop
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = frozenset(schema["enum"])
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {value!r} is not one of {sorted(allowed)}")
+        checks.append(check_enum)
+
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+
+        def check_minimum(value, path, errors):
+            if value < minimum:
+                errors.append(f"{path}: {value} is below the minimum {minimum}")
+        checks.append(check_minimum)
+
+    if "minItems" in schema:
+        min_items = schema["minItems"]
+
+        def check_min_items(value, path, errors):
+            if len(value) < min_items:
+                errors.append(f"{path}: expected at least {min_items} items, got {len(value)}")
+        checks.append(check_min_items)
+
+    if "required" in schema:
+        required = tuple(schema["required"])
+
+        def check_required(value, path, errors):
+            for field in required:
+                if field not in value:
+                    errors.append(f"{path}: missing required field {field!r}")
+        checks.append(check_required)
+
+    if "properties" in schema:
+        properties = tuple((field, f".{field}", _compile_check(sub)) for field, sub in schema["properties"].items())
+
+        def check_properties(value, path, errors):
+            for field, suffix, check in properties:
+                if field in value:
+                    check(value[field], path + suffix, errors)
+        checks.append(check_properties)
+
+    if "items" in schema:
+        item_check = _compile_check(schema["items"])
+
+        def check_items(value, path, errors):
+            for index, item in enumerate(value):
+                item_check(item, f"{path}[{index}]", errors)
+        checks.append(check_items)
+
+    if "anyOf" in schema:
+        alternatives = tuple(_compile_check(sub) for sub in schema["anyOf"])
+
+        def check_any_of(value, path, errors):
+            for alternative in alternatives:
+                attempt: List[str] = []
+                alternative(value, path, attempt)
+                if not attempt:
+                    return
+            errors.append(f"{path}: does not match any allowed layout")
+        checks.append(check_any_of)
+
+    def check(value, path, errors):
+        try:
+            for step in checks:
+                step(value, path, errors)
+        except _Stop:
+            pass
+    return check
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    """
+    Compile a JSON schema into a reusable validator
     
-    # Price validation
-    if 'price' in data and data['price'] <= 0:
-        errors.append("Price must be positive")
+    Supports the subset the output schemas use: type, enum, minimum,
+    minItems, required, properties, items and anyOf. The schema is walked
+    once here; validating a document only runs the resulting closures.
     
-    # Ingredients validation
-    if 'key_ingredients' in data and len(data['key_ingredients']) == 0:
-        errors.append("Product must have at least one ingredient")
+    Args:
+        schema: JSON schema (dict)
+        
+    Returns:
+        Function taking a document and returning its errors as "path: message"
+        strings (empty when valid)
+    """
+    check = _compile_check(schema)
+
+    def validate(data: Any) -> List[str]:
+        errors: List[str] = []
+        check(data, "$", errors)
+        return errors
+    return validate
+
+def validate_product_data(data: Dict[str, Any]) -> tuple[bool, str]:
+    """
+    Validate product-specific business rules
+    
+    Runs the compiled rules from src.core.rules (PRODUCT_RULES) for the keys
+    present in data, so a partial dict is only checked on the fields it has.
+    The legacy key_ingredients key is read as ingredients.
     
-    # Benefits validation
-    if 'benefits' in data and len(data['benefits']) == 0:
-        errors.append("Product must have at least one benefit")
+    Args:
+        data: Product fields, keyed by Product attribute names
+        
+    Returns:
+        (is_valid, "; "-joined errors or "Valid")
+    """
+    from src.core.rules import rule_set_for_fields
     
-    return len(errors) == 0, "; ".join(errors) if errors else "Valid"
+    if "key_ingredients" in data and "ingredients" not in data:
+        data = {**data, "ingredients": data["key_ingredients"]}
+    result = rule_set_for_fields(data).validate(data)
+    return result.is_valid, "; ".join(result.errors) if result.errors else "Valid"
 
 def load_and_validate_schema(schema_path: str) -> Dict[str, Any]:
     """Load JSON schema from file"""
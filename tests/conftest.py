@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the unit tests
+"""
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.models import Product
+
+PRODUCT_DATA = {
+    "name": "GlowBoost Vitamin C Serum",
+    "concentration": "10% Vitamin C",
+    "skin_type": ["Oily", "Combination"],
+    "ingredients": ["Vitamin C", "Hyaluronic Acid"],
+    "benefits": ["Brightening", "Fades dark spots"],
+    "usage": "Apply 2-3 drops in the morning before sunscreen",
+    "side_effects": "Mild tingling for sensitive skin",
+    "price": 699
+}
+
+
+@pytest.fixture
+def make_product():
+    """Factory for valid Products; keyword arguments override PRODUCT_DATA"""
+    def make(**overrides):
+        return Product(**{**PRODUCT_DATA, **overrides})
+    return make
\ No newline at end of file
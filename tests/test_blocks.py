@@ -4,54 +4,275 @@ Unit tests for logic blocks
 import sys
 import os
 
+import pytest
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from src.agents.base_agent import AgentInput
+from src.agents.comparison_agent import ComparisonAgent
+from src.agents.parser_agent import DataParserAgent
+from src.agents.validation_agent import ValidationAgent
+from src.core.exceptions import ValidationError
+from src.core.models import ProductBatch, ProductFeatures
+from src.core.rules import default_rule_set
 from src.logic_blocks.benefits_block import generate_benefits_block
 from src.logic_blocks.usage_block import generate_usage_block
-from src.logic_blocks.price_block import generate_price_block
+from src.logic_blocks.price_block import generate_price_block, generate_price_block_batch
+from src.logic_blocks.comparison_block import generate_comparison_block
+from src.logic_blocks.comparison_matrix import ComparisonMatrix, WINNER_A
+from src.logic_blocks.multi_comparison_block import generate_multi_comparison_block
+from src.logic_blocks.safety_block import generate_safety_block
+from src.output.html_renderer import render_html
+from src.templates.faq_template import categorize_questions, faq_template
+from src.templates.skeleton import PageSkeleton, Slot
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.validator import validate_product_data
 
 class TestBenefitsBlock:
-    def test_benefits_block_formatting(self):
+    def test_benefits_block_formatting(self, make_product):
         """Test benefits block generates correct format"""
-        mock_product = type('Product', (), {
-            'benefits': ['Brightening', 'Hydration'],
-            'name': 'Test Serum'
-        })()
+        product = make_product(benefits=['Brightening', 'Hydration'], name='Test Serum')
         
-        result = generate_benefits_block(mock_product)
+        result = generate_benefits_block(product)
         
         assert 'benefits_list' in result
-        assert 'benefits_description' in result
+        assert 'benefits_summary' in result
         assert len(result['benefits_list']) == 2
-        assert 'Brightening' in result['benefits_description']
+        assert 'Brightening' in result['benefits_summary']
 
 class TestUsageBlock:
-    def test_usage_block_structure(self):
+    def test_usage_block_structure(self, make_product):
         """Test usage block has correct structure"""
-        mock_product = type('Product', (), {
-            'usage': 'Apply 2-3 drops daily',
-            'name': 'Test Serum'
-        })()
+        product = make_product(usage='Apply 2-3 drops daily', name='Test Serum')
         
-        result = generate_usage_block(mock_product)
+        result = generate_usage_block(product)
         
-        assert 'instructions' in result
+        assert 'basic_instruction' in result
         assert 'frequency' in result
         assert 'best_time' in result
-        assert 'note' in result
-        assert result['instructions'] == 'Apply 2-3 drops daily'
+        assert 'precautions' in result
+        assert result['basic_instruction'] == 'Apply 2-3 drops daily'
 
 class TestPriceBlock:
-    def test_price_analysis_categories(self):
+    def test_price_analysis_categories(self, make_product):
         """Test price block categorizes correctly"""
-        mock_product = type('Product', (), {
-            'price': 699
-        })()
+        product = make_product(price=699)
+        
+        result = generate_price_block(product)
+        
+        assert 'value_analysis' in result
+        assert 'price_details' in result
+        assert result['price_details']['currency'] == 'INR'
+        assert result['price_details']['category'] == 'Mid-range'
+        assert 'value_assessment' in result['value_analysis']
+
+class TestProductFeatures:
+    def test_features_derived_from_product(self, make_product):
+        """Test features hold joined strings, sets, counts and flags"""
+        features = ProductFeatures.from_product(make_product())
+        
+        assert features.skin_type_text == "Oily, Combination"
+        assert features.ingredient_set == {"vitamin c", "hyaluronic acid"}
+        assert features.ingredients_count == 2
+        assert features.mentions_drops and features.mentions_morning
+        assert not features.mentions_night
+        assert features.mentions_tingling and features.mentions_sensitive
+        assert not features.mentions_irritation
+    
+    def test_blocks_accept_precomputed_features(self, make_product):
+        """Test blocks give the same output with shared features"""
+        product = make_product(usage="Use morning and night", side_effects="Rare irritation")
+        features = ProductFeatures.from_product(product)
+        
+        assert generate_usage_block(product, features) == generate_usage_block(product)
+        assert generate_safety_block(product, features) == generate_safety_block(product)
+        assert generate_price_block(product, features) == generate_price_block(product)
+        assert generate_usage_block(product, features)["frequency"] == "Twice daily (morning and night)"
+
+class TestPriceBlockBatch:
+    def test_batch_matches_scalar_block(self, make_product):
+        """Test vectorized price analysis equals the per-product block"""
+        pytest.importorskip("numpy")
+        
+        products = [
+            make_product(price=price, ingredients=["A"] * n_ing, benefits=["B"] * n_ben)
+            for price, n_ing, n_ben in [(299, 1, 1), (699, 2, 2), (1000, 3, 4), (1999, 4, 2), (4000, 1, 1), (6500, 8, 6)]
+        ]
+        
+        batch = generate_price_block_batch(
+            [p.price for p in products],
+            [len(p.ingredients) for p in products],
+            [len(p.benefits) for p in products]
+        )
+        
+        for i, product in enumerate(products):
+            scalar = generate_price_block(product)
+            assert batch["category"][i] == scalar["price_details"]["category"]
+            assert batch["value_score"][i] == scalar["value_analysis"]["value_score"]
+            assert batch["value_assessment"][i] == scalar["value_analysis"]["value_assessment"]
+            assert batch["ingredients_per_rupee"][i] == scalar["value_analysis"]["ingredients_per_rupee"]
+            assert batch["competitiveness"][i] == scalar["market_position"]["competitiveness"]
+            assert batch["cost_per_use"][i] == scalar["cost_analysis"]["cost_per_use"]
+            assert batch["daily_cost"][i] == scalar["cost_analysis"]["daily_cost"]
+
+class TestComparisonMatrix:
+    def test_pair_block_matches_two_product_comparison(self, make_product):
+        """Test lazily materialized pair blocks equal the two-product block"""
+        products = [
+            make_product(),
+            make_product(name="RadiantX Serum", ingredients=["Vitamin C", "Glycerin"], price=899),
+            make_product(name="Night Repair", ingredients=["Retinol"], benefits=["Anti-aging"], price=1299)
+        ]
+        matrix = ComparisonMatrix(products)
+        
+        for i in range(len(products)):
+            for j in range(len(products)):
+                expected = generate_comparison_block(products[i], products[j])
+                actual = matrix.block(i, j)
+                assert sorted(actual["ingredients_analysis"]["common_ingredients"]) == sorted(expected["ingredients_analysis"]["common_ingredients"])
+                assert sorted(actual["benefits_analysis"]["unique_to_b"]) == sorted(expected["benefits_analysis"]["unique_to_b"])
+                assert actual["summary"] == expected["summary"]
+    
+    def test_all_pairs_metrics(self, make_product):
+        """Test N x N count and winner matrices"""
+        pytest.importorskip("numpy")
+        
+        products = [
+            make_product(),
+            make_product(name="RadiantX Serum", ingredients=["Vitamin C"], price=899)
+        ]
+        matrix = ComparisonMatrix(products)
         
-        result = generate_price_block(mock_product)
+        assert matrix.common_ingredients[0, 1] == 1
+        assert matrix.unique_ingredients[0, 1] == 1
+        assert matrix.common_benefits[0, 0] == 2
+        assert matrix.total_scores[0, 1] == matrix.block(0, 1)["summary"]["total_score_a"]
+        assert matrix.overall_winner[0, 1] == WINNER_A
+
+class TestMultiComparison:
+    def test_feature_winners_match_two_product_rules(self, make_product):
+        """Test N-way winners, ties, ranking and overlap come from one columnar pass"""
+        products = [
+            make_product(),
+            make_product(name="RadiantX Serum", ingredients=["Vitamin C", "Glycerin"], price=899),
+            make_product(name="Night Repair", ingredients=["Retinol"], benefits=["Anti-aging"], price=1299)
+        ]
+        block = generate_multi_comparison_block(products)
+        
+        assert block["feature_winners"]["price"] == ["GlowBoost Vitamin C Serum"]
+        assert block["feature_winners"]["ingredients_count"] == ["GlowBoost Vitamin C Serum", "RadiantX Serum"]
+        assert block["feature_winners"]["high_concentration"] == []
+        assert block["ranking"][0]["product"] == block["summary"]["overall_winner"] == "GlowBoost Vitamin C Serum"
+        assert block["ingredients_analysis"]["unique_ingredients"]["RadiantX Serum"] == ["glycerin"]
+        assert block["ingredients_analysis"]["common_ingredients"] == []
+        for too_few in (products[:1], products[:2]):
+            with pytest.raises(ValueError):
+                generate_multi_comparison_block(too_few)
+        with pytest.raises(ValueError):
+            ComparisonAgent().compare_products(products[:2])
+    
+    def test_page_table_is_built_column_wise(self, make_product):
+        """Test the N-way page has one value per product in every row"""
+        products = [make_product(name=f"Serum {i}", price=500 + 100 * i) for i in range(5)]
+        page = ComparisonAgent().compare_products(products)
+        table = page["content"]["comparison_table"]
+        
+        assert table["headers"] == ["Feature", *[p.name for p in products], "Winner"]
+        assert all(len(row["values"]) == 5 for row in table["rows"])
+        assert table["rows"][0]["winner"] == "Serum 0"
+        assert page["content"]["metadata"]["products_compared"] == [p.name for p in products]
+        assert render_html(page).count("<td>₹") == 5
+
+class TestValidationRules:
+    def test_batch_matches_single_product_validation(self, make_product):
+        """Test the column-wise batch evaluator agrees with per-product validation"""
+        records = [
+            make_product().to_dict(),
+            {**make_product().to_dict(), "price": 0, "skin_type": ["Oily", "Scaly"]},
+            {"name": "Broken", "ingredients": ["Vitamin C", 3], "benefits": [], "price": "cheap"},
+            {**make_product().to_dict(), "price": None}
+        ] * 30
+        rules = default_rule_set()
+        batch_results = rules.validate_batch(ProductBatch.from_records(records))
+        
+        assert batch_results == [rules.validate(record) for record in records]
+        assert batch_results[0].is_valid and batch_results[0].score == 100.0
+        assert batch_results[1].errors == ["Price must be between 1 and 100000"]
+        assert batch_results[1].warnings == ["Unrecognised skin type"]
+        assert "Price must be a number" in batch_results[2].errors
+        assert "Price must be between 1 and 100000" not in batch_results[2].errors
+        assert batch_results[3].errors == ["Price must be a number"]
+        
+        # Without the string price the column converts to floats; None must still only fail the type check
+        numeric_records = [record for record in records if record["price"] != "cheap"]
+        assert rules.validate_batch(ProductBatch.from_records(numeric_records)) == [rules.validate(record) for record in numeric_records]
+    
+    def test_validation_agent_rejects_invalid_products(self, make_product):
+        """Test ValidationAgent reports results and stops on errors in strict mode"""
+        result = ValidationAgent(strict=True).process(AgentInput(data={"product": make_product(concentration="5% Niacinamide")}))
+        assert result["validation_passed"] is True
+        assert result["details"]["warnings"] == ["Concentration does not name any listed ingredient"]
+        
+        lenient = ValidationAgent(strict=False).process(AgentInput(data={"product": make_product(benefits=[])}))
+        assert lenient["validation_passed"] is False
+        with pytest.raises(ValidationError):
+            ValidationAgent(strict=True).process(AgentInput(data={"product": make_product(benefits=[])}))
+    
+    def test_partial_dicts_check_only_present_fields(self):
+        """Test validate_product_data only applies rules whose fields are given"""
+        assert validate_product_data({})[0] is True
+        assert validate_product_data({"price": 699})[0] is True
+        assert validate_product_data({"price": 0}) == (False, "Price must be between 1 and 100000")
+        assert validate_product_data({"key_ingredients": []})[0] is False
+    
+    def test_parser_unwraps_orchestrator_context(self):
+        """Test the parser reads the raw product from the orchestrator's "input" key"""
+        raw = {"product_name": "Wrapped Serum", "key_ingredients": ["Vitamin C"], "benefits": ["Glow"], "price": 500}
+        result = DataParserAgent().process(AgentInput(data={"input": raw}))
+        assert result["product"].name == "Wrapped Serum"
+
+class TestKeywordMatcher:
+    def test_matches_substring_semantics(self):
+        """Test overlapping and prefix keywords are all reported"""
+        matcher = KeywordMatcher({"short": ["ab", "b"], "long": ["abc"], "other": ["c"]})
+        
+        assert matcher.labels("abc") == {"short", "long", "other"}
+        assert matcher.labels("xb") == {"short"}
+        assert matcher.first_label("zzabc") == "short"
+        assert matcher.first_label("zz", "none") == "none"
+        assert matcher.labels_batch(["ab", "", "c"]) == [{"short"}, set(), {"other"}]
+    
+    def test_question_categories_follow_priority(self):
+        """Test FAQ categorization keeps the first matching category"""
+        questions = ["What is the price?", "How to apply safely?", "Is it safe?", "Serum vs cream", "Anything else"]
+        assert categorize_questions(questions) == ["informational", "usage", "safety", "comparison", "general"]
+
+class TestFaqTemplate:
+    def test_indexes_built_for_large_faq(self):
+        """Test navigation indexes and timestamps for a large FAQ"""
+        qa_pairs = [(f"What is serum {i}?" if i % 2 else f"Is serum {i} safe?", "Answer") for i in range(1000)]
+        faq = faq_template(qa_pairs)
+        
+        by_category = faq["navigation"]["by_category"]
+        assert len(by_category["informational"]) == len(by_category["safety"]) == 500
+        assert by_category["safety"][0] == "faq_001"
+        assert faq["navigation"]["by_importance"]["high"] == ["faq_001", "faq_002", "faq_003"]
+        assert len(faq["navigation"]["by_importance"]["medium"]) == 997
+        assert {item["last_updated"] for item in faq["questions"]} == {faq["metadata"]["generated_at"]}
+
+class TestPageSkeleton:
+    def test_render_fills_slots_and_shares_constants(self):
+        """Test slots are filled per render while constant subtrees are shared"""
+        skeleton = PageSkeleton({
+            "title": Slot("title"),
+            "items": [Slot("first"), "fixed"],
+            "footer": {"links": ["a", "b"]}
+        })
+        first = skeleton.render(title="A", first=1)
+        second = skeleton.render(title="B", first=2)
         
-        assert 'value' in result
-        assert 'currency' in result
-        assert 'category' in result
-        assert 'value_verdict' in result
-        assert result['currency'] == 'INR'
\ No newline at end of file
+        assert first == {"title": "A", "items": [1, "fixed"], "footer": {"links": ["a", "b"]}}
+        assert second["title"] == "B" and second["items"] == [2, "fixed"]
+        assert first["footer"] is second["footer"]
+        with pytest.raises(ValueError):
+            skeleton.render(title="C")
@@ -0,0 +1,236 @@
+"""
+Unit tests for catalog-wide indexes and statistics
+"""
+import sys
+import os
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents.base_agent import AgentInput
+from src.agents.comparison_agent import ComparisonAgent
+from src.catalog.index import CatalogIndex, _Posting
+from src.catalog.keywords import KeywordStatistics
+from src.catalog.market_stats import KLLSketch, MarketStatistics
+from src.catalog.similarity import CompetitorIndex
+from src.core.config import ConfigManager
+from src.core.orchestrator import Orchestrator
+from src.logic_blocks.price_block import generate_price_block, generate_price_block_batch
+from src.logic_blocks.seo_block import generate_seo_metadata
+
+
+@pytest.fixture
+def catalog(make_product):
+    return [
+        make_product(name="Bright C", ingredients=["Vitamin C", "Hyaluronic Acid", "Vitamin E"], benefits=["Brightening", "Fades dark spots"], price=749),
+        make_product(name="Bright C Lite", ingredients=["Vitamin C", "Hyaluronic Acid"], benefits=["Brightening", "Fades dark spots"], price=5000),
+        make_product(name="Retinol Night", ingredients=["Retinol", "Squalane"], benefits=["Anti-aging"], price=699),
+        make_product(name="Niacin Clear", ingredients=["Niacinamide", "Zinc"], benefits=["Oil control", "Pore care"], price=599, skin_type=["Oily", "Combination"]),
+        make_product(name="Hydra Gel", ingredients=["Hyaluronic Acid", "Glycerin"], benefits=["Hydration"], price=399, skin_type=["Dry"])
+    ]
+
+@pytest.fixture
+def query(make_product):
+    return make_product(name="GlowBoost", ingredients=["Vitamin C", "Hyaluronic Acid"], benefits=["Brightening", "Fades dark spots"], price=699)
+
+class TestCompetitorIndex:
+    def test_top_k_prefers_similar_products_in_price_band(self, catalog, query):
+        """Test the most similar in-band product is selected"""
+        index = CompetitorIndex.from_products(catalog)
+        matches = index.top_k(query, k=3)
+        
+        names = [product.name for product, _ in matches]
+        assert names[0] == "Bright C"
+        assert "Bright C Lite" not in names  # identical sets but outside the price band
+        assert all(0 < similarity <= 1 for _, similarity in matches)
+    
+    def test_comparison_agent_uses_catalog_competitor(self, catalog, query):
+        """Test ComparisonAgent compares against the selected catalog product"""
+        agent = ComparisonAgent(competitor_index=CompetitorIndex.from_products(catalog))
+        result = agent.process(AgentInput(data={"product": query}))
+        
+        assert result["metadata"]["compared_products"] == ["GlowBoost", "Bright C"]
+        assert result["metadata"]["competitor_source"] == "catalog"
+    
+    def test_comparison_agent_falls_back_to_configured_product(self, query):
+        """Test the fictional product comes from settings when no catalog is given"""
+        result = ComparisonAgent().process(AgentInput(data={"product": query}))
+        configured = ConfigManager().get("agents.comparison_agent.fictional_product", {})
+        
+        assert result["metadata"]["competitor_source"] == "fictional"
+        assert result["metadata"]["compared_products"][1] == configured.get("name", "RadiantX Serum")
+    
+    def test_orchestrator_from_catalog_compares_against_catalog(self, catalog, query):
+        """Test the orchestrator's ComparisonAgent uses the catalog's competitor index"""
+        result = Orchestrator.from_catalog(catalog).run({**query.to_dict(), "usage": "Apply daily"})
+        
+        assert result.success, result.errors
+        assert result.outputs["comparison"]["metadata"]["compared_products"] == ["GlowBoost", "Bright C"]
+        assert Orchestrator.from_catalog().agents["comparison"].competitor_index is None
+
+class TestCatalogIndex:
+    def test_query_matches_brute_force_scan(self, catalog):
+        """Test combined ingredient, skin type and price filters"""
+        index = CatalogIndex(catalog)
+        matches = index.query(ingredients=["hyaluronic acid"], skin_types=["Oily"], max_price=999)
+        
+        expected = [
+            product for product in catalog
+            if "Hyaluronic Acid" in product.ingredients and "Oily" in product.skin_type and product.price <= 999
+        ]
+        assert matches == expected
+        assert [product.name for product in matches] == ["Bright C"]
+    
+    def test_selection_algebra(self, catalog):
+        """Test &, |, - and ~ over index selections"""
+        index = CatalogIndex(catalog)
+        vitamin_c = index.ingredient("Vitamin C")
+        affordable = index.price_range(min_price=400, max_price=749)
+        
+        assert [p.name for p in (vitamin_c & affordable).products()] == ["Bright C"]
+        assert [p.name for p in (vitamin_c - affordable).products()] == ["Bright C Lite"]
+        assert len(vitamin_c | index.benefit("Hydration")) == 3
+        assert len(~vitamin_c) + len(vitamin_c) == len(catalog)
+        assert not index.ingredient("Unknown")
+    
+    def test_postings_sized_for_final_catalog(self, make_product):
+        """Test posting representation follows the loaded catalog size, not insertion order"""
+        # Retinol only appears in the first products: dense while loading, sparse in the final catalog
+        catalog = [
+            make_product(name=f"Serum {i}", ingredients=["Vitamin C", "Retinol"] if i < 3 else ["Vitamin C"], benefits=["Brightening"], price=500 + i)
+            for i in range(200)
+        ]
+        index = CatalogIndex(catalog)
+        
+        assert index._postings["ingredients"]["retinol"].bitmap is None
+        assert index._postings["ingredients"]["vitamin c"].positions is None
+        assert index.ingredient("Retinol").positions() == [0, 1, 2]
+        
+        # Products added later are picked up by the next lookup
+        position = index.add(make_product(name="Late Retinol", ingredients=["Retinol"], benefits=["Anti-aging"], price=900))
+        assert index.ingredient("Retinol").positions() == [0, 1, 2, position]
+        assert len(index.ingredient("Vitamin C")) == 200
+    
+    def test_sparse_queries_match_scan_without_bitmaps(self, make_product, monkeypatch):
+        """Test sparse postings are intersected directly and late prices are sorted in"""
+        rng = random.Random(3)
+        ingredients = ["Vitamin C", "Retinol", "Niacinamide", "Zinc", "Squalane"]
+        catalog = [
+            make_product(name=f"Serum {i}", ingredients=["Glycerin"] + rng.sample(ingredients, 2) if i % 50 == 0 else ["Glycerin"], price=rng.randint(100, 2000))
+            for i in range(500)
+        ]
+        index = CatalogIndex(catalog)
+        late = make_product(name="Late", ingredients=["Glycerin", "Retinol", "Zinc"], price=150)
+        index.add(late)
+        catalog.append(late)
+        
+        monkeypatch.setattr(_Posting, "to_bits", lambda *args: pytest.fail("sparse query expanded a posting"))
+        for first in ingredients:
+            for second in ingredients:
+                matches = index.query(ingredients=[first, second, "Glycerin"], min_price=120, max_price=1500)
+                assert matches == [
+                    product for product in catalog
+                    if {first, second} <= set(product.ingredients) and 120 <= product.price <= 1500
+                ]
+        monkeypatch.undo()
+        assert index.price_range(max_price=150).products() == [product for product in catalog if product.price <= 150]
+
+
+class TestMarketStatistics:
+    def test_sketch_quantiles_and_merge(self):
+        """Test KLL quantiles stay close to exact ranks, also after merging"""
+        rng = random.Random(7)
+        values = [rng.uniform(100, 3000) for _ in range(20000)]
+        left, right = KLLSketch(k=100), KLLSketch(k=100)
+        for value in values[:10000]:
+            left.update(value)
+        for value in values[10000:]:
+            right.update(value)
+        merged = left.merge(right)
+        
+        ordered = sorted(values)
+        assert merged.count == len(values)
+        assert merged.min == ordered[0] and merged.max == ordered[-1]
+        for q in (0.25, 0.5, 0.75):
+            rank = ordered.index(merged.quantile(q)) / len(values)
+            assert abs(rank - q) < 0.03
+    
+    def test_price_block_uses_segment_median(self, make_product, query):
+        """Test the price block positions products against their segment"""
+        catalog = [
+            make_product(name=f"Serum {price}", ingredients=["Vitamin C"], benefits=["Brightening"], price=price)
+            for price in (400, 500, 600, 700, 800)
+        ]
+        stats = MarketStatistics.from_products(catalog, min_samples=3)
+        position = generate_price_block(query, market_stats=stats)["market_position"]
+        
+        assert position["market_average"] == 600
+        assert position["market_segment"] == "vitamin c 10-20%"
+        assert position["price_percentiles"] == {"p25": 500, "median": 600, "p75": 700}
+        assert position["competitiveness"] == "Competitive"
+        assert generate_price_block(catalog[0], market_stats=stats)["market_position"]["competitiveness"] == "Value priced"
+    
+    def test_batch_matches_scalar_block_with_segments(self, make_product):
+        """Test the vectorized price block positions rows against the same segments as the scalar block"""
+        pytest.importorskip("numpy")
+        catalog = [
+            make_product(name=f"Serum {price}", concentration="10% Vitamin C", price=price)
+            for price in (400, 500, 600, 700, 800, 1500)
+        ] + [
+            make_product(name=f"Retinol {price}", concentration="1% Retinol", ingredients=["Retinol"], price=price)
+            for price in (900, 2500)
+        ]
+        stats = MarketStatistics.from_products(catalog, min_samples=3)
+        batch = generate_price_block_batch(
+            [p.price for p in catalog],
+            [len(p.ingredients) for p in catalog],
+            [len(p.benefits) for p in catalog],
+            market_stats=stats,
+            products=catalog
+        )
+        
+        for i, product in enumerate(catalog):
+            scalar = generate_price_block(product, market_stats=stats)["market_position"]
+            assert batch["market_average"][i] == scalar["market_average"]
+            assert batch["price_difference"][i] == scalar["price_difference"]
+            assert batch["position"][i] == scalar["position"]
+            assert batch["competitiveness"][i] == scalar["competitiveness"]
+        assert {"Value priced", "Competitive", "Premium priced"} <= set(batch["competitiveness"].tolist())
+        with pytest.raises(ValueError):
+            generate_price_block_batch([400], [1], [1], market_stats=stats)
+
+
+class TestKeywordStatistics:
+    def test_catalog_rare_terms_rank_first(self, catalog, query):
+        """Test TF-IDF promotes terms that are rare across the catalog"""
+        stats = KeywordStatistics.from_products(catalog + [query])
+        keywords = generate_seo_metadata(query.to_dict(), stats)["keywords"]
+        
+        assert keywords[0] == "glowboost"
+        assert keywords.index("vitamin c") < keywords.index("hyaluronic acid")  # 3 vs 4 documents
+        assert keywords == generate_seo_metadata(query.to_dict(), stats)["keywords"]
+    
+    def test_incremental_counts_match_batch(self, catalog):
+        """Test adding and merging products matches counting the catalog at once"""
+        incremental = KeywordStatistics.from_products(catalog[:2])
+        incremental.merge(KeywordStatistics.from_products(catalog[2:]))
+        batch = KeywordStatistics.from_products(catalog)
+        
+        assert incremental.documents == batch.documents == len(catalog)
+        assert incremental.document_frequency == batch.document_frequency
+        assert batch.document_frequency["hyaluronic acid"] == 3
+    
+    def test_orchestrator_pages_use_catalog_statistics(self, make_product, catalog, query):
+        """Test the orchestrator builds catalog statistics once and every page reads them"""
+        products = catalog + [make_product(name=f"C Serum {i}", price=550 + 50 * i) for i in range(5)]
+        orchestrator = Orchestrator.from_catalog(products)
+        faq_agent, product_agent = orchestrator.agents["faq"], orchestrator.agents["product"]
+        assert faq_agent.keyword_stats is product_agent.keyword_stats
+        assert faq_agent.market_stats is product_agent.market_stats
+        
+        result = orchestrator.run({**query.to_dict(), "usage": "Apply daily"})
+        page = result.outputs["product_page"]
+        assert page["metadata"]["seo"]["keywords"] == generate_seo_metadata(query.to_dict(), KeywordStatistics.from_products(products))["keywords"]
+        assert page["content"]["page_structure"]["pricing"]["content"]["market_position"]["sample_size"] == len(products)
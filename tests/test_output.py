@@ -0,0 +1,588 @@
+"""
+Unit tests for output encoding and writers
+"""
+import sys
+import os
+import gzip
+import json
+import lzma
+import sqlite3
+import stat
+from datetime import datetime
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents.base_agent import AgentInput
+from src.agents.comparison_agent import ComparisonAgent
+from src.agents.faq_agent import FAQAgent
+from src.agents.product_page_agent import ProductPageAgent
+from src.core.models import PageOutput
+from src.logic_blocks.price_block import generate_price_block
+from src.logic_blocks.safety_block import generate_safety_block
+from src.logic_blocks.usage_block import generate_usage_block
+from src.output.bulk_writer import ShardedPageWriter, load_manifest, read_shard_page
+from src.output.compressed_writer import BlockCompressedWriter, BlockCompressedReader
+from src.output.html_renderer import render_html
+from src.output.page_store import PageStore, PageStoreWriter, DATA_NAME
+from src.output.page_validator import validate_outputs
+from src.output.sitemap import generate_feeds, iter_shard_pages
+from src.output.sqlite_sink import SQLitePageSink
+from src.templates.faq_template import faq_template
+from src.templates.locales import MessageCatalog, get_locale
+from src.templates.product_template import product_template
+from src.templates.schemas import resolve_schema
+from src.utils import atomic_writer, codec as codec_module
+from src.utils.atomic_writer import OutputManifest, atomic_write, MANIFEST_NAME
+from src.utils.clock import RunClock, use_run_clock, utc_timestamp, get_run_clock
+from src.utils.codec import JsonCodec
+from src.utils.file_handler import save_output, load_json
+from src.utils.fragments import FrozenDict, FrozenList, freeze, thaw, encode_json, canonical_json
+
+
+class TestFragments:
+    def test_encoding_matches_json_dumps(self):
+        """Test spliced fragments encode exactly like plain data"""
+        shared = freeze({"steps": ["Cleanse", "Apply ₹ drops"], "ratings": {"safe": True, "score": 4.5}})
+        page = {"title": "Serum", "blocks": [shared, {"nested": shared}], "empty": {}, "none": None}
+        
+        for options in (dict(indent=2, ensure_ascii=False), dict(indent=None, ensure_ascii=True), dict(indent=4, ensure_ascii=False, sort_keys=True)):
+            # Encode twice so the second pass is served from the fragment cache
+            assert encode_json(page, **options) == json.dumps(page, **options).encode("utf-8")
+            assert encode_json(page, **options) == json.dumps(page, **options).encode("utf-8")
+    
+    def test_fragments_are_immutable(self):
+        """Test shared fragments reject modification"""
+        shared = freeze({"items": ["a", "b"]})
+        assert isinstance(shared, FrozenDict) and isinstance(shared["items"], FrozenList)
+        with pytest.raises(TypeError):
+            shared["new"] = 1
+        with pytest.raises(TypeError):
+            shared["items"].append("c")
+    
+    def test_save_output_writes_block_fragments(self, tmp_path, make_product):
+        """Test save_output round-trips blocks that contain shared fragments"""
+        product = make_product(name="Serum", skin_type=["Oily"], ingredients=["Vitamin C"], benefits=["Brightening"], usage="Apply daily", side_effects="None")
+        block = generate_safety_block(product)
+        path = tmp_path / "safety.json"
+        
+        assert save_output(str(path), block)
+        assert path.read_bytes() == json.dumps(block, indent=2, ensure_ascii=False).encode("utf-8")
+        assert load_json(str(path)) == block
+    
+    def test_block_fragments_are_read_only_until_thawed(self, make_product):
+        """Test block outputs share read-only fragments and thaw() gives an editable copy"""
+        product = make_product()
+        price = generate_price_block(product)
+        with pytest.raises(TypeError):
+            price["payment_options"].append("Wallet")
+        with pytest.raises(TypeError):
+            generate_safety_block(product)["first_aid_measures"]["skin_contact"] = "Rinse"
+        with pytest.raises(TypeError):
+            generate_usage_block(product)["results_timeline"].update({})
+        
+        editable = thaw(price)
+        editable["payment_options"].append("Wallet")
+        assert editable["payment_options"][-1] == "Wallet"
+        assert "Wallet" not in generate_price_block(product)["payment_options"]
+        assert editable == {**price, "payment_options": [*price["payment_options"], "Wallet"]}
+
+
+def _page_size(page):
+    return len(json.dumps(page, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
+class TestCompactSchema:
+    def test_compact_product_page_lists_sections_once(self, make_product):
+        """Test compact product pages drop duplicated sections and boilerplate"""
+        context = {"product": make_product()}
+        full = ProductPageAgent(schema="full").process(AgentInput(data=dict(context)))["content"]
+        compact = ProductPageAgent(schema="compact").process(AgentInput(data=dict(context)))["content"]
+        
+        assert compact["metadata"]["template_version"] == "2.0.0"
+        assert compact["content"] == full["content"]
+        assert all("content" not in entry for entry in compact["page_structure"])
+        assert {entry["section"] for entry in compact["page_structure"]} <= set(compact["content"])
+        assert "performance" not in compact and "accessibility" not in compact
+        assert _page_size(compact) <= 0.6 * _page_size(full)
+    
+    def test_compact_faq_and_comparison(self, make_product):
+        """Test compact FAQ and comparison pages omit repeated and static sections"""
+        faq = faq_template([("What is it?", "A serum"), ("Is it safe?", "Yes")], schema="compact")
+        assert "by_category" not in faq["navigation"]
+        assert faq["categories"][0]["question_ids"] == ["faq_001"]
+        
+        comparison = ComparisonAgent(schema="compact").process(AgentInput(data={"product": make_product()}))["content"]
+        assert "methodology" not in comparison and "interactive_features" not in comparison
+        assert comparison["metadata"]["schema"] == "compact"
+    
+    def test_unknown_schema_rejected(self):
+        """Test an unknown schema name raises ValueError"""
+        with pytest.raises(ValueError):
+            resolve_schema("tiny")
+
+
+
+class TestDeterministicOutput:
+    def test_fixed_clock_renders_identical_bytes(self, make_product):
+        """Test two runs under a fixed clock produce byte-identical canonical output"""
+        renders = []
+        for _ in range(2):
+            with use_run_clock(RunClock.fixed()):
+                product = ProductPageAgent(schema="full").process(AgentInput(data={"product": make_product()}))["content"]
+                comparison = ComparisonAgent(schema="full").process(AgentInput(data={"product": make_product()}))["content"]
+            renders.append(canonical_json([product, comparison]))
+        
+        assert renders[0] == renders[1]
+        assert product["metadata"]["generated_at"] == "1970-01-01T00:00:00"
+    
+    def test_canonical_json_is_compact_and_sorted(self):
+        """Test canonical encoding sorts keys and drops whitespace"""
+        data = {"b": [1, freeze({"y": 2, "x": "é"})], "a": None}
+        assert canonical_json(data) == json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    
+    def test_run_clock_scopes_timestamps(self):
+        """Test the run clock applies only inside its with-block"""
+        with use_run_clock(RunClock.fixed(datetime(2024, 5, 1))):
+            assert utc_timestamp() == "2024-05-01T00:00:00"
+            assert get_run_clock().deterministic
+        assert not get_run_clock().deterministic
+        assert utc_timestamp() != "2024-05-01T00:00:00"
+
+
+class TestJsonCodec:
+    def test_stdlib_backend_matches_json_dumps(self):
+        """Test the stdlib codec encodes pretty and compact output like json.dumps"""
+        page = {"title": "Serum ₹", "blocks": [freeze({"b": 1, "a": [True, None]})], "score": 4.5}
+        pretty = JsonCodec(indent=2, backend="stdlib")
+        compact = JsonCodec(indent=None, backend="stdlib")
+        ascii_codec = JsonCodec(indent=4, ensure_ascii=True, backend="stdlib")
+        
+        assert pretty.encode(page) == json.dumps(page, indent=2, ensure_ascii=False).encode("utf-8")
+        assert compact.encode(page, sort_keys=True) == json.dumps(page, separators=(",", ":"), ensure_ascii=False, sort_keys=True).encode("utf-8")
+        assert ascii_codec.encode(page) == json.dumps(page, indent=4).encode("ascii")
+        assert pretty.decode(compact.encode(page)) == page
+    
+    def test_backend_selection(self):
+        """Test orjson is used only when installed and able to match the settings"""
+        assert JsonCodec(indent=4).backend == "stdlib"
+        assert JsonCodec(ensure_ascii=True).backend == "stdlib"
+        expected = "orjson" if codec_module.orjson is not None else "stdlib"
+        assert JsonCodec(indent=2).backend == expected
+        with pytest.raises(ValueError):
+            JsonCodec(backend="ujson")
+    
+    def test_save_output_honours_codec(self, tmp_path):
+        """Test save_output writes with the given codec and load_json reads it back"""
+        path = tmp_path / "page.json"
+        data = {"name": "Serum", "tags": ["a", "b"]}
+        assert save_output(str(path), data, codec=JsonCodec(indent=None, backend="stdlib"))
+        assert path.read_bytes() == b'{"name":"Serum","tags":["a","b"]}'
+        assert load_json(str(path)) == data
+        
+        # A codec built to sort keys keeps sorting unless sort_keys is passed explicitly
+        assert save_output(str(path), {"b": 1, "a": 2}, codec=JsonCodec(indent=None, sort_keys=True, backend="stdlib"))
+        assert path.read_bytes() == b'{"a":2,"b":1}'
+        assert save_output(str(path), {"b": 1, "a": 2}, codec=JsonCodec(indent=None, sort_keys=True, backend="stdlib"), sort_keys=False)
+        assert path.read_bytes() == b'{"b":1,"a":2}'
+
+
+class TestAtomicWriter:
+    def test_unchanged_content_is_not_rewritten(self, tmp_path):
+        """Test identical payloads skip the write and changed ones replace the file"""
+        path = tmp_path / "out" / "page.json"
+        assert atomic_write(path, b'{"a":1}')
+        mtime = path.stat().st_mtime_ns
+        assert not atomic_write(path, b'{"a":1}')
+        assert path.stat().st_mtime_ns == mtime
+        assert atomic_write(path, b'{"a":2}')
+        assert path.read_bytes() == b'{"a":2}'
+        assert [p.name for p in path.parent.iterdir()] == ["page.json"]
+    
+    def test_manifest_tracks_hashes(self, tmp_path):
+        """Test the manifest skips unchanged files and notices outside edits"""
+        manifest = OutputManifest.for_directory(tmp_path)
+        path = tmp_path / "faq.json"
+        assert atomic_write(path, b"one", manifest)
+        manifest.save()
+        
+        reloaded = OutputManifest.for_directory(tmp_path)
+        assert not atomic_write(path, b"one", reloaded)
+        path.write_bytes(b"edited")
+        assert atomic_write(path, b"one", reloaded)
+        assert (tmp_path / MANIFEST_NAME).exists()
+    
+    def test_replacement_keeps_file_permissions(self, tmp_path):
+        """Test new files get the same mode as open() creates and replaced files keep theirs"""
+        plain = tmp_path / "plain.json"
+        plain.write_bytes(b"{}")
+        created = tmp_path / "new.json"
+        atomic_write(created, b"{}")
+        assert stat.S_IMODE(created.stat().st_mode) == stat.S_IMODE(plain.stat().st_mode)
+        
+        existing = tmp_path / "existing.json"
+        existing.write_bytes(b"old")
+        os.chmod(existing, 0o640)
+        atomic_write(existing, b"new")
+        assert stat.S_IMODE(existing.stat().st_mode) == 0o640
+    
+    def test_umask_read_on_first_write(self, tmp_path, monkeypatch):
+        """Test the umask is read lazily, once, instead of at import"""
+        calls = []
+        real_umask = os.umask
+        monkeypatch.setattr(atomic_writer, "_umask", None)
+        monkeypatch.setattr(os, "umask", lambda mask: calls.append(mask) or real_umask(mask))
+        
+        atomic_write(tmp_path / "a.json", b"{}")
+        atomic_write(tmp_path / "b.json", b"{}")
+        assert len(calls) == 2  # set and restored, by the first write only
+        assert atomic_writer._umask is not None
+    
+    def test_failed_write_keeps_previous_file(self, tmp_path, monkeypatch):
+        """Test a crash before the rename leaves the old file intact and no temp files"""
+        path = tmp_path / "page.json"
+        path.write_bytes(b"old")
+        
+        def crash(*args):
+            raise OSError("disk full")
+        
+        monkeypatch.setattr(os, "replace", crash)
+        with pytest.raises(OSError):
+            atomic_write(path, b"new")
+        assert path.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["page.json"]
+
+
+class TestShardedPageWriter:
+    def test_pages_round_trip_through_manifest(self, tmp_path):
+        """Test every page can be read back from the shard and offset in the manifest"""
+        pages = {f"p{i}": {"title": f"Serum {i}", "body": "x" * (i % 7)} for i in range(200)}
+        with ShardedPageWriter(tmp_path, max_shard_bytes=1024, queue_size=8) as writer:
+            for product_id, page in pages.items():
+                writer.write("faq", product_id, page)
+                writer.write("product", product_id, {"faq": page})
+        
+        manifest = load_manifest(tmp_path)
+        assert set(manifest) == set(pages)
+        for product_id, page in pages.items():
+            assert read_shard_page(tmp_path, manifest[product_id]["faq"]) == page
+            assert read_shard_page(tmp_path, manifest[product_id]["product"]) == {"faq": page}
+        
+        shards = sorted((tmp_path / "faq").iterdir())
+        assert len(shards) > 1
+        assert all(shard.stat().st_size <= 1024 for shard in shards)
+    
+    def test_writer_errors_surface_to_caller(self, tmp_path):
+        """Test a page that cannot be encoded fails the next call instead of being lost"""
+        writer = ShardedPageWriter(tmp_path)
+        writer.write("faq", "p1", {"bad": object()})
+        with pytest.raises(RuntimeError):
+            writer.close()
+    
+    def test_rerun_removes_stale_shards(self, tmp_path):
+        """Test a smaller rerun leaves only the shards its manifest lists"""
+        with ShardedPageWriter(tmp_path, max_shard_bytes=256) as writer:
+            for i in range(50):
+                writer.write("faq", f"p{i}", {"body": "x" * 50})
+                writer.write("legacy", f"p{i}", {"body": "y"})
+        (tmp_path / "faq" / "notes.txt").write_text("kept")
+        
+        with ShardedPageWriter(tmp_path, max_shard_bytes=256) as writer:
+            writer.write("faq", "p0", {"body": "z"})
+        
+        manifest = load_manifest(tmp_path)
+        assert sorted(p.name for p in (tmp_path / "faq").iterdir()) == ["faq-00000.jsonl", "notes.txt"]
+        assert not (tmp_path / "legacy").exists()
+        assert read_shard_page(tmp_path, manifest["p0"]["faq"]) == {"body": "z"}
+    
+    def test_rejects_page_types_that_escape_the_directory(self, tmp_path):
+        """Test page types with path separators or '..' are refused"""
+        with ShardedPageWriter(tmp_path) as writer:
+            for page_type in ("../faq", "a/b", "a\\b", "..", ""):
+                with pytest.raises(ValueError):
+                    writer.write(page_type, "p1", {})
+
+
+class TestPageStore:
+    def test_lookup_returns_latest_page(self, tmp_path):
+        """Test pages are found by product id and page type, newest write winning"""
+        with PageStoreWriter(tmp_path) as writer:
+            for i in range(500):
+                writer.put(f"p{i}", "product", {"title": f"Serum {i}"})
+            writer.put("p7", "product", {"title": "Updated"})
+        with PageStoreWriter(tmp_path) as writer:
+            writer.put("p7", "faq", {"questions": []})
+        
+        with PageStore(tmp_path) as store:
+            assert len(store) == 501
+            assert store.get_page("p3", "product") == {"title": "Serum 3"}
+            assert store.get_page("p7", "product") == {"title": "Updated"}
+            assert ("p7", "faq") in store
+            assert store.get("p7", "comparison") is None
+            raw = store.get("p3", "product")
+            assert isinstance(raw, memoryview) and bytes(raw) == b'{"title":"Serum 3"}'
+            raw.release()
+    
+    def test_unindexed_appends_are_invisible(self, tmp_path):
+        """Test records appended after the last index are ignored and later dropped"""
+        with PageStoreWriter(tmp_path) as writer:
+            writer.put("p1", "faq", {"a": 1})
+        size = (tmp_path / DATA_NAME).stat().st_size
+        with open(tmp_path / DATA_NAME, "ab") as f:
+            f.write(b"torn write")
+        
+        with PageStore(tmp_path) as store:
+            assert list(store.keys()) == [("p1", "faq")]
+        PageStoreWriter(tmp_path).close()
+        assert (tmp_path / DATA_NAME).stat().st_size == size
+    
+    def test_corrupt_files_raise_clear_errors(self, tmp_path):
+        """Test truncated or corrupt data fails with ValueError instead of struct.error"""
+        with PageStoreWriter(tmp_path) as writer:
+            writer.put("p1", "faq", {"a": 1})
+            with pytest.raises(ValueError):
+                writer.put("p1\x1fx", "faq", {"a": 2})
+        data = bytearray((tmp_path / DATA_NAME).read_bytes())
+        
+        data[2:6] = (1 << 30).to_bytes(4, "little")  # page length past the end of the file
+        (tmp_path / DATA_NAME).write_bytes(bytes(data))
+        with PageStore(tmp_path) as store:
+            with pytest.raises(ValueError, match="runs past the end"):
+                store.get("p1", "faq")
+        
+        (tmp_path / DATA_NAME).write_bytes(bytes(data[:4]))
+        with pytest.raises(ValueError, match="shorter than its index"):
+            PageStore(tmp_path)
+    
+    def test_import_from_bulk_shards(self, tmp_path):
+        """Test a store can be built from sharded bulk output"""
+        with ShardedPageWriter(tmp_path / "bulk") as bulk:
+            bulk.write("faq", "p1", {"q": "What is it?"})
+        with PageStoreWriter(tmp_path / "store") as writer:
+            writer.add_shards(tmp_path / "bulk")
+        with PageStore(tmp_path / "store") as store:
+            assert store.get_page("p1", "faq") == {"q": "What is it?"}
+
+
+class TestBlockCompressedWriter:
+    def test_blocks_are_seekable_and_stream_valid(self, tmp_path):
+        """Test pages read back by number and the whole file decompresses as one stream"""
+        pages = [{"id": i, "title": f"Serum {i}", "body": "vitamin C " * (i % 20)} for i in range(2000)]
+        for compression, decompress in (("gzip", gzip.decompress), ("lzma", lzma.decompress)):
+            path = tmp_path / f"pages.{compression}"
+            with BlockCompressedWriter(path, compression=compression, block_bytes=4096, workers=3) as writer:
+                for page in pages:
+                    writer.write(page)
+            
+            reader = BlockCompressedReader(path)
+            assert len(reader) > 10
+            assert reader.page(0) == pages[0]
+            assert reader.page(1234) == pages[1234]
+            assert list(reader) == pages
+            lines = decompress(path.read_bytes()).splitlines()
+            assert [json.loads(line) for line in lines] == pages
+    
+    def test_unknown_compression_rejected(self, tmp_path):
+        """Test an unsupported compression format raises ValueError"""
+        with pytest.raises(ValueError):
+            BlockCompressedWriter(tmp_path / "pages.zst", compression="zstd")
+    
+    def test_previous_file_kept_until_close(self, tmp_path):
+        """Test the old data and index stay readable together until the new run commits"""
+        path = tmp_path / "pages.jsonl.gz"
+        with BlockCompressedWriter(path, block_bytes=64) as writer:
+            writer.write({"id": "old"})
+        
+        writer = BlockCompressedWriter(path, block_bytes=64)
+        for i in range(50):
+            writer.write(b'{"id":%d}' % i)
+        assert list(BlockCompressedReader(path)) == [{"id": "old"}]
+        writer.close()
+        assert list(BlockCompressedReader(path)) == [{"id": i} for i in range(50)]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["pages.jsonl.gz", "pages.jsonl.gz.idx"]
+    
+    def test_multiline_encoded_page_rejected(self, tmp_path):
+        """Test pre-encoded pages with newlines are refused instead of splitting into two pages"""
+        with BlockCompressedWriter(tmp_path / "pages.jsonl.gz") as writer:
+            with pytest.raises(ValueError):
+                writer.write(b'{\n"id": 1\n}')
+
+
+class TestSQLitePageSink:
+    def test_pages_are_batched_and_indexed(self, tmp_path):
+        """Test pages land in a WAL database keyed by product and page type"""
+        path = tmp_path / "pages.db"
+        with SQLitePageSink(path, batch_size=50) as sink:
+            for i in range(120):
+                sink.write({"page_type": "FAQ", "content": {"q": i}, "metadata": {"product_name": f"Serum {i}"}})
+            sink.write(PageOutput(page_type="ProductPage", content={"title": "Serum 1"}), product_name="Serum 1")
+            sink.write({"page_type": "FAQ", "content": {"q": "updated"}, "metadata": {}}, product_name="Serum 3")
+            assert sink.pages_written == 100
+            assert sink.get("Serum 3", "FAQ") == {"q": "updated"}
+        
+        connection = sqlite3.connect(str(path))
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 121
+        plan = " ".join(str(row) for row in connection.execute("EXPLAIN QUERY PLAN SELECT * FROM pages WHERE content_hash = 'x'"))
+        assert "idx_pages_content_hash" in plan
+        connection.close()
+    
+    def test_identical_content_shares_hash(self, tmp_path):
+        """Test content hashes ignore key order"""
+        with SQLitePageSink(tmp_path / "pages.db") as sink:
+            sink.write({"page_type": "FAQ", "content": {"a": 1, "b": 2}}, product_name="A")
+            sink.write({"page_type": "FAQ", "content": {"b": 2, "a": 1}}, product_name="B")
+            sink.flush()
+            hashes = {row[0] for row in sink._connection.execute("SELECT content_hash FROM pages")}
+        assert len(hashes) == 1
+    
+    def test_every_agent_page_has_a_product_name(self, tmp_path, make_product):
+        """Test FAQ, product and comparison agent results (pairwise and N-way) are written without a product_name argument"""
+        product = make_product()
+        context = {"product": product, "questions": {"questions": {"informational": ["What is it?"], "safety": ["Is it safe?"]}}}
+        pages = [
+            FAQAgent().process(AgentInput(data=context)),
+            ProductPageAgent().process(AgentInput(data={"product": product})),
+            ComparisonAgent().process(AgentInput(data={"product": product})),
+            ComparisonAgent().compare_products([
+                product,
+                make_product(name="RadiantX Serum", price=899),
+                make_product(name="Night Repair", ingredients=["Retinol"], price=1299)
+            ])
+        ]
+        with SQLitePageSink(tmp_path / "pages.db") as sink:
+            for page in pages:
+                sink.write(page)
+            sink.flush()
+            keys = sorted(sink._connection.execute("SELECT product_name, page_type FROM pages"))
+        
+        name = product.name
+        assert keys == sorted([
+            (name, "FAQ"), (name, "ProductPage"), (name, "ComparisonPage"),
+            (f"{name} vs RadiantX Serum vs Night Repair", "ComparisonPage")
+        ])
+
+
+class TestHtmlRenderer:
+    def test_product_page_follows_page_structure(self, make_product):
+        """Test product HTML renders sections in priority order with JSON-LD for both schemas"""
+        for schema in ("full", "compact"):
+            page = ProductPageAgent(schema=schema).process(AgentInput(data={"product": make_product()}))
+            document = render_html(page)
+            assert document.startswith("<!DOCTYPE html>") and document.endswith("</html>\n")
+            assert '"@type":"Product"' in document and '"@context":"https://schema.org"' in document
+            positions = [document.index(f'id="{section}"') for section in ("header", "overview", "benefits", "pricing")]
+            assert positions == sorted(positions)
+    
+    def test_faq_and_comparison_pages(self, make_product):
+        """Test FAQ pages emit FAQPage markup and comparisons emit the feature table"""
+        faq = render_html(faq_template([("Is it <safe>?", "Yes & gentle"), ("Side effects?", [{"effect": "Tingling"}])]))
+        assert '"@type":"FAQPage"' in faq
+        assert "Is it &lt;safe&gt;?" in faq and "Yes &amp; gentle" in faq
+        assert "<li><dl>" in faq
+        
+        comparison = render_html(ComparisonAgent().process(AgentInput(data={"product": make_product()})))
+        assert "<table>" in comparison and '<td class="winner">' in comparison
+    
+    def test_script_content_cannot_close_tag(self):
+        """Test markup values containing </script> are escaped inside JSON-LD"""
+        document = render_html(product_template({"header": {"title": "</script><b>x"}}))
+        assert "</script><b>" not in document
+
+
+class TestLocaleRendering:
+    def test_number_and_currency_formatting(self):
+        """Test grouping, separators and currency placement per locale"""
+        assert get_locale("en-IN").numbers.number(1234567) == "12,34,567"
+        assert get_locale("en-US").numbers.number(-1234567.5, 2) == "-1,234,567.50"
+        assert get_locale("de-DE").numbers.number(1234.5, 2) == "1.234,50"
+        assert get_locale("en-IN").numbers.currency(1899) == "₹1,899"
+        assert get_locale("fr-FR", rate=0.01).numbers.currency(1899) == "18,99 €"
+    
+    def test_render_locales_shares_blocks(self, make_product):
+        """Test every locale reuses one block computation and localizes prices and copy"""
+        agent = ProductPageAgent(schema="compact")
+        with patch.object(agent, "compute_blocks", wraps=agent.compute_blocks) as compute:
+            pages = agent.render_locales(make_product(), ["en-IN", "en-US", "de-DE"])
+        assert compute.call_count == 1
+        
+        english, american, german = (pages[code]["content"]["content"] for code in ("en-IN", "en-US", "de-DE"))
+        assert english["benefits"]["detailed_benefits"] is german["benefits"]["detailed_benefits"]
+        assert german["header"]["tagline"] == "Fortschrittliches Pflegeserum"
+        assert german["pricing"]["price_details"]["currency"] == "EUR"
+        assert american["pricing"]["price_details"]["formatted"].startswith("$")
+        assert pages["de-DE"]["metadata"]["section_labels"]["pricing"] == "Preis"
+    
+    def test_catalog_falls_back_to_english(self):
+        """Test messages missing from a catalog use the English text"""
+        english = MessageCatalog({"greeting": "Hello {name}", "bye": "Bye"})
+        partial = MessageCatalog({"greeting": "Bonjour {name}"}, english)
+        assert partial.format("greeting", name="Asha") == "Bonjour Asha"
+        assert partial.format("bye") == "Bye"
+
+
+class TestFeeds:
+    def test_sitemaps_split_and_feed_reuses_schema_markup(self, tmp_path):
+        """Test URLs are split across sitemaps under an index and products feed their markup"""
+        def pages():
+            for i in range(25):
+                yield {"page_type": "ProductPage", "content": product_template({"header": {"title": f"Serum {i}"}}), "metadata": {"product_name": f"Serum {i}"}}
+                yield {"page_type": "FAQ", "content": faq_template([("Q?", "A")]), "metadata": {"product_name": f"Serum {i}"}}
+            yield {"page_type": "Other", "content": {"metadata": {}}}
+        
+        summary = generate_feeds(pages(), tmp_path, "https://shop.example.com/", max_urls=20)
+        assert (summary.urls, summary.products, summary.skipped) == (50, 25, 1)
+        assert summary.sitemaps == ["sitemap-00001.xml", "sitemap-00002.xml", "sitemap-00003.xml"]
+        
+        namespace = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+        index = ElementTree.parse(str(tmp_path / "sitemap_index.xml"))
+        assert len(index.findall("sm:sitemap", namespace)) == 3
+        first = ElementTree.parse(str(tmp_path / "sitemap-00001.xml"))
+        locations = [loc.text for loc in first.iterfind("sm:url/sm:loc", namespace)]
+        assert locations[:2] == ["https://shop.example.com/products/serum-0/", "https://shop.example.com/products/serum-0/faq/"]
+        
+        feed = json.loads((tmp_path / "products.jsonld").read_text(encoding="utf-8"))
+        assert len(feed["@graph"]) == 25
+        assert feed["@graph"][3]["@type"] == "Product" and feed["@graph"][3]["url"].endswith("/products/serum-3/")
+    
+    def test_feeds_from_bulk_shards(self, tmp_path, make_product):
+        """Test feeds can be generated by streaming bulk shard output"""
+        with ShardedPageWriter(tmp_path / "bulk") as writer:
+            writer.write("comparison", "p1", ComparisonAgent().process(AgentInput(data={"product": make_product()})))
+        summary = generate_feeds(iter_shard_pages(tmp_path / "bulk"), tmp_path / "feeds", "https://shop.example.com")
+        assert summary.urls == 1
+        assert "/compare/glowboost-vitamin-c-serum-vs-" in (tmp_path / "feeds" / "sitemap-00001.xml").read_text()
+
+class TestPageValidator:
+    def test_walks_directories_and_shards(self, tmp_path, make_product):
+        """Test pages in files and shards are each checked against their page type schema"""
+        product_page = ProductPageAgent().process(AgentInput(data={"product": make_product()}))
+        (tmp_path / "product_page.json").write_text(json.dumps(product_page), encoding="utf-8")
+        (tmp_path / ".output-manifest.json").write_text("{}", encoding="utf-8")
+        with ShardedPageWriter(tmp_path / "bulk") as writer:
+            for i in range(3):
+                writer.write("comparison", f"p{i}", ComparisonAgent().process(AgentInput(data={"product": make_product()})))
+        
+        report = validate_outputs([tmp_path], workers=2)
+        assert report.ok and report.files == 2 and report.pages == 4
+        assert report.pages_by_type == {"ProductPage": 1, "ComparisonPage": 3}
+    
+    def test_reports_schema_and_syntax_errors(self, tmp_path):
+        """Test broken pages are reported with their location instead of stopping the run"""
+        lines = [
+            json.dumps({"page_type": "FAQ", "content": {"metadata": {"generated_at": "2024-01-01"}, "questions": []}}),
+            "{not json",
+            json.dumps({"page_type": "Unknown", "content": {}}),
+            json.dumps({"page_type": ["FAQ"], "content": {}})
+        ]
+        (tmp_path / "faq-00000.jsonl").write_text("\n".join(lines), encoding="utf-8")
+        
+        report = validate_outputs([tmp_path], workers=1)
+        assert not report.ok and report.pages == 3 and report.valid_pages == 0
+        assert any(":1: $.content.questions: expected at least 1 items" in error for error in report.errors)
+        assert any(":2: invalid JSON" in error for error in report.errors)
+        assert any(":4: $.page_type: expected string, got list" in error for error in report.errors)
+        assert report.invalid_by_type == {"FAQ": 1, "unknown": 2}
\ No newline at end of file